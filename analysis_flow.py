@@ -0,0 +1,72 @@
+"""Run independent analysis stages concurrently and report results as they land."""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StageRunner:
+    """Run analysis stages on worker threads and hand results back in completion order.
+
+    Rendering stays on the caller's thread, which Streamlit requires:
+
+        with StageRunner() as runner:
+            runner.submit("category", predict_category, resume_text)
+            runner.stream("feedback", score_resume_stream, resume_text)
+            for kind, name, value in runner.events():
+                ...
+
+    `kind` is "chunk" for each piece of a streamed stage, "result" when a
+    stage finishes (streamed stages report their joined text) and "error"
+    with the exception when it fails.
+    """
+
+    def __init__(self, max_workers=4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+        self._events = queue.Queue()
+        self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, name, fn, *args, **kwargs):
+        """Run `fn` in the background and report its return value."""
+        def run():
+            try:
+                value = fn(*args, **kwargs)
+            except Exception as e:
+                self._events.put(("error", name, e))
+            else:
+                self._events.put(("result", name, value))
+
+        self._pending += 1
+        self._executor.submit(run)
+
+    def stream(self, name, chunks_fn, *args, **kwargs):
+        """Run a generator in the background, forwarding each chunk as it arrives."""
+        def run():
+            parts = []
+            try:
+                for chunk in chunks_fn(*args, **kwargs):
+                    parts.append(chunk)
+                    self._events.put(("chunk", name, chunk))
+            except Exception as e:
+                self._events.put(("error", name, e))
+            else:
+                self._events.put(("result", name, "".join(parts)))
+
+        self._pending += 1
+        self._executor.submit(run)
+
+    def events(self):
+        """Yield `(kind, name, value)` events until every stage has finished."""
+        while self._pending:
+            kind, name, value = self._events.get()
+            if kind != "chunk":
+                self._pending -= 1
+            yield kind, name, value
+
+    def shutdown(self):
+        # Abandon stages still queued if the caller stopped early
+        self._executor.shutdown(wait=False, cancel_futures=True)
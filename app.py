@@ -1,10 +1,20 @@
+import logging
+import os
+import uuid
 import streamlit as st
 import requests
-import joblib
-from scorer import score_resume
-from resume_parser import extract_text_from_pdf, estimate_resume_freshness
-from ats_matcher import calculate_ats_match, suggest_similar_roles, extract_keywords_from_jd
-from pdf_generator import convert_html_to_pdf
+from scorer import score_resume_stream
+from llm_backends import DEFAULT_BACKEND, get_backend
+from resume_parser import ResumeText, iter_pdf_pages, estimate_resume_freshness
+from ats_matcher import suggest_similar_roles, scan_resume
+from screening import get_jd_keywords, keyword_scores, predict_categories
+from pdf_generator import build_report_body, render_pdf
+from result_cache import ResultCache, content_hash, make_key
+from analysis_flow import StageRunner
+from jd_keywords import get_jd_extractor
+from keyword_matcher import MATCHER_VERSION
+from category_model import get_category_model
+from instrumentation import metrics, span, traced, traced_stream
 
 # Setup 
 st.set_page_config(page_title="AI Resume Screener", layout="centered")
@@ -44,10 +54,34 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Log each LLM call's prompt tokens and latency to the server console
+logging.basicConfig(format="%(asctime)s %(name)s: %(message)s")
+logging.getLogger("scorer").setLevel(logging.INFO)
+
+# Hidden stage-timing panel: open the app with ?debug=1 or set RESUME_SCREENER_DEBUG=1.
+# It turns on span metrics, which are otherwise off (RESUME_SCREENER_METRICS=1 enables them alone).
+debug_panel = st.query_params.get("debug") == "1" or os.environ.get("RESUME_SCREENER_DEBUG") == "1"
+if debug_panel:
+    metrics.enable()
+if metrics.enabled:
+    # One JSON line per finished stage span
+    logging.getLogger("instrumentation").setLevel(logging.INFO)
+# Labels this run's spans so the debug panel shows only them
+run_id = uuid.uuid4().hex[:12]
+
 # Load API Key and Models
-cohere_api_key = st.secrets["cohere"]["api_key"]
-pipeline = joblib.load("models/svm_pipeline.pkl")
-label_encoder = joblib.load("models/label_encoder.pkl")
+# Cohere by default; RESUME_SCREENER_LLM_BACKEND=stub runs the app without network access
+cohere_api_key = st.secrets["cohere"]["api_key"] if DEFAULT_BACKEND == "cohere" else ""
+llm_backend = get_backend(api_key=cohere_api_key)
+# Loaded once per process, not on every Streamlit rerun; uses the numpy export when there is one
+category_model = get_category_model()
+
+# Shared across reruns and sessions so repeat uploads skip every stage
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+result_cache = get_result_cache()
 
 # Sidebar Controls 
 st.sidebar.title("🎛️ Options")
@@ -55,6 +89,8 @@ job_role = st.sidebar.text_input("🎯 Target Job Title", value="Data Scientist"
 detail_level = st.sidebar.radio("✍️ Feedback Style", ["Brief", "Detailed"], horizontal=True)
 uploaded_file = st.sidebar.file_uploader("📎 Upload Resume (PDF only)", type="pdf")
 generate_button = st.sidebar.button("🚀 Generate Analysis", type="primary")
+llm_stats = result_cache.stats().get("llm", {"hits": 0, "misses": 0})
+st.sidebar.caption(f"♻️ LLM cache: {llm_stats['hits']} hits / {llm_stats['misses']} misses")
 
 # JD Input
 st.subheader("📝 Paste Job Description (Optional)")
@@ -72,100 +108,209 @@ Upload your resume and click the Generate Analysis button to receive:
 - 📌 JD keyword extraction  
 """)
 
-# ML Category Predictor
-def predict_category(resume_text):
-    return label_encoder.inverse_transform(pipeline.predict([resume_text]))[0]
+# ML Category Predictor: the likeliest categories and their scores, from the view's token counts
+def predict_category(resume):
+    with span("svm_predict", size=len(resume.text), run=run_id):
+        return predict_categories([resume], category_model)[0]
+
+def describe_llm_error(e):
+    """Turn a failed Cohere call into the message shown to the user."""
+    if isinstance(e, requests.exceptions.HTTPError):
+        if e.response.status_code == 401:
+            return "❌ Invalid Cohere API key."
+        elif e.response.status_code == 429:
+            return "❌ Rate limit exceeded. Try again later."
+        elif e.response.status_code == 500:
+            return "❌ Server error. Please try again later."
+        return f"❌ HTTP error: {e}"
+    return f"❌ Unexpected error: {e}"
+
+# Keep showing an analysis across reruns (e.g. preparing the PDF report) until its inputs change
+if uploaded_file:
+    pdf_bytes = uploaded_file.getvalue()
+    pdf_hash = content_hash(pdf_bytes)
+    jd_hash = content_hash(jd_text)
+    analysis_key = make_key(pdf_hash, jd_hash, job_role, detail_level.lower(), llm_backend.name)
+    if generate_button:
+        st.session_state["analysis_key"] = analysis_key
+    show_analysis = st.session_state.get("analysis_key") == analysis_key
+else:
+    show_analysis = False
 
 # Main Logic 
-if uploaded_file and generate_button:
+if show_analysis:
     with st.spinner("🔎 Analyzing your resume..."):
         try:
-            resume_text = extract_text_from_pdf(uploaded_file)
-
-            # JD Keywords
-            jd_keywords = extract_keywords_from_jd(jd_text) if jd_text else extract_keywords_from_jd(job_role)
-
-            # LLM Feedback
-            feedback = score_resume(
-                resume_text,
-                job_title=job_role,
-                api_key=cohere_api_key,
-                mode=detail_level.lower(),
-                job_description=jd_text
-            )
-            st.success("✅ LLM Feedback Generated")
-            st.markdown(feedback)
-
-            # Resume Category (ML)
-            category = predict_category(resume_text)
-            st.subheader("🧠 Predicted Resume Category")
-            st.markdown(f"**{category}**")
+            # Pages are normalized as they are extracted; every scorer shares the one view
+            # Spans time the work itself, so cache hits record nothing
+            cached_text = result_cache.get("text", pdf_hash)
+            if cached_text is None:
+                with span("pdf_parse", size=len(pdf_bytes), run=run_id):
+                    resume = ResumeText(iter_pdf_pages(pdf_bytes))
+                result_cache.put("text", pdf_hash, resume.text)
+            else:
+                resume = ResumeText.from_text(cached_text)
+            resume_text = resume.text
 
-            # ATS Match
-            st.subheader("📊 ATS Match Score")
+            # JD Keywords, re-extracted whenever the fitted JD corpus changes
+            jd_fingerprint = get_jd_extractor().fingerprint
+            jd_keywords = result_cache.get_or_compute(
+                "jd_keywords", make_key(jd_hash, job_role, jd_fingerprint),
+                traced("jd_keywords", lambda: get_jd_keywords(jd_text, job_role),
+                       size=len(jd_text or job_role), run=run_id)
+            )
 
-            hardcoded_score, missing = calculate_ats_match(resume_text, job_role)
+            # One keyword pass shared by ATS, JD and role scoring
+            with span("keyword_scan", size=len(resume_text), run=run_id):
+                keyword_hits = scan_resume(resume, jd_keywords)
 
-            jd_score = 0
-            jd_missing = []
-            if jd_keywords:
-                jd_matches = [kw for kw in jd_keywords if kw.lower() in resume_text.lower()]
-                jd_score = int((len(jd_matches) / len(jd_keywords)) * 100) if jd_keywords else 0
-                jd_missing = list(set(jd_keywords) - set(jd_matches))
+            def ats_analysis():
+                final_score, _, _, missing = keyword_scores(resume, job_role, jd_keywords, keyword_hits)
+                return final_score, missing
 
-            final_score = max(hardcoded_score, jd_score)
-            final_missing = list(set(missing + jd_missing))
-
-            st.markdown(f"**Score:** {final_score}/100")
-            if final_missing:
-                st.markdown("**🔻 Missing Keywords:**")
-                st.markdown(", ".join(final_missing))
-            else:
-                st.markdown("_Your resume contains all relevant keywords!_")
-
-            # Recency
-            freshness = estimate_resume_freshness(resume_text)
-            st.subheader("📅 Resume Freshness Estimate")
-            st.markdown(f"🗓️ Last update appears to be from: **{freshness}**")
-
-            # Role Suggestions
-            similar_roles = suggest_similar_roles(resume_text)
-            st.subheader("💡 Suggested Job Roles")
-            if similar_roles:
-                st.markdown(", ".join(similar_roles))
-            else:
-                st.markdown("_No strong matches found._")
+            # Sections render in this order, each as soon as its stage finishes
+            feedback_status = st.empty()
+            feedback_box = st.empty()
+            category_slot = st.container()
+            ats_slot = st.container()
+            freshness_slot = st.container()
+            roles_slot = st.container()
 
             # JD Keyword Display
             if jd_keywords:
                 st.subheader("📌 Extracted JD Keywords")
                 st.markdown(", ".join(jd_keywords))
 
-            # PDF Feedback Download
-            st.download_button(
-                label="📥 Download Feedback as PDF",
-                data=convert_html_to_pdf(
-                    feedback_text=feedback,
+            results = {}
+            with StageRunner() as runner:
+                # LLM Feedback, streamed unless already cached
+                cached_feedback = result_cache.get("llm", analysis_key)
+                if cached_feedback is not None:
+                    runner.submit("feedback", lambda: cached_feedback)
+                elif not generate_button:
+                    # A rerun redisplaying a failed analysis; only the button retries the LLM
+                    feedback_status.warning("⚠️ No LLM feedback yet. Click 'Generate Analysis' to retry.")
+                else:
+                    feedback_status.info("⏳ Generating LLM feedback...")
+                    runner.stream(
+                        "feedback", traced_stream("llm", score_resume_stream, size=len(resume_text), run=run_id),
+                        resume_text,
+                        job_title=job_role,
+                        mode=detail_level.lower(),
+                        job_description=jd_text,
+                        jd_keywords=jd_keywords,
+                        backend=llm_backend
+                    )
+
+                # Keyed by the model too, so a retrained or re-exported model is not answered from the cache
+                runner.submit("category", result_cache.get_or_compute,
+                              "category_top_k", make_key(pdf_hash, category_model.fingerprint),
+                              lambda: predict_category(resume))
+                # Keyed by the extractor and matcher too, so scores always match the JD keywords shown
+                runner.submit("ats", result_cache.get_or_compute,
+                              "ats", make_key(pdf_hash, jd_hash, job_role, jd_fingerprint, MATCHER_VERSION),
+                              traced("ats_match", ats_analysis, size=len(resume_text), run=run_id))
+                runner.submit("freshness", traced("freshness", estimate_resume_freshness, size=len(resume_text),
+                                                  run=run_id), resume)
+                runner.submit("roles", traced("role_suggestions", suggest_similar_roles, size=len(resume_text),
+                                              run=run_id), resume, hits=keyword_hits)
+
+                streamed = ""
+                for kind, name, value in runner.events():
+                    if kind == "chunk":
+                        streamed += value
+                        feedback_box.markdown(streamed + "▌")
+                        continue
+                    if kind == "error":
+                        if name == "feedback":
+                            feedback_status.error(describe_llm_error(value))
+                            feedback_box.empty()
+                        else:
+                            st.error(f"❌ Unexpected error in {name}: {value}")
+                        continue
+
+                    results[name] = value
+                    if name == "feedback":
+                        feedback = value.strip()
+                        # Never cache the error placeholder for malformed responses
+                        if cached_feedback is None and feedback and not feedback.startswith("❌"):
+                            result_cache.put("llm", analysis_key, feedback)
+                        results[name] = feedback
+                        feedback_status.success("✅ LLM Feedback Generated")
+                        feedback_box.markdown(feedback)
+
+                    # Resume Category (ML)
+                    elif name == "category":
+                        with category_slot:
+                            st.subheader("🧠 Predicted Resume Category")
+                            (category, score), runners_up = value[0], value[1:]
+                            st.markdown(f"**{category}** ({score:.0%})")
+                            if runners_up:
+                                st.caption("Also close: " + ", ".join(f"{c} ({s:.0%})" for c, s in runners_up))
+
+                    # ATS Match
+                    elif name == "ats":
+                        final_score, final_missing = value
+                        with ats_slot:
+                            st.subheader("📊 ATS Match Score")
+                            st.markdown(f"**Score:** {final_score}/100")
+                            if final_missing:
+                                st.markdown("**🔻 Missing Keywords:**")
+                                st.markdown(", ".join(final_missing))
+                            else:
+                                st.markdown("_Your resume contains all relevant keywords!_")
+
+                    # Recency
+                    elif name == "freshness":
+                        with freshness_slot:
+                            st.subheader("📅 Resume Freshness Estimate")
+                            st.markdown(f"🗓️ Last update appears to be from: **{value}**")
+
+                    # Role Suggestions
+                    elif name == "roles":
+                        with roles_slot:
+                            st.subheader("💡 Suggested Job Roles")
+                            if value:
+                                st.markdown(", ".join(value))
+                            else:
+                                st.markdown("_No strong matches found._")
+
+            # PDF Feedback Download, rendered only when asked for and cached by report content
+            if len(results) == 5:
+                report_body = build_report_body(
+                    feedback_text=results["feedback"],
                     job_title=job_role,
-                    category=category,
-                    ats_score=final_score,
-                    freshness=freshness,
+                    category=results["category"][0][0],
+                    ats_score=results["ats"][0],
+                    freshness=results["freshness"],
                     jd_keywords=jd_keywords
-                ),
-                file_name="resume_feedback.pdf",
-                mime="application/pdf"
-            )
+                )
+                report_key = content_hash(report_body)
+                if st.button("📄 Prepare PDF Report") or st.session_state.get("report_key") == report_key:
+                    st.session_state["report_key"] = report_key
+                    st.download_button(
+                        label="📥 Download Feedback as PDF",
+                        data=result_cache.get_or_compute(
+                            "report", report_key,
+                            traced("report_render", lambda: render_pdf(report_body), size=len(report_body), run=run_id)
+                        ),
+                        file_name="resume_feedback.pdf",
+                        mime="application/pdf"
+                    )
 
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                st.error("❌ Invalid Cohere API key.")
-            elif e.response.status_code == 429:
-                st.error("❌ Rate limit exceeded. Try again later.")
-            elif e.response.status_code == 500:
-                st.error("❌ Server error. Please try again later.")
-            else:
-                st.error(f"❌ HTTP error: {e}")
         except Exception as e:
             st.error(f"❌ Unexpected error: {e}")
-elif uploaded_file and not generate_button:
-    st.info("📄 Resume uploaded. Click 'Generate Analysis' in the sidebar to analyze your resume.")
\ No newline at end of file
+elif uploaded_file:
+    st.info("📄 Resume uploaded. Click 'Generate Analysis' in the sidebar to analyze your resume.")
+
+# Debug Panel
+if debug_panel:
+    with st.expander("🛠️ Debug: stage timings"):
+        run_spans = metrics.spans(run=run_id)
+        if run_spans:
+            st.dataframe([{k: v for k, v in record.items() if k not in ("run", "started")} for record in run_spans])
+        else:
+            st.caption("No stages ran in this rerun.")
+        prometheus_text = metrics.prometheus_text()
+        st.download_button("⬇️ Prometheus metrics", prometheus_text, file_name="metrics.prom", mime="text/plain")
+        st.code(prometheus_text, language="text")
\ No newline at end of file
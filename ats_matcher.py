@@ -1,76 +1,54 @@
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
-from collections import Counter
+import math
+from functools import lru_cache
+from keyword_matcher import get_matcher
+from jd_keywords import get_jd_extractor
+from resume_parser import as_resume_text
+from role_taxonomy import RoleTaxonomy, load_taxonomy_file
+
+# Job-title keywords and role definitions live in data/role_taxonomy.json,
+# so roles can be added without touching code
+JOB_KEYWORDS, ROLE_KEYWORDS = load_taxonomy_file()
+
+# Every built-in keyword, so one matcher pass serves both scorers
+BUILTIN_KEYWORDS = frozenset(
+    kw for table in (JOB_KEYWORDS, ROLE_KEYWORDS) for keywords in table.values() for kw in keywords
+)
+
+def _scan(keywords, resume_text):
+    # Reuse the resume's normalized tokens instead of recomputing them for every keyword set
+    resume = as_resume_text(resume_text)
+    return get_matcher(keywords).scan(resume.keyword_index)
+
+def scan_resume(resume_text, jd_keywords=None):
+    """Match all built-in and JD keywords against the resume in a single pass.
+
+    `resume_text` may be a string or a `resume_parser.ResumeText`, whose
+    normalized view is then shared with the other scorers.
+    """
+    keywords = BUILTIN_KEYWORDS
+    if jd_keywords:
+        keywords = keywords | {kw.lower() for kw in jd_keywords} | set(jd_keywords)
+    return _scan(keywords, resume_text)
 
 def extract_keywords_from_jd(jd_text, top_n=15):
     """Extract top-N keywords from a job description using TF-IDF with n-grams."""
-    if not jd_text or len(jd_text.strip()) < 10:
-        return []
-        
-    # Use n-grams to capture multi-word terms
-    vectorizer = TfidfVectorizer(
-        stop_words='english',
-        ngram_range=(1, 2),  # Include single words and bigrams
-        max_df=0.85,         # Ignore terms that appear in >85% of docs
-        min_df=1             # Only consider terms that appear at least once
-    )
-    
-    try:
-        tfidf_matrix = vectorizer.fit_transform([jd_text])
-        feature_names = vectorizer.get_feature_names_out()
-        
-        # Get scores from the matrix
-        scores = zip(feature_names, tfidf_matrix.toarray()[0])
-        sorted_scores = sorted(scores, key=lambda x: x[1], reverse=True)
-        
-        # Filter out single-letter words and pure numbers
-        filtered_keywords = []
-        for word, score in sorted_scores:
-            if len(word) > 1 and not word.isdigit() and score > 0:
-                filtered_keywords.append((word, score))
-        
-        top_keywords = [word for word, score in filtered_keywords[:top_n]]
-        return top_keywords
-    except Exception as e:
-        print(f"Error extracting keywords: {e}")
-        return []
+    return extract_keywords_batch([jd_text], top_n)[0]
+
+def extract_keywords_batch(jd_texts, top_n=15):
+    """Extract top-N keywords for many JDs in one sparse batch.
+
+    IDF comes from the fitted JD corpus (see jd_keywords.py), so boilerplate
+    shared by most JDs ranks below the skills that set this one apart.
+    """
+    return get_jd_extractor().top_keywords(jd_texts, top_n)
+
+def calculate_ats_match(resume_text, job_title="", jd_keywords=None, hits=None):
+    """Calculate ATS score using job keywords or extracted JD keywords.
+
+    Exact keyword hits count fully and fuzzy ones (see keyword_matcher) half.
+    Pass `hits` from `scan_resume` to reuse a scan shared with other scorers.
+    """
 
-def calculate_ats_match(resume_text, job_title="", jd_keywords=None):
-    """Calculate ATS score using job keywords or extracted JD keywords with fuzzy matching."""
-    # Expanded hardcoded keywords as fallback
-    job_keywords = {
-        "data scientist": [
-            "machine learning", "python", "data analysis", "statistics", "sql", 
-            "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", 
-            "data visualization", "r", "big data", "data mining", "nlp",
-            "deep learning", "ai", "predictive modeling", "data science"
-        ],
-        "software engineer": [
-            "java", "python", "javascript", "c++", "c#", "api", "sql", "nosql",
-            "rest", "git", "cloud", "aws", "azure", "docker", "kubernetes",
-            "microservices", "agile", "devops", "ci/cd", "web development"
-        ],
-        "hr": [
-            "recruiting", "payroll", "training", "compliance", "onboarding", 
-            "employee relations", "benefits", "compensation", "hr information systems",
-            "talent acquisition", "workforce planning", "performance management"
-        ],
-        "designer": [
-            "adobe", "figma", "ui", "ux", "illustrator", "photoshop", "indesign",
-            "sketch", "typography", "responsive design", "wireframing", "prototyping",
-            "user research", "visual design", "interaction design"
-        ],
-        "manager": [
-            "project management", "team leadership", "strategic planning", "budgeting",
-            "stakeholder management", "risk management", "resource allocation",
-            "performance reviews", "process improvement", "kpis", "leadership"
-        ]
-    }
-
-    # Normalize and clean text
-    resume_lower = resume_text.lower()
-    
     # Handle edge cases
     if not resume_text or (not jd_keywords and not job_title):
         return 0, []
@@ -84,32 +62,35 @@ def calculate_ats_match(resume_text, job_title="", jd_keywords=None):
         keywords = []
         
         # Try exact match first
-        if title in job_keywords:
-            keywords = job_keywords[title]
+        if title in JOB_KEYWORDS:
+            keywords = JOB_KEYWORDS[title]
         else:
             # Try partial matches
-            for key in job_keywords:
+            for key in JOB_KEYWORDS:
                 if key in title or title in key:
-                    keywords = job_keywords[key]
+                    keywords = JOB_KEYWORDS[key]
                     break
         
         # If still no match, use data scientist as default if "data" in title
         if not keywords and "data" in title:
-            keywords = job_keywords["data scientist"]
+            keywords = JOB_KEYWORDS["data scientist"]
         # Otherwise use software engineer as a generic fallback
         elif not keywords:
-            keywords = job_keywords["software engineer"]
+            keywords = JOB_KEYWORDS["software engineer"]
     
     # Different matching algorithms
     exact_matches = []
     fuzzy_matches = []
     
+    if hits is None:
+        hits = _scan(keywords, resume_text)
+
     for kw in keywords:
-        # Exact match (word boundaries)
-        if re.search(rf"\b{re.escape(kw)}\b", resume_lower):
+        # Exact match (the keyword's normalized tokens or an alias's)
+        if hits.is_exact(kw):
             exact_matches.append(kw)
-        # Fuzzy match (within words, no boundaries)
-        elif kw in resume_lower:
+        # Fuzzy match (run together into one word, or with a version number)
+        elif kw in hits:
             fuzzy_matches.append(kw)
     
     # Calculate scores with weighting
@@ -126,7 +107,7 @@ def calculate_ats_match(resume_text, job_title="", jd_keywords=None):
         raw_score = (weighted_match_score / keyword_count) * 100
         # Apply a curve to make scores more reasonable
         # Square root curve gives more reasonable scores for partial matches
-        score = min(100, int(np.sqrt(raw_score) * 10))
+        score = min(100, int(math.sqrt(raw_score) * 10))
     else:
         score = 0
     
@@ -135,98 +116,46 @@ def calculate_ats_match(resume_text, job_title="", jd_keywords=None):
     
     return score, missing
 
-def suggest_similar_roles(resume_text):
+def calculate_jd_match(jd_keywords, hits):
+    """Score the share of JD keywords found in the resume scanned into `hits`.
+
+    Fuzzy hits count half, as in `calculate_ats_match`.
+    """
+    if not jd_keywords:
+        return 0, []
+
+    jd_matches = [kw for kw in jd_keywords if kw.lower() in hits]
+    weighted = sum(1.0 if hits.is_exact(kw.lower()) else 0.5 for kw in jd_matches)
+    jd_score = int((weighted / len(jd_keywords)) * 100)
+    jd_missing = list(set(jd_keywords) - set(jd_matches))
+
+    return jd_score, jd_missing
+
+@lru_cache(maxsize=1)
+def get_role_taxonomy():
+    """Return the role scorer, building its keyword x role matrix once."""
+    return RoleTaxonomy(ROLE_KEYWORDS)
+
+def suggest_similar_roles(resume_text, hits=None):
     """Suggest possible roles based on keywords found in resume with ranking."""
     if not resume_text:
         return []
-        
-    # Expanded role definitions with more keywords
-    roles = {
-        "Data Scientist": [
-            "machine learning", "pandas", "numpy", "statistics", "python", 
-            "data analysis", "sql", "r", "tensorflow", "pytorch", "scikit-learn",
-            "big data", "data mining", "visualization", "predictive modeling",
-            "regression", "classification", "clustering", "nlp", "deep learning"
-        ],
-        "Data Engineer": [
-            "etl", "data pipeline", "sql", "nosql", "hadoop", "spark", "airflow",
-            "kafka", "database", "data warehouse", "data lake", "aws", "azure",
-            "gcp", "python", "scala", "java", "distributed systems"
-        ],
-        "Machine Learning Engineer": [
-            "machine learning", "deep learning", "neural networks", "tensorflow",
-            "pytorch", "keras", "model deployment", "mlops", "feature engineering",
-            "hyperparameter tuning", "python", "distributed training"
-        ],
-        "Software Engineer": [
-            "java", "c++", "c#", "javascript", "python", "backend", "frontend", 
-            "full stack", "api", "rest", "microservices", "django", "flask", "node.js",
-            "react", "angular", "vue", "docker", "kubernetes", "aws", "git"
-        ],
-        "Frontend Developer": [
-            "javascript", "html", "css", "react", "angular", "vue", "webpack",
-            "responsive design", "ui", "ux", "typescript", "sass", "less", "dom"
-        ],
-        "Backend Developer": [
-            "java", "python", "c#", "node.js", "api", "rest", "graphql", "database",
-            "sql", "nosql", "microservices", "django", "flask", "spring", "express"
-        ],
-        "DevOps Engineer": [
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible",
-            "jenkins", "ci/cd", "automation", "monitoring", "linux", "unix", "shell"
-        ],
-        "HR Specialist": [
-            "recruiting", "talent acquisition", "employee relations", "payroll",
-            "benefits", "compliance", "onboarding", "training", "hr information systems",
-            "performance management", "compensation"
-        ],
-        "UX/UI Designer": [
-            "user experience", "user interface", "figma", "sketch", "adobe xd", 
-            "wireframing", "prototyping", "user research", "usability testing",
-            "interaction design", "visual design", "responsive design"
-        ],
-        "Product Manager": [
-            "product development", "roadmap", "agile", "scrum", "user stories",
-            "market research", "stakeholder management", "requirements", "backlog",
-            "kpis", "metrics", "product strategy", "a/b testing"
-        ],
-        "Project Manager": [
-            "project management", "agile", "scrum", "waterfall", "pmbok", "pmp",
-            "budgeting", "resource allocation", "gantt", "risk management",
-            "stakeholder management", "project planning", "team leadership"
-        ],
-        "Business Analyst": [
-            "requirements gathering", "data analysis", "sql", "business intelligence",
-            "process improvement", "user stories", "stakeholder management",
-            "excel", "visualization", "reporting", "documentation"
-        ]
-    }
-
-    # Preprocess resume text
-    resume_lower = resume_text.lower()
-    
-    # Count matching keywords for each role
-    role_scores = Counter()
-    
-    for role, keywords in roles.items():
-        for kw in keywords:
-            if kw in resume_lower:
-                # Score is increased by 1 for each matching keyword
-                role_scores[role] += 1
-    
-    # Calculate match percentage for each role
-    role_percentages = {}
-    for role, score in role_scores.items():
-        total_keywords = len(roles[role])
-        percentage = (score / total_keywords) * 100
-        role_percentages[role] = percentage
-    
-    # Get top roles (roles with at least 20% match)
-    suggested_roles = [role for role, percentage in role_percentages.items() 
-                       if percentage >= 20]
-    
-    # Sort by match percentage
-    suggested_roles.sort(key=lambda role: role_percentages[role], reverse=True)
-    
-    # Return top 3 roles max
-    return suggested_roles[:3]
\ No newline at end of file
+
+    # Match every role keyword in one pass over the resume
+    if hits is None:
+        hits = _scan(BUILTIN_KEYWORDS, resume_text)
+
+    # Top 3 roles with at least 20% of their keywords present
+    return get_role_taxonomy().suggest([hits])[0]
+
+def suggest_roles_batch(resume_texts, hits_list=None):
+    """Suggest roles for many resumes, scoring them all with one sparse matrix product.
+
+    The per-resume keyword scan dominates the cost, and batching does not
+    change it; pass the `hits_list` already scanned to avoid repeating it.
+    """
+    if hits_list is None:
+        hits_list = [_scan(BUILTIN_KEYWORDS, text) for text in resume_texts]
+
+    suggestions = get_role_taxonomy().suggest(hits_list)
+    return [roles if text else [] for text, roles in zip(resume_texts, suggestions)]
@@ -0,0 +1,268 @@
+"""Screen many resumes against one job description without the Streamlit UI.
+
+Usage:
+    python batch_screener.py resumes/ --jd job.txt --job-title "Data Scientist" -o ranked.csv
+    python batch_screener.py resumes.zip --job-title "Backend Developer" -o ranked.jsonl
+    python batch_screener.py resumes/ --llm -o ranked.csv --reports-zip reports.zip
+    python batch_screener.py resumes/ --llm --llm-backend stub -o ranked.csv   # offline load test
+    python batch_screener.py resumes/ --dedup-threshold 0 -o ranked.csv         # screen repeat submissions too
+    python batch_screener.py resumes/ --stream -o results.jsonl -o results.parquet   # large runs, resumable
+
+With --stream, results are written to every output as each chunk of
+resumes is screened, in completion order and without a rank, so memory
+stays flat however many resumes there are. Rerunning the same command
+after a crash skips the resumes already in every output. A summary of
+score distributions and category counts (`--summary`, by default next to
+the first output) covers the whole run, earlier attempts included.
+Duplicates are collapsed within each chunk.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import zipfile
+
+from pdf_generator import export_reports_zip
+from category_model import get_category_model
+from dedup import DEFAULT_MAX_RESULTS, DEFAULT_THRESHOLD, ReusableResults
+from model_registry import MODEL_DIR
+from llm_backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from extraction_pool import DEFAULT_MAX_BYTES, DEFAULT_MAX_PAGES, DEFAULT_TIMEOUT, extract_pdfs
+from result_export import RESULT_FIELDS, SINKS, STREAM_FIELDS, ResultSummary, open_sink
+from screening import get_jd_keywords, screen_batch
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def write_reports_zip(results, path, job_title, jd_keywords, workers=None):
+    """Render one PDF report per ranked result into a single zip, on a process pool."""
+    reports = []
+    for result in results:
+        stem = os.path.splitext(os.path.basename(result["resume_id"]))[0]
+        reports.append((f"{result['rank']:04d}_{stem}", {
+            "feedback_text": result["feedback"],
+            "job_title": job_title,
+            "category": result["category"],
+            "ats_score": result["final_score"],
+            "freshness": result["freshness"],
+            "jd_keywords": jd_keywords,
+        }))
+    return export_reports_zip(reports, path, workers=workers)
+
+
+def iter_pdf_files(source, max_bytes=DEFAULT_MAX_BYTES, skip=()):
+    """Yield `(name, path_or_bytes)` for every PDF in a directory or zip archive, except names in `skip`."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                if not info.filename.lower().endswith(".pdf") or info.is_dir() or info.filename in skip:
+                    continue
+                if max_bytes and info.file_size > max_bytes:
+                    print(f"Skipping {info.filename}: over the {max_bytes} byte limit", file=sys.stderr)
+                    continue
+                yield info.filename, archive.read(info)
+    else:
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    if os.path.relpath(path, source) not in skip:
+                        yield os.path.relpath(path, source), path
+
+
+def load_resumes(source, workers=None, timeout=DEFAULT_TIMEOUT, max_pages=DEFAULT_MAX_PAGES,
+                 max_bytes=DEFAULT_MAX_BYTES):
+    """Extract text from every PDF under `source`, skipping files that fail to parse.
+
+    Returns the resumes in name order and the per-file extraction latencies.
+    """
+    resumes = []
+    latencies = {}
+    results = extract_pdfs(
+        iter_pdf_files(source, max_bytes), workers=workers,
+        timeout=timeout, max_pages=max_pages, max_bytes=max_bytes,
+    )
+    for result in results:
+        latencies[result.name] = result.latency
+        if result.error:
+            print(f"Skipping {result.name}: {result.error}", file=sys.stderr)
+        else:
+            resumes.append((result.name, result.text))
+
+    resumes.sort(key=lambda r: r[0])
+    return resumes, latencies
+
+
+def write_results(results, output_path):
+    """Write ranked results as JSONL, CSV or Parquet, chosen by the output file extension."""
+    with open_sink(output_path, RESULT_FIELDS) as sink:
+        for result in results:
+            sink.write(result)
+
+
+def stream_results(source, sinks, summary, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, timeout=DEFAULT_TIMEOUT,
+                   max_pages=DEFAULT_MAX_PAGES, index=None, **screen_options):
+    """Extract and screen `source` a chunk at a time, writing each chunk's results to every sink.
+
+    Resumes already in every sink are not extracted again; results go to the
+    sinks missing them and, once, to `summary`. `screen_options` are passed
+    to `screen_batch`. Returns the number of resumes screened and the
+    extraction timings `(count, total_seconds, slowest_name, slowest_seconds)`.
+    """
+    done = set.intersection(*(sink.resume_ids for sink in sinks))
+    sources = iter_pdf_files(source, skip=done)
+    timings = [0, 0.0, None, 0.0]
+    screened = 0
+
+    def screen_chunk(chunk):
+        for result in screen_batch(chunk, **screen_options):
+            # The first sink holds the rows the summary already counted
+            if sinks[0].write(result):
+                summary.add(result)
+            for sink in sinks[1:]:
+                sink.write(result)
+        for sink in sinks:
+            sink.flush()
+        if index is not None:
+            index.add(chunk)
+        return len(chunk)
+
+    chunk = []
+    for extracted in extract_pdfs(sources, workers=workers, timeout=timeout, max_pages=max_pages):
+        timings[0] += 1
+        timings[1] += extracted.latency
+        if extracted.latency >= timings[3]:
+            timings[2], timings[3] = extracted.name, extracted.latency
+        if extracted.error:
+            print(f"Skipping {extracted.name}: {extracted.error}", file=sys.stderr)
+            continue
+        chunk.append((extracted.name, extracted.text))
+        if len(chunk) >= chunk_size:
+            screened += screen_chunk(chunk)
+            chunk = []
+    if chunk:
+        screened += screen_chunk(chunk)
+    return screened, tuple(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a folder or zip of PDF resumes against a job description.")
+    parser.add_argument("source", help="Directory or .zip archive of PDF resumes")
+    parser.add_argument("--jd", help="Path to a text file holding the job description")
+    parser.add_argument("--job-title", default="Data Scientist", help="Target job title")
+    parser.add_argument("-o", "--output", action="append",
+                        help="Output .csv, .jsonl or .parquet path; repeat for several (default: ranked_resumes.csv)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write results chunk by chunk, unranked, and resume an interrupted run")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Resumes screened at once with --stream")
+    parser.add_argument("--summary", help="Write a JSON summary of scores and categories here "
+                                          "(with --stream, defaults to the first output plus .summary.json)")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-file extraction timeout in seconds")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="Pages read per PDF")
+    parser.add_argument("--llm", action="store_true", help="Fetch LLM feedback (Cohere uses $COHERE_API_KEY)")
+    parser.add_argument("--llm-backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="Where LLM feedback comes from; 'stub' answers locally for load tests")
+    parser.add_argument("--feedback-style", choices=["brief", "detailed"], default="brief")
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="LLM requests kept in flight")
+    parser.add_argument("--llm-rps", type=float, default=None, help="Client-side Cohere rate limit")
+    parser.add_argument("--dedup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Similarity at which a resume reuses an earlier one's result (0 screens every copy); "
+                             f"with --stream, earlier means among the last {DEFAULT_MAX_RESULTS} distinct resumes")
+    parser.add_argument("--index", help="Also add the screened resumes to this resume index directory")
+    parser.add_argument("--reports-zip", help="Also write a zip of per-candidate PDF reports to this path")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="Directory holding the SVM pipeline and label encoder")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log prompt tokens and latency per LLM call")
+    args = parser.parse_args(argv)
+    if not 0 <= args.dedup_threshold <= 1:
+        parser.error("--dedup-threshold must be between 0 and 1")
+    outputs = args.output or ["ranked_resumes.csv"]
+    if args.stream and args.reports_zip:
+        parser.error("--reports-zip needs ranked results; run without --stream")
+    for output in outputs:
+        if os.path.splitext(output)[1].lower() not in SINKS:
+            parser.error(f"{output}: output must end in {', '.join(SINKS)}")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+
+    jd_text = ""
+    if args.jd:
+        with open(args.jd, encoding="utf-8") as f:
+            jd_text = f.read()
+
+    start = time.perf_counter()
+    category_model = get_category_model(args.model_dir)
+    backend = None
+    if args.llm:
+        api_key = os.environ.get("COHERE_API_KEY")
+        if args.llm_backend == "cohere" and not api_key:
+            parser.error("--llm needs the COHERE_API_KEY environment variable")
+        backend = get_backend(args.llm_backend, api_key=api_key)
+    llm_options = {"max_concurrency": args.llm_concurrency, "requests_per_second": args.llm_rps}
+    screen_options = {
+        "jd_text": jd_text, "job_title": args.job_title, "category_model": category_model, "backend": backend,
+        "feedback_mode": args.feedback_style, "llm_options": llm_options, "dedup_threshold": args.dedup_threshold,
+    }
+    index = None
+    if args.index:
+        from resume_index import ResumeIndex
+
+        index = ResumeIndex(args.index)
+
+    summary = ResultSummary()
+    if args.stream:
+        summary_path = args.summary or os.path.splitext(outputs[0])[0] + ".summary.json"
+        sinks = [open_sink(output, STREAM_FIELDS, append=True) for output in outputs]
+        for i, sink in enumerate(sinks):
+            for row in sink.recover():
+                if i == 0:
+                    summary.add(row)
+        resumed = summary.count
+        if args.dedup_threshold:
+            # One for the whole run, so a resume repeating one from an earlier chunk is not screened again
+            screen_options["reusable"] = ReusableResults(args.dedup_threshold)
+        try:
+            screened, timings = stream_results(args.source, sinks, summary, chunk_size=args.chunk_size,
+                                               workers=args.workers, timeout=args.timeout, max_pages=args.max_pages,
+                                               index=index, **screen_options)
+        finally:
+            for sink in sinks:
+                sink.close()
+        if resumed:
+            print(f"Resumed after {resumed} resumes already written")
+    else:
+        resumes, latencies = load_resumes(args.source, workers=args.workers,
+                                          timeout=args.timeout, max_pages=args.max_pages)
+        results = screen_batch(resumes, **screen_options)
+        for output in outputs:
+            write_results(results, output)
+        if args.reports_zip:
+            write_reports_zip(results, args.reports_zip, args.job_title, get_jd_keywords(jd_text, args.job_title),
+                              workers=args.workers)
+        if index is not None:
+            index.add(resumes)
+        summary_path = args.summary
+        for result in results:
+            summary.add(result)
+        screened = len(results)
+        slowest = max(latencies, key=latencies.get) if latencies else None
+        timings = (len(latencies), sum(latencies.values()), slowest, latencies.get(slowest, 0.0))
+    if index is not None:
+        index.close()
+    if summary_path:
+        summary.write(summary_path)
+    elapsed = time.perf_counter() - start
+
+    print(f"Screened {screened} resumes in {elapsed:.2f}s -> {', '.join(outputs)}")
+    if summary.duplicates:
+        print(f"Reused results for {summary.duplicates} duplicate resume(s)")
+    if summary_path:
+        print(f"Summary of {summary.count} resumes -> {summary_path}")
+    count, total, slowest, slowest_latency = timings
+    if count:
+        print(f"PDF extraction: mean {total / count * 1000:.1f}ms, slowest {slowest} "
+              f"({slowest_latency * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
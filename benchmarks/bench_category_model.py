@@ -0,0 +1,127 @@
+"""Compare the numpy category fast path with the sklearn pipeline it was exported from.
+
+Run from the repository root:  python benchmarks/bench_category_model.py --resumes 500
+Uses models/svm_pipeline.pkl when present, otherwise (or with --synthetic) a
+TF-IDF + LinearSVC fitted here on generated resumes. Every path must predict
+the same labels; the run exits 1 if any differ.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS  # noqa: E402
+from category_model import LinearCategoryModel  # noqa: E402
+from model_registry import ARTIFACTS, MODEL_DIR  # noqa: E402
+from resume_parser import ResumeText  # noqa: E402
+
+FILLER = (
+    "responsible for delivering projects on time working closely with cross functional teams "
+    "improved processes and mentored junior colleagues presented results to leadership"
+).split()
+ROLES = sorted(ROLE_KEYWORDS)
+# Names, employers and other rare words, so the vocabulary is as large as a real model's
+_letters = random.Random(2)
+RARE_WORDS = ["".join(_letters.choices("abcdefghijklmnopqrstuvwxyz", k=_letters.randint(4, 10)))
+              for _ in range(20000)]
+
+
+def make_resume(rng, role, words=600):
+    skills = ROLE_KEYWORDS[role]
+    # Some skills of a neighbouring role too, so the classes overlap
+    other = ROLE_KEYWORDS[rng.choice(ROLES)]
+    picks = []
+    for r in (rng.random() for _ in range(words)):
+        pool = skills if r < 0.08 else other if r < 0.12 else RARE_WORDS if r < 0.4 else FILLER
+        picks.append(rng.choice(pool))
+    return " ".join(picks)
+
+
+def fit_synthetic(rng, n=600):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import LabelEncoder
+    from sklearn.svm import LinearSVC
+
+    roles = [rng.choice(ROLES) for _ in range(n)]
+    label_encoder = LabelEncoder().fit(ROLES)
+    pipeline = make_pipeline(TfidfVectorizer(), LinearSVC())
+    pipeline.fit([make_resume(rng, role) for role in roles], label_encoder.transform(roles))
+    return pipeline, label_encoder
+
+
+def best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--synthetic", action="store_true", help="Fit a stand-in model even if one is saved")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    pipeline_path = os.path.join(args.model_dir, ARTIFACTS["svm_pipeline"])
+    if os.path.exists(pipeline_path) and not args.synthetic:
+        from model_registry import load_models
+
+        pipeline, label_encoder = load_models(args.model_dir)
+        print(f"Model: {pipeline_path}")
+    else:
+        pipeline, label_encoder = fit_synthetic(rng)
+        print("Model: synthetic TF-IDF + LinearSVC")
+
+    texts = [make_resume(rng, rng.choice(ROLES)) for _ in range(args.resumes)]
+    # The views the keyword matcher builds anyway; the fast path reads their token counts
+    views = [ResumeText.from_text(text) for text in texts]
+
+    model = LinearCategoryModel.from_pipeline(pipeline, label_encoder)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, ARTIFACTS["svm_weights"])
+        model.save(path)
+        load_ms, model = best_ms(lambda: LinearCategoryModel.load(path), args.repeat)
+        print(f"Export: {os.path.getsize(path) / 1024:.0f} KiB, {len(model.terms)} terms x "
+              f"{len(model.classes)} categories, loads in {load_ms:.1f}ms")
+
+    def one_at_a_time():
+        return [str(label_encoder.inverse_transform(pipeline.predict([text]))[0]) for text in texts]
+
+    def sklearn_batch():
+        return [str(label) for label in label_encoder.inverse_transform(pipeline.predict(texts))]
+
+    paths = [
+        ("sklearn, one resume per call (previous app path)", one_at_a_time),
+        ("sklearn, whole batch", sklearn_batch),
+        ("numpy fast path, one resume per call", lambda: [model.predict([view])[0] for view in views]),
+        ("numpy fast path, whole batch", lambda: model.predict(views)),
+        ("numpy fast path, batch top-3 with scores", lambda: [top[0][0] for top in model.predict_top_k(views)]),
+    ]
+    reference = None
+    mismatches = 0
+    for name, fn in paths:
+        elapsed, labels = best_ms(fn, args.repeat)
+        reference = reference or labels
+        differ = sum(a != b for a, b in zip(reference, labels))
+        mismatches += differ
+        print(f"{name:<50} {elapsed / len(texts):7.3f}ms/resume  {len(texts) / elapsed * 1000:8.0f} resumes/s  "
+              f"{differ} label(s) differ")
+
+    drift = abs(pipeline.decision_function(texts) - model.decision_function(views)).max()
+    print(f"Largest decision value difference: {drift:.2e}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Load-test AsyncCohereClient against the local stub server.
+
+Run from the repository root:  python benchmarks/bench_cohere_client.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cohere_client import AsyncCohereClient  # noqa: E402
+from stub_cohere_server import StubCohere, start_stub_server  # noqa: E402
+
+
+async def run(n_resumes, stub, **client_options):
+    runner, url = await start_stub_server(stub)
+    try:
+        async with AsyncCohereClient("stub-key", url=url, backoff_base=0.05, **client_options) as client:
+            start = time.perf_counter()
+            results = await client.score_many([f"resume {i} " * (i % 7 + 1) for i in range(n_resumes)])
+            elapsed = time.perf_counter() - start
+            failures = sum(isinstance(r, Exception) for r in results)
+            return elapsed, failures, client.retries
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    n = 200
+    print(f"{'scenario':<36} {'seconds':>8} {'req/s':>7} {'failed':>7} {'retries':>8} {'429s':>6}")
+    scenarios = [
+        ("sequential (concurrency 1)", StubCohere(latency=0.05), {"max_concurrency": 1}),
+        ("pooled (concurrency 32)", StubCohere(latency=0.05), {"max_concurrency": 32}),
+        ("server caps 50 rps, no client limit", StubCohere(latency=0.05, max_rps=50, retry_after=0.2),
+         {"max_concurrency": 32}),
+        ("server caps 50 rps, bucket at 45 rps", StubCohere(latency=0.05, max_rps=50),
+         {"max_concurrency": 32, "requests_per_second": 45}),
+        ("5% transient 503s", StubCohere(latency=0.05, error_rate=0.05), {"max_concurrency": 32}),
+    ]
+    for name, stub, options in scenarios:
+        elapsed, failures, retries = asyncio.run(run(n, stub, **options))
+        print(f"{name:<36} {elapsed:>8.2f} {n / elapsed:>7.1f} {failures:>7} {retries:>8} {stub.throttled:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Time duplicate detection over a large intake and check it against the true similarities.
+
+Run from the repository root:  python benchmarks/bench_dedup.py --docs 100000 --threshold 0.85
+Generates resumes from shared boilerplate sentences, so unrelated resumes
+overlap as real ones do, and resubmits a share of them: some as exact copies
+with layout changes, some with a few words edited. Reports throughput and,
+against the exact shingle Jaccard similarity, the recall of resubmissions at
+or above the threshold and the precision of what was flagged. Exits 1 if any
+exact copy is missed.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS  # noqa: E402
+from dedup import DEFAULT_NUM_PERM, DEFAULT_SHINGLE_SIZE, Deduplicator, exact_key, words  # noqa: E402
+
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+VERBS = "led built designed improved managed delivered migrated automated launched owned reduced".split()
+OBJECTS = ("the reporting pipeline", "internal tools", "a customer portal", "quarterly forecasts",
+           "the data warehouse", "onboarding flows", "release processes", "vendor integrations")
+OUTCOMES = ("on time and under budget", "for three business units", "cutting costs by a third",
+            "with a team of five", "across two regions", "ahead of the annual audit")
+_names = random.Random(3)
+NAMES = ["".join(_names.choices("abcdefghijklmnopqrstuvwxyz", k=_names.randint(4, 9))) for _ in range(50000)]
+
+
+def make_sentences(rng, count=400):
+    """Boilerplate every generated resume draws from."""
+    return [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)} "
+            f"{rng.choice(OUTCOMES)}" for _ in range(count)]
+
+
+def make_resume(rng, sentences, n_sentences=30):
+    header = f"{rng.choice(NAMES)} {rng.choice(NAMES)} {rng.choice(NAMES)}@mail.com {rng.randint(1000000, 9999999)}"
+    body = [rng.choice(sentences) if rng.random() < 0.7 else
+            f"worked at {rng.choice(NAMES)} {rng.choice(NAMES)} on {rng.choice(SKILLS)}" for _ in range(n_sentences)]
+    return header + "\n" + ".\n".join(body)
+
+
+def reformat(rng, text):
+    # The same words: changed case, spacing and punctuation only
+    text = text.upper() if rng.random() < 0.5 else text.replace("\n", "  \n  ")
+    return text.replace(".", ";")
+
+
+def edit(rng, text, n_edits):
+    tokens = text.split(" ")
+    for _ in range(n_edits):
+        i = rng.randrange(len(tokens))
+        action = rng.random()
+        if action < 0.4:
+            tokens[i] = rng.choice(NAMES)
+        elif action < 0.7:
+            tokens.insert(i, rng.choice(SKILLS))
+        elif len(tokens) > 1:
+            del tokens[i]
+    return " ".join(tokens)
+
+
+def shingle_set(text, k=DEFAULT_SHINGLE_SIZE):
+    tokens = words(text)
+    return set(zip(*(tokens[i:] for i in range(k)))) or {tuple(tokens)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def make_intake(rng, n_docs, dup_rate, max_edits):
+    """`(doc_id, text)` pairs plus, per resubmission, `(doc_id, source_id, kind)`."""
+    sentences = make_sentences(rng)
+    docs, planted = [], []
+    for i in range(n_docs):
+        doc_id = f"cv-{i:07d}"
+        if docs and rng.random() < dup_rate:
+            source_id, source = rng.choice(docs)
+            if rng.random() < 0.4:
+                docs.append((doc_id, reformat(rng, source)))
+                planted.append((doc_id, source_id, "exact"))
+            else:
+                docs.append((doc_id, edit(rng, source, rng.randint(1, max_edits))))
+                planted.append((doc_id, source_id, "edited"))
+        else:
+            docs.append((doc_id, make_resume(rng, sentences)))
+    return docs, planted
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM)
+    parser.add_argument("--dup-rate", type=float, default=0.2, help="Share of resumes that are resubmissions")
+    parser.add_argument("--max-edits", type=int, default=20, help="Most words changed in an edited copy")
+    parser.add_argument("--batch", type=int, default=1000, help="Resumes per add_many call, as intake arrives")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    start = time.perf_counter()
+    docs, planted = make_intake(rng, args.docs, args.dup_rate, args.max_edits)
+    n_words = sum(len(words(text)) for _, text in docs[:1000]) / min(1000, len(docs))
+    print(f"Generated {len(docs)} resumes (~{n_words:.0f} words each), {len(planted)} resubmissions "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    exact_keys = {}
+    exact_found = sum(exact_keys.setdefault(exact_key(words(text)), doc_id) != doc_id for doc_id, text in docs)
+    exact_s = time.perf_counter() - start
+    print(f"Exact hash only: {exact_s:.1f}s ({len(docs) / exact_s:,.0f} resumes/s), {exact_found} copies")
+
+    deduplicator = Deduplicator(args.threshold, num_perm=args.num_perm)
+    matches = []
+    start = time.perf_counter()
+    for offset in range(0, len(docs), args.batch):
+        matches.extend(deduplicator.add_many(docs[offset:offset + args.batch]))
+    dedup_s = time.perf_counter() - start
+    flagged = {doc_id: match for (doc_id, _), match in zip(docs, matches) if match is not None}
+    print(f"Exact + MinHash/LSH ({deduplicator.bands} bands x {deduplicator.rows} rows): {dedup_s:.1f}s "
+          f"({len(docs) / dedup_s:,.0f} resumes/s), {len(flagged)} duplicates, {len(deduplicator)} kept")
+    pairs = len(docs) * (len(docs) - 1) // 2
+    print(f"Screening calls saved: {len(flagged)} of {len(docs)} ({len(flagged) / len(docs):.1%}); "
+          f"all-pairs comparison would be {pairs:,} pairs")
+
+    # Ground truth from exact shingle sets, only for the pairs that matter
+    texts = dict(docs)
+    shingles = {}
+
+    def true_similarity(a, b):
+        for doc_id in (a, b):
+            if doc_id not in shingles:
+                shingles[doc_id] = shingle_set(texts[doc_id])
+        return jaccard(shingles[a], shingles[b])
+
+    missed_exact = [doc_id for doc_id, _, kind in planted if kind == "exact" and doc_id not in flagged]
+    # A copy of a resubmission can only match the resume kept in its place
+    kept = {doc_id: match.original for doc_id, match in flagged.items()}
+    expected = [doc_id for doc_id, source_id, kind in planted
+                if kind == "edited" and true_similarity(doc_id, kept.get(source_id, source_id)) >= args.threshold]
+    recall = sum(doc_id in flagged for doc_id in expected) / len(expected) if expected else 1.0
+    near = [(doc_id, match) for doc_id, match in flagged.items() if not match.exact]
+    errors = [abs(match.similarity - true_similarity(doc_id, match.original)) for doc_id, match in near]
+    # Within one signature standard error of the threshold counts as correct
+    margin = (args.threshold * (1 - args.threshold) / args.num_perm) ** 0.5
+    correct = sum(true_similarity(doc_id, match.original) >= args.threshold - margin for doc_id, match in near)
+    precision = correct / len(near) if near else 1.0
+    print(f"Exact copies missed: {len(missed_exact)}")
+    print(f"Edited copies at or above {args.threshold} similarity to a kept resume: {len(expected)}, "
+          f"recall {recall:.1%}")
+    print(f"Near-duplicates flagged: {len(near)}, precision {precision:.1%} (true similarity within {margin:.3f}), "
+          f"mean similarity error {sum(errors) / len(errors) if errors else 0:.3f}")
+    if missed_exact:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compare peak memory and throughput of streamed exports with collecting every result first.
+
+Run from the repository root:  python benchmarks/bench_export.py --sizes 1000 10000 50000
+Feeds synthetic screening results, in chunks as batch_screener --stream does,
+through the JSONL, CSV and Parquet sinks and the summary, and measures the
+peak traced allocation. The collected variant keeps every result until the
+end, as a ranked run must. Streamed peaks grow only by the resume ids a
+sink keeps to skip finished resumes on a rerun, about 100 bytes each.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS  # noqa: E402
+from result_export import STREAM_FIELDS, ResultSummary, open_sink  # noqa: E402
+
+ROLES = sorted(ROLE_KEYWORDS)
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+FEEDBACK = ("**Score: {score}/100**\n\n* Strengths: clear project impact, relevant tooling.\n"
+            "* Gaps: {missing}.\n* Suggestions: quantify results, shorten long bullet points.\n") * 4
+
+
+def make_result(rng, i):
+    missing = rng.sample(SKILLS, 6)
+    score = rng.randint(20, 95)
+    return {
+        "resume_id": f"cv-{i:07d}.pdf",
+        "final_score": score,
+        "ats_score": max(0, score - rng.randint(0, 15)),
+        "jd_score": score,
+        "category": rng.choice(ROLES),
+        "top_categories": [[rng.choice(ROLES), 0.5]] * 3,
+        "freshness": rng.choice(["Updated Recently", "Updated within last 2-3 years", "Outdated"]),
+        "latest_role_end": rng.choice(["present", "2023-06", "2019-12"]),
+        "years_experience": round(rng.uniform(0, 20), 1),
+        "employment_gaps": rng.choice([[], ["2019-12/2021-03"]]),
+        "suggested_roles": rng.sample(ROLES, 3),
+        "missing_keywords": missing,
+        "feedback": FEEDBACK.format(score=score, missing=", ".join(missing)),
+        "duplicate_of": None,
+        "duplicate_similarity": None,
+    }
+
+
+def chunks(n, chunk_size):
+    rng = random.Random(1)
+    for start in range(0, n, chunk_size):
+        yield [make_result(rng, i) for i in range(start, min(n, start + chunk_size))]
+
+
+def streamed(n, directory, extension, chunk_size):
+    summary = ResultSummary()
+    with open_sink(os.path.join(directory, f"results{extension}"), STREAM_FIELDS) as sink:
+        for chunk in chunks(n, chunk_size):
+            for result in chunk:
+                sink.write(result)
+                summary.add(result)
+            sink.flush()
+    return summary.as_dict()
+
+
+def collected(n, directory, extension, chunk_size):
+    results = [result for chunk in chunks(n, chunk_size) for result in chunk]
+    results.sort(key=lambda r: r["final_score"], reverse=True)
+    summary = ResultSummary()
+    with open_sink(os.path.join(directory, f"results{extension}"), STREAM_FIELDS) as sink:
+        for result in results:
+            sink.write(result)
+            summary.add(result)
+    return summary.as_dict()
+
+
+def measure(fn, n, extension, chunk_size):
+    directory = tempfile.mkdtemp(prefix="export-")
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(n, directory, extension, chunk_size)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return elapsed, peak
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--formats", nargs="+", default=[".jsonl", ".csv", ".parquet"])
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'format':<9} {'results':>8} {'streamed MiB':>13} {'collected MiB':>14} {'streamed results/s':>19}")
+    for extension in args.formats:
+        # Imports (pyarrow for Parquet) are not part of the peak
+        measure(streamed, args.chunk_size, extension, args.chunk_size)
+        for n in args.sizes:
+            stream_s, stream_peak = measure(streamed, n, extension, args.chunk_size)
+            _, collect_peak = measure(collected, n, extension, args.chunk_size)
+            print(f"{extension:<9} {n:>8} {stream_peak / 2 ** 20:>13.1f} {collect_peak / 2 ** 20:>14.1f} "
+                  f"{n / stream_s:>19,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare per-call TfidfVectorizer keyword extraction with the corpus-fitted batch extractor.
+
+Run from the repository root:  python benchmarks/bench_jd_keywords.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS  # noqa: E402
+from jd_keywords import JD_TOKENIZER_OPTIONS, JDKeywordExtractor, get_analyzer  # noqa: E402
+
+BOILERPLATE = (
+    "we are looking for a motivated engineer to join our growing team you will work closely with "
+    "stakeholders strong communication skills required competitive salary benefits remote hybrid "
+    "equal opportunity employer years experience"
+).split()
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+
+
+def make_jd(rng):
+    skills = rng.sample(SKILLS, 8)
+    words = [rng.choice(skills) if rng.random() < 0.2 else rng.choice(BOILERPLATE) for _ in range(rng.randint(80, 300))]
+    return " ".join(words)
+
+
+def legacy_extract(jd_text, top_n=15):
+    """The original extractor, minus max_df which made it fail on a single document."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(**JD_TOKENIZER_OPTIONS, min_df=1)
+    tfidf_matrix = vectorizer.fit_transform([jd_text])
+    scores = sorted(zip(vectorizer.get_feature_names_out(), tfidf_matrix.toarray()[0]),
+                    key=lambda x: x[1], reverse=True)
+    return [word for word, score in scores if len(word) > 1 and not word.isdigit() and score > 0][:top_n]
+
+
+def boilerplate_share(results):
+    words = [word for keywords in results for kw in keywords for word in kw.split()]
+    return sum(word in BOILERPLATE for word in words) / max(1, len(words))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(11)
+    get_analyzer()
+    corpus = [make_jd(rng) for _ in range(2000)]
+    jds = [make_jd(rng) for _ in range(500)]
+
+    unfitted = JDKeywordExtractor()
+    fitted, fit_time = timed(lambda: JDKeywordExtractor().partial_fit(corpus))
+    print(f"partial_fit on {len(corpus)} JDs: {fit_time * 1000:.0f}ms ({len(fitted.doc_freq)} terms)")
+
+    legacy, legacy_time = timed(lambda: [legacy_extract(jd) for jd in jds])
+    single, single_time = timed(lambda: [unfitted.top_keywords([jd])[0] for jd in jds])
+    batch, batch_time = timed(lambda: unfitted.top_keywords(jds))
+    assert legacy == single == batch, "unfitted extractor diverged from per-JD TF-IDF"
+    _, fitted_time = timed(lambda: fitted.top_keywords(jds))
+
+    n = len(jds)
+    print(f"{'per JD, legacy fit_transform':<34} {legacy_time / n * 1000:6.2f}ms")
+    print(f"{'per JD, one call each':<34} {single_time / n * 1000:6.2f}ms")
+    print(f"{'per JD, one batch of ' + str(n):<34} {batch_time / n * 1000:6.2f}ms")
+    print(f"{'per JD, batch with fitted IDF':<34} {fitted_time / n * 1000:6.2f}ms")
+
+    print(f"\nboilerplate share of keywords: without corpus {boilerplate_share(batch):.0%}, "
+          f"with fitted IDF {boilerplate_share(fitted.top_keywords(jds)):.0%}")
+    print(f"  example without corpus: {', '.join(batch[0][:8])}")
+    print(f"  example with fitted IDF: {', '.join(fitted.top_keywords(jds[:1])[0][:8])}")
+
+
+if __name__ == "__main__":
+    main()
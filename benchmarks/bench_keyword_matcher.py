@@ -0,0 +1,133 @@
+"""Compare the single-pass keyword matcher against per-keyword scans.
+
+The matcher must agree with scanning the normalized resume for every keyword
+form one at a time; the original substring scans are timed for reference.
+
+Run from the repository root:  python benchmarks/bench_keyword_matcher.py
+"""
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import JOB_KEYWORDS, ROLE_KEYWORDS, calculate_ats_match, scan_resume, suggest_similar_roles  # noqa: E402
+from keyword_matcher import load_aliases, normalize  # noqa: E402
+
+FILLER = (
+    "experience team developed managed built designed project university bachelor "
+    "responsible for improved delivered stakeholders across the and of with 2019 2022 "
+    "led company customers reduced increased revenue quarterly reports internal tools "
+    "collaborated partners launched features owned migration ensured quality mentored "
+    "interns presented findings leadership review process hiring operations support"
+).split()
+ALL_KEYWORDS = sorted({kw for table in (JOB_KEYWORDS, ROLE_KEYWORDS) for kws in table.values() for kw in kws})
+# Alias spellings, run-together and versioned forms, so every kind of hit is exercised
+VARIANTS = ["ml", "k8s", "sklearn", "scikit learn", "nodejs", "front-end", "neural nets", "datascience",
+            "python3", "html5", "visualisations", "kpi", "r&d", "expressed", "drive"]
+
+
+def legacy_keyword_hits(resume_lower, keywords):
+    """The original matching loop from calculate_ats_match."""
+    exact, fuzzy = [], []
+    for kw in keywords:
+        if re.search(rf"\b{re.escape(kw)}\b", resume_lower):
+            exact.append(kw)
+        elif kw in resume_lower:
+            fuzzy.append(kw)
+    return exact, fuzzy
+
+
+def legacy_role_scores(resume_lower):
+    """The original substring scan from suggest_similar_roles."""
+    role_scores = Counter()
+    for role, keywords in ROLE_KEYWORDS.items():
+        for kw in keywords:
+            if kw in resume_lower:
+                role_scores[role] += 1
+    return role_scores
+
+
+def make_resume(rng, n_words):
+    # A resume mentions a couple dozen skills among mostly ordinary prose
+    skills = rng.sample(ALL_KEYWORDS, 25)
+    words = [rng.choice(skills) if r < 0.1 else rng.choice(VARIANTS) if r < 0.12 else rng.choice(FILLER)
+             for r in (rng.random() for _ in range(n_words))]
+    # Sprinkle punctuation so boundary handling is exercised
+    return " ".join(w + rng.choice(["", "", ",", ".", "/", "-"]) for w in words)
+
+
+def reference_hits(text, keywords):
+    """Search the normalized text for each form of each keyword separately."""
+    tokens = normalize(text)
+    joined = " " + " ".join(tokens) + " "
+    aliases = load_aliases()
+    found, exact = set(), set()
+    for kw in keywords:
+        for form in aliases.get(normalize(kw), {normalize(kw)}):
+            if " " + " ".join(form) + " " in joined:
+                exact.add(kw)
+            if len(form) > 1 and "".join(form) in tokens:
+                found.add(kw)
+            word = form[0]
+            if len(form) == 1 and len(word) > 1 and word.isalnum() and word[-1].isalpha():
+                if any(re.fullmatch(re.escape(word) + r"\d+", token) for token in tokens):
+                    found.add(kw)
+    return found | exact, exact
+
+
+def check_equivalence(resumes):
+    for text in resumes:
+        hits = scan_resume(text)
+        found, exact = reference_hits(text, ALL_KEYWORDS)
+        assert hits.found == found and hits.exact == exact, (found ^ hits.found, exact ^ hits.exact)
+
+
+def legacy_differences(resumes):
+    """Keyword hits the original substring scans reported differently."""
+    changed = 0
+    for text in resumes:
+        hits = scan_resume(text)
+        lower = text.lower()
+        changed += sum((kw in lower) != (kw in hits) for kw in ALL_KEYWORDS)
+    return changed / len(resumes)
+
+
+def time_per_resume(fn, resumes, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in resumes:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(resumes) * 1e6
+
+
+def legacy_pipeline(text):
+    lower = text.lower()
+    legacy_keyword_hits(lower, JOB_KEYWORDS["data scientist"])
+    legacy_role_scores(lower)
+
+
+def new_pipeline(text):
+    hits = scan_resume(text)
+    calculate_ats_match(text, "data scientist", hits=hits)
+    suggest_similar_roles(text, hits=hits)
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'words':>8} {'legacy us':>12} {'matcher us':>12} {'resumes/s':>10} {'hits changed':>13}")
+    for n_words in (200, 800, 3000):
+        resumes = [make_resume(rng, n_words) for _ in range(50)]
+        check_equivalence(resumes)
+        legacy = time_per_resume(legacy_pipeline, resumes)
+        new = time_per_resume(new_pipeline, resumes)
+        print(f"{n_words:>8} {legacy:>12.1f} {new:>12.1f} {1e6 / new:>10.0f} {legacy_differences(resumes):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
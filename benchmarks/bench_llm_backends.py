@@ -0,0 +1,74 @@
+"""Offline throughput and tail latency of the LLM stage, using the stub backend.
+
+Run from the repository root:  python benchmarks/bench_llm_backends.py --latency 0.05 --jitter 3
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS  # noqa: E402
+from llm_backends import StubBackend  # noqa: E402
+from scorer import build_prompt  # noqa: E402
+
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+
+
+class TimedStub(StubBackend):
+    """Records the latency of every call it serves."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.latencies = []
+
+    def complete(self, prompt):
+        start = time.perf_counter()
+        try:
+            return super().complete(prompt)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub latency before the first chunk")
+    parser.add_argument("--jitter", type=float, default=3.0, help="Latency scales by up to 1 + jitter")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    prompts = [build_prompt(" ".join(rng.choices(SKILLS, k=300)), job_title="Data Scientist")
+               for _ in range(args.resumes)]
+
+    for concurrency in (1, 8, 32):
+        backend = TimedStub(latency=args.latency, jitter=args.jitter)
+        start = time.perf_counter()
+        responses = backend.complete_many(prompts, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        assert responses == [backend.respond(p) for p in prompts]
+        ms = [t * 1000 for t in backend.latencies]
+        print(f"concurrency {concurrency:>2}: {len(prompts) / elapsed:7.1f} resumes/s  "
+              f"p50 {statistics.median(ms):6.1f}ms  p95 {percentile(ms, 0.95):6.1f}ms  "
+              f"p99 {percentile(ms, 0.99):6.1f}ms")
+
+    backend = StubBackend(latency=args.latency, chunk_delay=0.005)
+    start = time.perf_counter()
+    stream = backend.stream(prompts[0])
+    next(stream)
+    first = time.perf_counter() - start
+    text = "".join(stream)
+    print(f"streaming: first chunk after {first * 1000:.1f}ms, "
+          f"whole response after {(time.perf_counter() - start) * 1000:.1f}ms ({len(text)} chars)")
+
+
+if __name__ == "__main__":
+    main()
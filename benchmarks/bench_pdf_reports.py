@@ -0,0 +1,130 @@
+"""Time PDF report rendering, cached re-downloads and bulk zip export.
+
+Run from the repository root:  python benchmarks/bench_pdf_reports.py --reports 200
+Peak memory is the Python heap high-water mark (tracemalloc) while rendering.
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from pdf_generator import build_report_body, export_reports_zip, render_pdf  # noqa: E402
+from result_cache import ResultCache, content_hash  # noqa: E402
+
+FEEDBACK = """Score: 74/100
+
+Strengths:
+- Five years of Python and SQL with measurable impact on reporting latency
+- Clear ownership of end-to-end machine learning projects
+- Strong communication with business stakeholders
+
+Areas to improve:
+- Quantify the results of the forecasting work
+- Move certifications below experience
+- Tighten the summary to three lines"""
+
+
+def make_report(i):
+    return {
+        "feedback_text": FEEDBACK.replace("74", str(50 + i % 50)),
+        "job_title": "Data Scientist",
+        "category": "Data Science",
+        "ats_score": 50 + i % 50,
+        "freshness": "Updated Recently (2024)",
+        "jd_keywords": ["python", "sql", "machine learning", "forecasting", "stakeholders"],
+    }
+
+
+def percentile(samples, q):
+    return sorted(samples)[int(q * (len(samples) - 1))]
+
+
+def cold_report():
+    # What the first download in a fresh app process used to pay on every analysis
+    code = (
+        "import logging, time; logging.disable(logging.CRITICAL); t = time.perf_counter(); "
+        "from pdf_generator import convert_html_to_pdf; "
+        "convert_html_to_pdf('Score: 70/100', 'Data Scientist', 'Data Science', 70, '2024'); "
+        "print(time.perf_counter() - t)"
+    )
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=REPO_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.split()[-1])
+
+
+def bench_render(n):
+    render_pdf(build_report_body(**make_report(0)))
+    latencies, sizes = [], []
+    for i in range(n):
+        start = time.perf_counter()
+        pdf = render_pdf(build_report_body(**make_report(i)))
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(pdf))
+
+    # Separate pass, since tracing allocations slows rendering down several times
+    tracemalloc.start()
+    for i in range(min(n, 20)):
+        render_pdf(build_report_body(**make_report(i)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"render       p50 {statistics.median(latencies):6.1f}ms  p95 {percentile(latencies, 0.95):6.1f}ms  "
+          f"size {statistics.mean(sizes) / 1024:.1f}KB  peak heap {peak / 2**20:.1f}MB")
+
+
+def bench_cached(n):
+    # The app keys reports by their filled-in body, so a re-download is a cache lookup
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(os.path.join(tmp, "cache.sqlite3"))
+        bodies = [build_report_body(**make_report(i)) for i in range(min(n, 50))]
+        for body in bodies:
+            cache.get_or_compute("report", content_hash(body), lambda: render_pdf(body))
+        latencies = []
+        for body in bodies * 4:
+            start = time.perf_counter()
+            cache.get_or_compute("report", content_hash(body), lambda: render_pdf(body))
+            latencies.append((time.perf_counter() - start) * 1000)
+        cache.close()
+    print(f"cached       p50 {statistics.median(latencies):6.3f}ms  p95 {percentile(latencies, 0.95):6.3f}ms")
+
+
+def bench_export(n, workers):
+    reports = [(f"candidate-{i:05d}", make_report(i)) for i in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reports.zip")
+        start = time.perf_counter()
+        export_reports_zip(reports, path, workers=workers)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    print(f"zip export   {workers:>2} workers: {n} reports in {elapsed:5.2f}s "
+          f"({n / elapsed:6.1f}/s), zip {size / 2**20:.2f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # xhtml2pdf logs every glyph it cannot map (the emoji), which would swamp the output
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+
+    print(f"cold         first report in a new process {cold_report() * 1000:.0f}ms")
+    bench_render(args.reports)
+    bench_cached(args.reports)
+    bench_export(args.reports, 1)
+    if args.workers > 1:
+        bench_export(args.reports, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""End-to-end benchmark of every screening stage over a synthetic resume/JD corpus.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py                      # quick profile, compared with the baseline
+    python benchmarks/bench_pipeline.py --profile full       # up to 1000 resumes and 20-page PDFs
+    python benchmarks/bench_pipeline.py --save-baseline      # record this machine's numbers
+    python benchmarks/bench_pipeline.py --check              # exit 1 when a stage regressed
+
+Each scenario generates `resumes` PDFs of `pages` pages plus matching JDs
+from a fixed seed, then times every stage per item. Throughput, p50/p95/p99
+latency and the stage's peak RSS are compared with `baseline.json`; compare
+runs from the same machine only.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import (  # noqa: E402
+    ROLE_KEYWORDS, calculate_ats_match, extract_keywords_from_jd, suggest_similar_roles
+)
+from pdf_generator import build_report_body, render_pdf  # noqa: E402
+from resume_parser import ResumeText, iter_pdf_pages  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (resumes, pages per resume)
+PROFILES = {
+    "quick": [(10, 1), (100, 2), (20, 20)],
+    "full": [(1000, 1), (200, 5), (50, 20)],
+}
+# Changes smaller than these are timer and allocator noise, never regressions
+NOISE_FLOOR = {"p50_ms": 0.5, "p95_ms": 0.5, "peak_rss_mb": 10.0}
+# PDF reports take milliseconds each, so only this many are rendered per scenario
+PDF_REPORT_LIMIT = 25
+
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+ROLES = sorted(ROLE_KEYWORDS)
+FILLER = (
+    "responsible for delivering projects on time working closely with cross functional teams "
+    "improved processes and mentored junior colleagues presented results to leadership"
+).split()
+BOILERPLATE = (
+    "we are looking for a motivated engineer to join our growing team you will work closely with "
+    "stakeholders strong communication skills required competitive salary benefits"
+).split()
+
+
+def make_resume_pdf(pages, rng):
+    import fitz
+
+    skills = rng.sample(SKILLS, 30)
+    doc = fitz.open()
+    for number in range(pages):
+        lines = [["Summary", "Experience", "Skills", "Projects", "Education"][number % 5]]
+        for _ in range(45):
+            words = [rng.choice(skills) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(10)]
+            lines.append(" ".join(words) + f" {rng.randint(2005, 2024)}")
+        doc.new_page().insert_text((40, 40), "\n".join(lines), fontsize=7)
+    return doc.tobytes()
+
+
+def make_jd(rng):
+    skills = rng.sample(SKILLS, 8)
+    words = [rng.choice(skills) if rng.random() < 0.2 else rng.choice(BOILERPLATE)
+             for _ in range(rng.randint(80, 300))]
+    return " ".join(words)
+
+
+def reset_peak_rss():
+    """Restart the peak RSS watermark where the kernel allows it (Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            return int(re.search(r"VmHWM:\s+(\d+)", f.read()).group(1)) / 1024
+    except (OSError, AttributeError):
+        # ru_maxrss is the process lifetime peak: KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def percentile(samples, q):
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def time_stage(fn, items, repeat=3, prepare=None):
+    """Call `fn` on every item and summarize per-item latency, throughput and peak RSS.
+
+    One untimed call first keeps lazy imports out of the tail; bench_startup.py
+    covers cold starts. Each metric keeps its best of `repeat` passes, as
+    timeit does, since slower passes measure other load on the machine.
+    `prepare` turns an item into `fn`'s argument outside the timing, afresh
+    on every pass, so state cached on the argument is never reused.
+    """
+    prepare = prepare or (lambda item: item)
+    fn(prepare(items[0]))
+    runs = []
+    for _ in range(repeat):
+        reset_peak_rss()
+        latencies = []
+        outputs = []
+        elapsed = 0.0
+        for item in items:
+            arg = prepare(item)
+            t = time.perf_counter()
+            outputs.append(fn(arg))
+            latencies.append(time.perf_counter() - t)
+            elapsed += latencies[-1]
+        latencies.sort()
+        runs.append({
+            "throughput": len(items) / elapsed if elapsed else 0.0,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "peak_rss_mb": peak_rss_mb(),
+        })
+    stats = {"items": len(items), "throughput": round(max(run["throughput"] for run in runs), 1)}
+    for key in ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb"):
+        stats[key] = round(min(run[key] for run in runs), 3)
+    return stats, outputs
+
+
+def load_svm(model_dir):
+    from category_model import get_category_model
+    from model_registry import MODEL_DIR, ModelIntegrityError
+
+    try:
+        return get_category_model(model_dir or MODEL_DIR)
+    except (OSError, ModelIntegrityError) as e:
+        print(f"SVM stage skipped: {e}")
+        return None
+
+
+def run_scenario(n_resumes, pages, seed, category_model=None, repeat=3):
+    rng = random.Random(seed)
+    pdfs = [make_resume_pdf(pages, rng) for _ in range(n_resumes)]
+    jds = [make_jd(rng) for _ in range(n_resumes)]
+    roles = [rng.choice(ROLES) for _ in range(n_resumes)]
+
+    stages = {}
+    stages["extraction"], resumes = time_stage(lambda pdf: ResumeText(iter_pdf_pages(pdf, None)), pdfs, repeat)
+    stages["jd_keywords"], keywords = time_stage(extract_keywords_from_jd, jds, repeat)
+
+    # A new view per call: the keyword tokens and dates a view caches would otherwise be timed as hits
+    texts = [resume.text for resume in resumes]
+    stages["ats_match"], ats = time_stage(lambda args: calculate_ats_match(*args), range(n_resumes), repeat,
+                                          prepare=lambda i: (ResumeText.from_text(texts[i]), roles[i]))
+    stages["role_suggestions"], _ = time_stage(suggest_similar_roles, texts, repeat, prepare=ResumeText.from_text)
+    if category_model is not None:
+        stages["svm_predict"], _ = time_stage(lambda resume: category_model.predict_top_k([resume]), texts, repeat,
+                                              prepare=ResumeText.from_text)
+
+    def report(i):
+        body = build_report_body("**Score: 80/100**\n- Strong match.", roles[i], "Information Technology",
+                                 ats[i][0], "Updated within last year", keywords[i])
+        return render_pdf(body)
+
+    stages["pdf_report"], _ = time_stage(report, range(min(n_resumes, PDF_REPORT_LIMIT)), repeat)
+    return stages
+
+
+def compare(results, baseline, tolerance):
+    """Print each stage against the baseline; return the regressions beyond `tolerance`."""
+    regressions = []
+    for scenario, stages in results.items():
+        print(f"\n{scenario}")
+        print(f"  {'stage':<18} {'items/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RSS MB':>7}"
+              "  vs baseline p50/p95/RSS")
+        for stage, stats in stages.items():
+            line = (f"  {stage:<18} {stats['throughput']:9.1f} {stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} "
+                    f"{stats['p99_ms']:8.2f} {stats['peak_rss_mb']:7.0f}")
+            base = baseline.get(scenario, {}).get(stage)
+            if base:
+                changes = {key: stats[key] / base[key] - 1 if base[key] else 0.0 for key in NOISE_FLOOR}
+                line += "  " + " / ".join(f"{change:+.0%}" for change in changes.values())
+                if any(change > tolerance and stats[key] - base[key] > NOISE_FLOOR[key]
+                       for key, change in changes.items()):
+                    line += "  REGRESSION"
+                    regressions.append((scenario, stage))
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--model-dir", default=None, help="Directory holding the SVM pipeline (default: models/)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a stage's p50, p95 or peak RSS regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before --check fails")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per stage; each metric keeps its best")
+    parser.add_argument("--json", help="Also write the results to this path")
+    args = parser.parse_args()
+    # xhtml2pdf logs every glyph it cannot map (the emoji), which would swamp the output
+    logging.disable(logging.CRITICAL)
+
+    if not reset_peak_rss():
+        print("Peak RSS is the process lifetime peak on this platform, not per stage")
+    category_model = load_svm(args.model_dir)
+
+    results = {}
+    for n_resumes, pages in PROFILES[args.profile]:
+        scenario = f"{n_resumes} resumes x {pages} pages"
+        results[scenario] = run_scenario(n_resumes, pages, args.seed, category_model, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        # Merge, so saving one profile keeps the other's numbers
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                stored = json.load(f)
+        stored.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Compare date extraction from the keyword tokens with the old four-digit-year regex.
+
+Run from the repository root:  python benchmarks/bench_resume_dates.py --resumes 2000
+Generates resumes with known roles (month-year ranges, some current), an
+education section and publications whose titles carry years. Times the old
+full-text regex, the date pass over an existing TokenIndex, and what keeping
+line breaks and dashes adds to tokenizing; then checks the latest role end,
+years of experience and gaps against the truth, and the freshness label of
+both approaches.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS  # noqa: E402
+from keyword_matcher import _VERSIONED_RE, TokenIndex, _joined, lemmatize  # noqa: E402
+from resume_dates import GAP_MONTHS, dates_from_tokens, extract_dates_batch  # noqa: E402
+from resume_parser import ResumeText, estimate_resume_freshness  # noqa: E402
+
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+FILLER = ("led built designed improved managed delivered migrated automated the reporting pipeline for "
+          "three business units with a team of five across two regions reducing costs by a third").split()
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+               "October", "November", "December"]
+OLD_YEAR_RE = re.compile(r"\b(20\d{2}|19\d{2})\b")
+OLD_TOKEN_RE = re.compile(r"[\w&+#]+")
+
+
+def iso_month(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def format_month(rng, index):
+    year, month = divmod(index, 12)
+    style = rng.random()
+    if style < 0.4:
+        return f"{MONTH_NAMES[month][:3]} {year}"
+    if style < 0.7:
+        return f"{MONTH_NAMES[month]} {year}"
+    return f"{month + 1:02d}/{year}"
+
+
+def make_resume(rng, now):
+    """Resume text plus `(latest_role_end, years_experience, gaps)` as resume_dates reports them."""
+    roles = []
+    end = None if rng.random() < 0.5 else now - rng.randint(1, 60)
+    for _ in range(rng.randint(1, 5)):
+        finishes = now if end is None else end
+        begins = finishes - rng.randint(6, 48)
+        roles.append((begins, end))
+        end = begins - (rng.randint(GAP_MONTHS, 18) if rng.random() < 0.3 else rng.randint(0, 1))
+
+    lines = [f"{rng.choice(FILLER).title()} {rng.choice(FILLER).title()}", "Summary",
+             " ".join(rng.choice(FILLER + SKILLS) for _ in range(30)), "Experience"]
+    for begins, finishes in roles:
+        ends = rng.choice(["Present", "Current", "to date"]) if finishes is None else format_month(rng, finishes)
+        dash = rng.choice([" - ", " – ", " to "]) if ends != "to date" else " "
+        lines.append(f"{rng.choice(SKILLS).title()} Lead, {rng.choice(FILLER).title()} Inc  "
+                     f"{format_month(rng, begins)}{dash}{ends}")
+        lines += [" ".join(rng.choice(FILLER + SKILLS) for _ in range(14)) for _ in range(rng.randint(2, 5))]
+    graduated = roles[-1][0] // 12 - rng.randint(0, 2)
+    lines += ["Education", f"BSc Computer Science, State University {graduated - 4} – {graduated}",
+              "Publications"]
+    for _ in range(rng.randint(0, 3)):
+        lines.append(f'"{rng.choice(SKILLS).title()} trends for {rng.randint(2020, now // 12 + 5)} and beyond", '
+                     f"journal of {rng.choice(FILLER)}")
+
+    merged = []
+    for begins, finishes in sorted((b, now if f is None else f) for b, f in roles):
+        if merged and begins <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], finishes)
+        else:
+            merged.append([begins, finishes])
+    gaps = [f"{iso_month(previous[1])}/{iso_month(following[0])}"
+            for previous, following in zip(merged, merged[1:]) if following[0] - previous[1] >= GAP_MONTHS]
+    latest_role_end = "present" if roles[0][1] is None else iso_month(roles[0][1])
+    years = round(sum(f - b for b, f in merged) / 12, 1)
+    return "\n".join(lines), (latest_role_end, years, gaps)
+
+
+def freshness(latest_year, current_year):
+    if latest_year is None:
+        return "Unknown"
+    diff = current_year - latest_year
+    return "Updated Recently" if diff <= 1 else "Updated within last 2-3 years" if diff <= 3 else "Outdated"
+
+
+def old_latest_year(text):
+    years = OLD_YEAR_RE.findall(text)
+    return max(map(int, years)) if years else None
+
+
+def old_token_index(text):
+    """TokenIndex as built before separators were kept."""
+    raw = OLD_TOKEN_RE.findall(text.replace("_", " "))
+    lemmas = {token: lemmatize(token) for token in set(raw)}
+    words = set(lemmas.values())
+    versioned = (_VERSIONED_RE.fullmatch(word) for word in words if word[-1:].isdigit())
+    return words, _joined(map(lemmas.__getitem__, raw)), {match.group(1) for match in versioned if match}
+
+
+def per_resume_us(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    today = date.today()
+    now = today.year * 12 + today.month - 1
+    rng = random.Random(7)
+    samples = [make_resume(rng, now) for _ in range(args.resumes)]
+    texts = [text.lower() for text, _ in samples]
+    indexes = [TokenIndex(text) for text in texts]
+    print(f"{len(texts)} resumes, ~{sum(map(len, texts)) / len(texts):,.0f} characters each")
+
+    old_us = per_resume_us(old_latest_year, texts, args.repeat)
+    new_us = per_resume_us(lambda index: dates_from_tokens(index.tokens, today), indexes, args.repeat)
+    old_tokenize_us = per_resume_us(old_token_index, texts, args.repeat)
+    tokenize_us = per_resume_us(TokenIndex, texts, args.repeat)
+    print(f"{'four-digit-year regex over the text':<46} {old_us:>8.1f} us/resume")
+    print(f"{'date pass over the shared TokenIndex tokens':<46} {new_us:>8.1f} us/resume")
+    print(f"{'TokenIndex without / with separators':<46} {old_tokenize_us:>8.1f} / {tokenize_us:.1f} us/resume "
+          f"({tokenize_us - old_tokenize_us:+.1f})")
+
+    resumes = [ResumeText.from_text(text) for text, _ in samples]
+    results = extract_dates_batch(resumes, today)
+    role_end = sum(found.latest_role_end == truth[0] for found, (_, truth) in zip(results, samples))
+    years = sum(abs(found.years_experience - truth[1]) <= 0.1 for found, (_, truth) in zip(results, samples))
+    gaps = sum(found.gaps == truth[2] for found, (_, truth) in zip(results, samples))
+    n = len(samples)
+    print(f"latest role end exact: {role_end / n:.1%}, years of experience within 0.1: {years / n:.1%}, "
+          f"gaps exact: {gaps / n:.1%}")
+
+    expected = [freshness(now // 12 if truth[0] == "present" else int(truth[0][:4]), today.year)
+                for _, truth in samples]
+    old_labels = [freshness(old_latest_year(text), today.year) for text, _ in samples]
+    new_labels = [estimate_resume_freshness(resume) for resume in resumes]
+    print(f"freshness label correct: regex {sum(map(str.__eq__, old_labels, expected)) / n:.1%}, "
+          f"token dates {sum(map(str.__eq__, new_labels, expected)) / n:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Time top-K retrieval from the resume index against rescoring every resume per JD.
+
+Run from the repository root:  python benchmarks/bench_resume_index.py --docs 100000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS, calculate_ats_match, extract_keywords_from_jd  # noqa: E402
+from resume_index import ResumeIndex  # noqa: E402
+
+FILLER = (
+    "experience team developed managed built designed project university bachelor responsible "
+    "improved delivered stakeholders led company customers reduced increased revenue quarterly "
+    "reports internal tools collaborated partners launched features owned migration quality"
+).split()
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+
+
+def make_resume(rng, n_words=300):
+    skills = rng.sample(SKILLS, 20)
+    return " ".join(rng.choice(skills) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(n_words))
+
+
+def make_jd(rng):
+    skills = rng.sample(SKILLS, 12)
+    return "We are hiring an engineer with experience in " + ", ".join(skills) + ". " + make_resume(rng, 60)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("-k", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    path = tempfile.mkdtemp(prefix="resume-index-")
+    try:
+        index = ResumeIndex(path)
+        start = time.perf_counter()
+        for offset in range(0, args.docs, args.batch):
+            batch = [(f"cv-{i:07d}", make_resume(rng)) for i in range(offset, min(args.docs, offset + args.batch))]
+            index.add(batch, store_text=False)
+        build = time.perf_counter() - start
+        print(f"indexed {len(index)} resumes in {build:.1f}s ({len(index) / build:.0f}/s), {index.stats()}")
+
+        jds = [make_jd(rng) for _ in range(args.queries)]
+        latencies = []
+        for jd in jds:
+            start = time.perf_counter()
+            index.search(jd, top_k=args.k)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        print(f"search top-{args.k}: p50 {statistics.median(latencies):.1f}ms  p95 {p95:.1f}ms")
+
+        # Incremental maintenance cost
+        start = time.perf_counter()
+        index.add([(f"cv-new-{i}", make_resume(rng)) for i in range(100)], store_text=False)
+        index.delete([f"cv-{i:07d}" for i in range(100)])
+        print(f"add 100 + delete 100 without rebuild: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        # The alternative: rerun calculate_ats_match on every stored resume for each JD
+        sample = [make_resume(rng) for _ in range(1000)]
+        jd_keywords = extract_keywords_from_jd(jds[0]) or SKILLS[:15]
+        start = time.perf_counter()
+        for text in sample:
+            calculate_ats_match(text, jd_keywords=jd_keywords)
+        per_resume = (time.perf_counter() - start) / len(sample)
+        print(f"rescoring all {len(index)} resumes with calculate_ats_match: "
+              f"~{per_resume * len(index) * 1000:.0f}ms per JD")
+        index.close()
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare page-streamed extraction with a shared normalized view against extract-then-lower-per-scorer.
+
+Run from the repository root:  python benchmarks/bench_resume_text.py --pages 40
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import (  # noqa: E402
+    ROLE_KEYWORDS, calculate_ats_match, calculate_jd_match, scan_resume, suggest_similar_roles
+)
+from resume_parser import (  # noqa: E402
+    ResumeText, estimate_resume_freshness, extract_text_from_pdf, iter_pdf_pages
+)
+
+FILLER = (
+    "Experience team developed managed built designed project University bachelor responsible "
+    "improved delivered stakeholders led company customers reduced increased revenue quarterly"
+).split()
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+JD_KEYWORDS = ["python", "sql", "machine learning", "docker", "stakeholders", "forecasting"]
+
+
+def make_pdf(pages, rng):
+    import fitz
+
+    doc = fitz.open()
+    for number in range(pages):
+        lines = ["Experience" if number % 3 == 0 else "Skills"]
+        for _ in range(45):
+            words = [rng.choice(SKILLS) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(10)]
+            lines.append(" ".join(words) + f" {rng.randint(2005, 2024)}")
+        doc.new_page().insert_text((40, 40), "\n".join(lines), fontsize=7)
+    return doc.tobytes()
+
+
+def legacy_analysis(pdf):
+    """The previous flow: extract everything, then each scorer lowercases the text itself."""
+    text = extract_text_from_pdf(pdf)
+    hits = scan_resume(text, JD_KEYWORDS)
+    calculate_ats_match(text, "data scientist")
+    calculate_jd_match(JD_KEYWORDS, hits)
+    suggest_similar_roles(text)
+    estimate_resume_freshness(text)
+
+
+def shared_analysis(pdf):
+    resume = ResumeText(iter_pdf_pages(pdf))
+    hits = scan_resume(resume, JD_KEYWORDS)
+    calculate_ats_match(resume, "data scientist")
+    calculate_jd_match(JD_KEYWORDS, hits)
+    suggest_similar_roles(resume, hits=hits)
+    estimate_resume_freshness(resume)
+
+
+def first_page(pdf):
+    pages = iter_pdf_pages(pdf)
+    ResumeText([next(pages)])
+    pages.close()
+
+
+def keyword_index_after_last_page(pdf):
+    resume = ResumeText(iter_pdf_pages(pdf))
+    start = time.perf_counter()
+    resume.keyword_index
+    return time.perf_counter() - start
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    for pages in sorted({1, 3, args.pages}):
+        pdf = make_pdf(pages, rng)
+        legacy_analysis(pdf)
+        legacy = median_ms(lambda: legacy_analysis(pdf), args.repeat)
+        shared = median_ms(lambda: shared_analysis(pdf), args.repeat)
+        first = median_ms(lambda: first_page(pdf), args.repeat)
+        # Tokens are built page by page, so only joining them is left once the last page is in
+        ready = statistics.median(keyword_index_after_last_page(pdf) for _ in range(args.repeat)) * 1000
+        print(f"{pages:>3} pages: legacy {legacy:7.1f}ms  shared view {shared:7.1f}ms  "
+              f"first page normalized after {first:5.1f}ms  keyword index {ready:5.2f}ms after the last page")
+
+
+if __name__ == "__main__":
+    main()
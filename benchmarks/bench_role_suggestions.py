@@ -0,0 +1,74 @@
+"""Compare matrix-based role suggestions with the original nested-loop scoring.
+
+The original loop used substring matching; the count of resumes whose
+suggestions changed under token matching is reported, not asserted.
+End to end, the keyword scan every path runs per resume dominates, so
+the role scoring that batching speeds up is also timed alone, on hits
+scanned beforehand.
+
+Run from the repository root:  python benchmarks/bench_role_suggestions.py
+"""
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import BUILTIN_KEYWORDS, ROLE_KEYWORDS, _scan, suggest_roles_batch, suggest_similar_roles  # noqa: E402
+
+FILLER = (
+    "experience team developed managed built designed project university bachelor responsible "
+    "improved delivered stakeholders led company customers reduced increased revenue quarterly"
+).split()
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+
+
+def legacy_suggest_similar_roles(resume_text):
+    """The original suggest_similar_roles scoring loop."""
+    if not resume_text:
+        return []
+    resume_lower = resume_text.lower()
+    role_scores = Counter()
+    for role, keywords in ROLE_KEYWORDS.items():
+        for kw in keywords:
+            if kw in resume_lower:
+                role_scores[role] += 1
+    role_percentages = {role: (score / len(ROLE_KEYWORDS[role])) * 100 for role, score in role_scores.items()}
+    suggested_roles = [role for role, percentage in role_percentages.items() if percentage >= 20]
+    suggested_roles.sort(key=lambda role: role_percentages[role], reverse=True)
+    return suggested_roles[:3]
+
+
+def make_resume(rng, n_words=400):
+    skills = rng.sample(SKILLS, rng.randint(5, 40))
+    return " ".join(rng.choice(skills) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(n_words))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'resumes':>8} {'legacy ms':>10} {'single ms':>10} {'batch ms':>10} "
+          f"{'scoring single us':>18} {'scoring batch us':>17} {'changed':>8}")
+    for n in (1, 100, 1000, 10000):
+        resumes = [make_resume(rng) for _ in range(n)]
+        legacy, legacy_time = timed(lambda: [legacy_suggest_similar_roles(text) for text in resumes])
+        single, single_time = timed(lambda: [suggest_similar_roles(text) for text in resumes])
+        batch, batch_time = timed(lambda: suggest_roles_batch(resumes))
+        assert single == batch, "batch role suggestions diverged from single-resume scoring"
+        hits_list = [_scan(BUILTIN_KEYWORDS, text) for text in resumes]
+        _, scoring_single = timed(lambda: [suggest_similar_roles(t, h) for t, h in zip(resumes, hits_list)])
+        _, scoring_batch = timed(lambda: suggest_roles_batch(resumes, hits_list))
+        changed = sum(a != b for a, b in zip(legacy, batch))
+        print(f"{n:>8} {legacy_time * 1000:>10.1f} {single_time * 1000:>10.1f} {batch_time * 1000:>10.1f} "
+              f"{scoring_single / n * 1e6:>18.1f} {scoring_batch / n * 1e6:>17.1f} {changed:>8}")
+
+
+if __name__ == "__main__":
+    main()
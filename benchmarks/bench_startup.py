@@ -0,0 +1,112 @@
+"""Track the app's cold-start and per-rerun time against fixed budgets.
+
+Run from the repository root:  python benchmarks/bench_startup.py
+Exits non-zero when a measurement is over its budget.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+COLD_IMPORT_BUDGET = 0.5     # seconds to import everything app.py imports
+MODEL_LOAD_BUDGET = 3.0      # seconds for the first load_models() in a process
+RERUN_BUDGET = 0.25          # seconds for a Streamlit rerun with no analysis
+
+APP_MODULES = "streamlit, requests, scorer, resume_parser, ats_matcher, pdf_generator, " \
+              "result_cache, analysis_flow, model_registry"
+HEAVY_MODULES = ["sklearn", "numpy", "fitz", "xhtml2pdf", "joblib"]
+
+
+def run_python(code):
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code], cwd=REPO_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return output.strip().splitlines()[-1]
+
+
+def cold_import(repeat=5):
+    # Streamlit is part of every cold start, so time it separately as the floor
+    code = (
+        "import sys, time; import streamlit; t = time.perf_counter(); "
+        f"import {APP_MODULES}; "
+        "print(time.perf_counter() - t, ','.join(m for m in %r if m in sys.modules))" % (HEAVY_MODULES,)
+    )
+    if not _has_module("streamlit"):
+        code = code.replace("import streamlit; ", "").replace("streamlit, ", "")
+    samples, loaded = [], ""
+    for _ in range(repeat):
+        elapsed, _, loaded = run_python(code).partition(" ")
+        samples.append(float(elapsed))
+    return statistics.median(samples), loaded
+
+
+def model_load():
+    code = (
+        "import time; from model_registry import load_models; "
+        "t = time.perf_counter(); load_models(); first = time.perf_counter() - t; "
+        "t = time.perf_counter(); load_models(); print(first, time.perf_counter() - t)"
+    )
+    first, again = run_python(code).split()
+    return float(first), float(again)
+
+
+def app_reruns(n=5):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(REPO_DIR, "app.py"), default_timeout=60)
+    app.secrets["cohere"] = {"api_key": "benchmark"}
+    start = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - start
+
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        app.run()
+        samples.append(time.perf_counter() - start)
+    return first, statistics.median(samples)
+
+
+def _has_module(name):
+    import importlib.util
+    return importlib.util.find_spec(name) is not None
+
+
+def report(label, value, budget=None):
+    verdict = ""
+    if budget is not None:
+        verdict = "ok" if value <= budget else f"OVER BUDGET ({budget:.3f}s)"
+    print(f"{label:<40} {value * 1000:>9.1f} ms  {verdict}")
+    return budget is None or value <= budget
+
+
+def main():
+    within = True
+
+    elapsed, loaded = cold_import()
+    within &= report("cold import of app modules", elapsed, COLD_IMPORT_BUDGET)
+    print(f"{'  heavy modules loaded at import':<40} {loaded or 'none'}")
+
+    have_models = all(os.path.exists(os.path.join(REPO_DIR, "models", f))
+                      for f in ("svm_pipeline.pkl", "label_encoder.pkl"))
+    if not have_models:
+        print("models/svm_pipeline.pkl not found; skipping model and rerun timings")
+    else:
+        first, again = model_load()
+        within &= report("first load_models()", first, MODEL_LOAD_BUDGET)
+        report("repeat load_models()", again)
+
+        if _has_module("streamlit"):
+            first_run, rerun = app_reruns()
+            report("first app run (includes model load)", first_run)
+            within &= report("app rerun, median", rerun, RERUN_BUDGET)
+
+    sys.exit(0 if within else 1)
+
+
+if __name__ == "__main__":
+    main()
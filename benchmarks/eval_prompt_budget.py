@@ -0,0 +1,129 @@
+"""Evaluate prompt budgeting: prompt size, kept JD evidence and, optionally, LLM score agreement.
+
+Run from the repository root:
+    python benchmarks/eval_prompt_budget.py                       # sizes and keyword retention only
+    COHERE_API_KEY=... python benchmarks/eval_prompt_budget.py --llm
+    python benchmarks/eval_prompt_budget.py --llm --url http://127.0.0.1:8808/v1/chat   # stub server
+
+The evaluation set is generated from a fixed seed, so runs are comparable.
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_matcher import ROLE_KEYWORDS, extract_keywords_from_jd, scan_resume  # noqa: E402
+from cohere_client import AsyncCohereClient  # noqa: E402
+from prompt_budget import count_tokens  # noqa: E402
+from scorer import COHERE_CHAT_URL, build_prompt  # noqa: E402
+
+SKILLS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+FILLER = (
+    "responsible for delivering projects on time working closely with cross functional teams "
+    "improved processes and mentored junior colleagues presented results to leadership"
+).split()
+SCORE_RE = re.compile(r"score:\s*\**\s*(\d{1,3})", re.IGNORECASE)
+
+
+def make_resume(rng):
+    skills = rng.sample(SKILLS, 25)
+    header = f"{rng.choice(['Jane', 'Arjun', 'Maria', 'Wei'])} {rng.choice(['Doe', 'Rao', 'Silva', 'Chen'])}"
+    lines = [header, "email@example.com | +1 555 0100", "", "Summary",
+             " ".join(rng.choice(FILLER) for _ in range(40)), "", "Skills", ", ".join(skills[:12]), "",
+             "Experience"]
+    for job in range(rng.randint(3, 8)):
+        lines.append(f"Senior Engineer, Company {job} {2024 - 3 * job - 3} – {2024 - 3 * job}")
+        for _ in range(rng.randint(4, 9)):
+            words = [rng.choice(skills) if rng.random() < 0.2 else rng.choice(FILLER) for _ in range(18)]
+            lines.append("• " + " ".join(words))
+        if job % 2:
+            # Page break artifacts from PyMuPDF: footer, page number, running header
+            lines += [f"{header} – Resume", f"Page {job} of 5", ""]
+    lines += ["", "Education", "BSc Computer Science, State University 2012", "", "Projects"]
+    lines += [" ".join(rng.choice(FILLER) for _ in range(25)) for _ in range(rng.randint(2, 6))]
+    lines += ["", "Certifications", "•", "AWS Certified Solutions Architect"]
+    return "\n".join(lines)
+
+
+def make_jd(rng):
+    skills = rng.sample(SKILLS, 10)
+    return ("We are hiring an engineer to join our team. Requirements: " + ", ".join(skills) + ". "
+            + " ".join(rng.choice(FILLER) for _ in range(120)))
+
+
+def keyword_retention(resume, prompt, jd_keywords):
+    """Share of the JD keywords present in the resume that the prompt still contains."""
+    present = [kw for kw in jd_keywords if kw.lower() in scan_resume(resume, jd_keywords)]
+    kept = [kw for kw in present if kw.lower() in prompt.lower()]
+    return len(kept) / len(present) if present else 1.0
+
+
+def summarize(label, samples, unit=""):
+    samples = sorted(samples)
+    p95 = samples[int(0.95 * (len(samples) - 1))]
+    print(f"{label:<34} p50 {statistics.median(samples):8.1f}{unit}  p95 {p95:8.1f}{unit}")
+
+
+async def score_prompts(prompts, api_key, url, concurrency):
+    async with AsyncCohereClient(api_key, url=url, max_concurrency=concurrency) as client:
+        async def timed(prompt):
+            start = time.perf_counter()
+            text = await client.chat(prompt)
+            return text, time.perf_counter() - start
+        return await asyncio.gather(*(timed(prompt) for prompt in prompts))
+
+
+def parse_score(text):
+    match = SCORE_RE.search(text)
+    return int(match.group(1)) if match else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=60)
+    parser.add_argument("--llm", action="store_true", help="Also score both prompts with the LLM")
+    parser.add_argument("--url", default=COHERE_CHAT_URL)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    cases = []
+    for _ in range(args.cases):
+        resume, jd = make_resume(rng), make_jd(rng)
+        jd_keywords = extract_keywords_from_jd(jd)
+        full = build_prompt(resume, "Software Engineer", "brief", jd, resume_token_budget=None, jd_token_budget=None)
+        budgeted = build_prompt(resume, "Software Engineer", "brief", jd, jd_keywords=jd_keywords)
+        cases.append((resume, jd_keywords, full, budgeted))
+
+    full_tokens = [count_tokens(full) for _, _, full, _ in cases]
+    budget_tokens = [count_tokens(budgeted) for _, _, _, budgeted in cases]
+    summarize("prompt tokens, full", full_tokens)
+    summarize("prompt tokens, budgeted", budget_tokens)
+    print(f"{'median prompt size cut':<34} {1 - statistics.median(budget_tokens) / statistics.median(full_tokens):.0%}")
+    retention = [keyword_retention(resume, budgeted, kws) for resume, kws, _, budgeted in cases]
+    print(f"{'JD keywords kept from the resume':<34} mean {statistics.mean(retention):.1%}  min {min(retention):.1%}")
+
+    if not args.llm:
+        return
+    api_key = os.environ.get("COHERE_API_KEY", "evaluation")
+    full_runs = asyncio.run(score_prompts([c[2] for c in cases], api_key, args.url, args.concurrency))
+    budget_runs = asyncio.run(score_prompts([c[3] for c in cases], api_key, args.url, args.concurrency))
+    summarize("LLM latency, full", [t * 1000 for _, t in full_runs], "ms")
+    summarize("LLM latency, budgeted", [t * 1000 for _, t in budget_runs], "ms")
+
+    pairs = [(parse_score(a), parse_score(b)) for (a, _), (b, _) in zip(full_runs, budget_runs)]
+    pairs = [(a, b) for a, b in pairs if a is not None and b is not None]
+    if pairs:
+        diffs = [abs(a - b) for a, b in pairs]
+        print(f"{'score |full - budgeted|':<34} mean {statistics.mean(diffs):.1f}  max {max(diffs)}  "
+              f"({len(pairs)} of {len(cases)} parsed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Local stand-in for the Cohere chat endpoint with configurable latency and 429s.
+
+Run standalone:  python benchmarks/stub_cohere_server.py --latency 0.5 --max-rps 20
+then point AsyncCohereClient(url="http://127.0.0.1:8808/v1/chat") at it.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import web
+
+
+class StubCohere:
+    """Answers like Cohere, throttling above `max_rps` and failing at `error_rate`."""
+
+    def __init__(self, latency=0.2, jitter=0.05, max_rps=None, retry_after=1, error_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.requests = 0
+        self.throttled = 0
+        self._window = []
+
+    def _over_limit(self):
+        now = time.monotonic()
+        self._window = [t for t in self._window if now - t < 1.0]
+        if self.max_rps is not None and len(self._window) >= self.max_rps:
+            return True
+        self._window.append(now)
+        return False
+
+    async def chat(self, request):
+        self.requests += 1
+        body = await request.json()
+        if self._over_limit():
+            self.throttled += 1
+            return web.json_response({"message": "too many requests"}, status=429,
+                                     headers={"Retry-After": str(self.retry_after)})
+        if random.random() < self.error_rate:
+            return web.json_response({"message": "internal error"}, status=503)
+
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+        score = 50 + len(body.get("message", "")) % 50
+        text = (f"**Score: {score}/100**\nStrengths:\n- Clear structure\n- Relevant skills\n"
+                "Areas to improve:\n- Quantify impact\n- Tailor the summary")
+        if not body.get("stream"):
+            return web.json_response({"text": text})
+
+        # Streamed replies arrive as one JSON event per line, a few words at a time
+        response = web.StreamResponse(headers={"Content-Type": "application/stream+json"})
+        await response.prepare(request)
+        await response.write(json.dumps({"event_type": "stream-start"}).encode() + b"\n")
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            chunk = word if i == 0 else " " + word
+            await response.write(json.dumps({"event_type": "text-generation", "text": chunk}).encode() + b"\n")
+            await asyncio.sleep(self.latency / len(words))
+        await response.write(json.dumps({"event_type": "stream-end", "response": {"text": text}}).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat", self.chat)
+        return app
+
+
+async def start_stub_server(stub, host="127.0.0.1", port=0):
+    """Start `stub` in the running loop. Returns the runner and the chat URL."""
+    runner = web.AppRunner(stub.app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{port}/v1/chat"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--max-rps", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubCohere(latency=args.latency, max_rps=args.max_rps, error_rate=args.error_rate)
+    web.run_app(stub.app(), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""Resume category prediction: batched, with top-k scores and an sklearn-free fast path.
+
+The trained pipeline (TF-IDF followed by a linear classifier) is exported once
+into `models/svm_weights.npz`: the vocabulary, IDF weights and a float32
+term-by-category weight matrix. Predicting is then one sparse dot product over
+the term counts `ResumeText` already collected while tokenizing the resume for
+keyword matching, so the text is not vectorized a second time:
+
+    python category_model.py export                                  # writes models/svm_weights.npz
+    python category_model.py export --calibration resumes.csv        # also fits the score temperature
+
+Scores are a softmax over the classifier's decision values divided by a
+temperature. Without `--calibration` the temperature is 1.0, which ranks the
+categories correctly but does not make the scores probabilities; fitting it on
+labelled resumes (a CSV with `Category` and `Resume` columns, as the model was
+trained on) does. Pipelines the fast path cannot represent fall back to
+sklearn with the same interface. Refresh the manifest after exporting.
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+import warnings
+from functools import lru_cache
+
+from model_registry import ARTIFACTS, MODEL_DIR, file_sha256, get_model, load_models
+from resume_parser import ResumeText, as_resume_text
+
+DEFAULT_TOP_K = 3
+# The only tokenization the fast path reproduces: ResumeText's \w+ tokens of two or more characters
+SUPPORTED_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+def _softmax(decisions, temperature):
+    import numpy as np
+
+    scaled = decisions / temperature
+    scaled -= scaled.max(axis=1, keepdims=True)
+    exp = np.exp(scaled)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _top_k(classes, scores, k):
+    import numpy as np
+
+    k = min(k, len(classes))
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return [[(classes[j], float(row[j])) for j in top] for row, top in zip(scores, order)]
+
+
+def fit_temperature(decisions, targets):
+    """Temperature that minimizes the negative log-likelihood of the true categories."""
+    import numpy as np
+
+    rows = np.arange(len(targets))
+
+    def nll(log_t):
+        return -np.log(_softmax(decisions, math.exp(log_t))[rows, targets] + 1e-12).mean()
+
+    # Golden-section search over log T between 0.01 and 100; the NLL is unimodal in T
+    low, high = math.log(0.01), math.log(100.0)
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(60):
+        a = high - ratio * (high - low)
+        b = low + ratio * (high - low)
+        if nll(a) < nll(b):
+            high = b
+        else:
+            low = a
+    return math.exp((low + high) / 2)
+
+
+class LinearCategoryModel:
+    """A TF-IDF + linear classifier pipeline reduced to numpy arrays.
+
+    `weights` is vocabulary-by-category, so a resume's TF-IDF row times the
+    matrix plus `intercept` gives the same decision values as the pipeline.
+    """
+
+    def __init__(self, terms, idf, weights, intercept, classes, temperature=1.0,
+                 sublinear_tf=False, binary=False, norm="l2", pipeline_sha256=""):
+        self.terms = list(terms)
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.idf = idf
+        self.weights = weights
+        self.intercept = intercept
+        self.classes = list(classes)
+        self.temperature = temperature
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.norm = norm
+        self.pipeline_sha256 = pipeline_sha256
+
+    @property
+    def fingerprint(self):
+        """Changes with the fitted pipeline and the calibration, for keying cached predictions."""
+        return f"{self.pipeline_sha256}:{self.temperature!r}"
+
+    @classmethod
+    def from_pipeline(cls, pipeline, label_encoder, pipeline_sha256=""):
+        """Convert a fitted pipeline; raises ValueError when it is not a word TF-IDF + linear model."""
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        if len(getattr(pipeline, "steps", ())) != 2:
+            raise ValueError("expected a pipeline of a TF-IDF vectorizer and a linear classifier")
+        vectorizer, classifier = pipeline.steps[0][1], pipeline.steps[1][1]
+        if not isinstance(vectorizer, TfidfVectorizer):
+            raise ValueError(f"{type(vectorizer).__name__} is not a TfidfVectorizer")
+        # Stop words, min_df and max_features only shape the vocabulary, which is copied as is
+        required = {
+            "analyzer": "word", "ngram_range": (1, 1), "lowercase": True, "token_pattern": SUPPORTED_TOKEN_PATTERN,
+            "tokenizer": None, "preprocessor": None, "strip_accents": None,
+        }
+        for param, expected in required.items():
+            if getattr(vectorizer, param) != expected:
+                raise ValueError(f"vectorizer {param}={getattr(vectorizer, param)!r} is not supported")
+        if vectorizer.norm not in ("l1", "l2", None):
+            raise ValueError(f"vectorizer norm={vectorizer.norm!r} is not supported")
+        if not hasattr(classifier, "coef_") or not hasattr(classifier, "intercept_"):
+            raise ValueError(f"{type(classifier).__name__} is not a linear model")
+
+        coef = np.asarray(classifier.coef_, dtype=np.float32)
+        intercept = np.asarray(classifier.intercept_, dtype=np.float32).ravel()
+        if coef.shape[0] == 1:
+            # Binary models score only the second class; -w/+w keeps the argmax and margins
+            coef = np.vstack([-coef, coef])
+            intercept = np.concatenate([-intercept, intercept])
+
+        vocabulary = vectorizer.vocabulary_
+        terms = sorted(vocabulary, key=vocabulary.get)
+        idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(len(terms))
+        return cls(
+            terms=terms,
+            idf=np.asarray(idf, dtype=np.float32),
+            weights=np.ascontiguousarray(coef.T),
+            intercept=intercept,
+            classes=[str(label) for label in label_encoder.inverse_transform(classifier.classes_)],
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary,
+            norm=vectorizer.norm,
+            pipeline_sha256=pipeline_sha256,
+        )
+
+    def save(self, path):
+        import numpy as np
+
+        # Tokens never contain a newline, so the vocabulary is stored as one string
+        np.savez(
+            path,
+            terms=np.frombuffer("\n".join(self.terms).encode("utf-8"), dtype=np.uint8),
+            idf=self.idf,
+            weights=self.weights,
+            intercept=self.intercept,
+            classes=np.array(self.classes),
+            temperature=self.temperature,
+            sublinear_tf=self.sublinear_tf,
+            binary=self.binary,
+            norm=self.norm or "",
+            pipeline_sha256=self.pipeline_sha256,
+        )
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(
+                terms=data["terms"].tobytes().decode("utf-8").split("\n"),
+                idf=data["idf"],
+                weights=data["weights"],
+                intercept=data["intercept"],
+                classes=[str(label) for label in data["classes"]],
+                temperature=float(data["temperature"]),
+                sublinear_tf=bool(data["sublinear_tf"]),
+                binary=bool(data["binary"]),
+                norm=str(data["norm"]) or None,
+                pipeline_sha256=str(data["pipeline_sha256"]),
+            )
+
+    def features(self, resumes):
+        """TF-IDF rows for `resumes` (ResumeText or str), built from their token counts."""
+        import numpy as np
+        from scipy import sparse
+
+        vocabulary = self.vocabulary
+        indptr, indices, values = [0], [], []
+        for resume in resumes:
+            for token, count in as_resume_text(resume).word_counts.items():
+                i = vocabulary.get(token)
+                # Single characters never match the vectorizer's token pattern
+                if i is not None and len(token) > 1:
+                    indices.append(i)
+                    values.append(count)
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        values = np.asarray(values, dtype=np.float32)
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            values = 1.0 + np.log(values)
+        values *= self.idf[indices]
+        matrix = sparse.csr_matrix((values, indices, np.asarray(indptr)), shape=(len(indptr) - 1, len(self.terms)))
+
+        if self.norm:
+            squared = matrix.copy()
+            if self.norm == "l2":
+                squared.data **= 2
+                lengths = np.sqrt(np.asarray(squared.sum(axis=1)).ravel())
+            else:
+                squared.data = np.abs(squared.data)
+                lengths = np.asarray(squared.sum(axis=1)).ravel()
+            lengths[lengths == 0] = 1.0
+            matrix = sparse.diags(1.0 / lengths) @ matrix
+        return matrix
+
+    def decision_function(self, resumes):
+        import numpy as np
+
+        return np.asarray(self.features(resumes) @ self.weights) + self.intercept
+
+    def predict(self, resumes):
+        """The most likely category of every resume."""
+        return [self.classes[i] for i in self.decision_function(resumes).argmax(axis=1)]
+
+    def predict_top_k(self, resumes, k=DEFAULT_TOP_K):
+        """The `k` most likely `(category, score)` pairs of every resume, best first."""
+        return _top_k(self.classes, _softmax(self.decision_function(resumes), self.temperature), k)
+
+
+class PipelineCategoryModel:
+    """The same interface over the sklearn pipeline, for models the fast path cannot represent."""
+
+    def __init__(self, pipeline, label_encoder, pipeline_sha256=""):
+        self.pipeline = pipeline
+        self.label_encoder = label_encoder
+        classifier = pipeline.steps[-1][1]
+        self.classes = [str(label) for label in label_encoder.inverse_transform(classifier.classes_)]
+        self.pipeline_sha256 = pipeline_sha256
+
+    @property
+    def fingerprint(self):
+        return self.pipeline_sha256
+
+    def _texts(self, resumes):
+        return [resume.text if isinstance(resume, ResumeText) else resume for resume in resumes]
+
+    def predict(self, resumes):
+        labels = self.label_encoder.inverse_transform(self.pipeline.predict(self._texts(resumes)))
+        return [str(label) for label in labels]
+
+    def predict_top_k(self, resumes, k=DEFAULT_TOP_K):
+        import numpy as np
+
+        texts = self._texts(resumes)
+        if hasattr(self.pipeline, "predict_proba"):
+            return _top_k(self.classes, self.pipeline.predict_proba(texts), k)
+        decisions = np.asarray(self.pipeline.decision_function(texts))
+        if decisions.ndim == 1:
+            decisions = np.column_stack([-decisions, decisions])
+        return _top_k(self.classes, _softmax(decisions, 1.0), k)
+
+
+@lru_cache(maxsize=None)
+def get_category_model(model_dir=MODEL_DIR):
+    """The category model for `model_dir`, loaded once per process.
+
+    Uses the exported weights unless the pipeline was retrained after the
+    export, then converts the pipeline in memory, falling back to sklearn.
+    """
+    weights_path = os.path.join(model_dir, ARTIFACTS["svm_weights"])
+    pipeline_path = os.path.join(model_dir, ARTIFACTS["svm_pipeline"])
+    pipeline_sha256 = file_sha256(pipeline_path) if os.path.exists(pipeline_path) else ""
+    if os.path.exists(weights_path):
+        model = get_model("svm_weights", model_dir, loader=LinearCategoryModel.load)
+        if not pipeline_sha256 or pipeline_sha256 == model.pipeline_sha256:
+            return model
+        warnings.warn(f"{weights_path} was exported from a different {ARTIFACTS['svm_pipeline']}; re-export it")
+
+    pipeline, label_encoder = load_models(model_dir)
+    try:
+        return LinearCategoryModel.from_pipeline(pipeline, label_encoder, pipeline_sha256)
+    except ValueError:
+        return PipelineCategoryModel(pipeline, label_encoder, pipeline_sha256)
+
+
+def read_labelled_resumes(path, text_column="Resume", label_column="Category"):
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    return [row[text_column] for row in rows], [row[label_column] for row in rows]
+
+
+def export(model_dir=MODEL_DIR, calibration=None, text_column="Resume", label_column="Category"):
+    """Write `svm_weights.npz` for the pipeline in `model_dir`; return the exported model."""
+    pipeline, label_encoder = load_models(model_dir)
+    pipeline_sha256 = file_sha256(os.path.join(model_dir, ARTIFACTS["svm_pipeline"]))
+    model = LinearCategoryModel.from_pipeline(pipeline, label_encoder, pipeline_sha256)
+
+    if calibration:
+        texts, labels = read_labelled_resumes(calibration, text_column, label_column)
+        index = {label: i for i, label in enumerate(model.classes)}
+        known = [(text, index[label]) for text, label in zip(texts, labels) if label in index]
+        if not known:
+            raise ValueError(f"no rows of {calibration} have a category the model knows")
+        decisions = model.decision_function([text for text, _ in known])
+        model.temperature = fit_temperature(decisions, [target for _, target in known])
+
+    model.save(os.path.join(model_dir, ARTIFACTS["svm_weights"]))
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the category model for the numpy fast path.")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--calibration", help="CSV of labelled resumes used to fit the score temperature")
+    parser.add_argument("--text-column", default="Resume")
+    parser.add_argument("--label-column", default="Category")
+    args = parser.parse_args()
+
+    try:
+        model = export(args.model_dir, args.calibration, args.text_column, args.label_column)
+    except ValueError as e:
+        sys.exit(f"Cannot export: {e}")
+    print(f"Exported {len(model.terms)} terms x {len(model.classes)} categories "
+          f"(temperature {model.temperature:.3f}) to {os.path.join(args.model_dir, ARTIFACTS['svm_weights'])}")
+
+
+if __name__ == "__main__":
+    main()
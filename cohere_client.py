@@ -0,0 +1,133 @@
+"""Async, pooled and rate-limited Cohere client for scoring many resumes at once."""
+import asyncio
+import time
+
+import aiohttp
+
+from prompt_budget import count_tokens
+from scorer import (
+    COHERE_CHAT_URL, COHERE_MODEL, RETRY_STATUSES, auth_headers, build_payload, build_prompt, log_llm_call, parse_response,
+    retry_delay
+)
+
+
+# Failures worth another attempt; aiohttp.ClientResponseError, also a ClientError, is decided by its status
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+
+class TokenBucket:
+    """Allow `rate` requests per second on average, with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncCohereClient:
+    """Cohere chat client with connection pooling, concurrency and rate limits.
+
+    429 and 5xx responses, dropped connections and timeouts are retried with
+    exponential backoff and jitter, honoring Retry-After. Use it as an async
+    context manager:
+
+        async with AsyncCohereClient(api_key) as client:
+            feedback = await client.score_resume(resume_text, job_title="Data Scientist")
+    """
+
+    def __init__(self, api_key, url=COHERE_CHAT_URL, max_concurrency=8, requests_per_second=None,
+                 timeout=60, max_retries=5, backoff_base=1.0, backoff_cap=30.0, model=COHERE_MODEL):
+        self.api_key = api_key
+        self.url = url
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retries = 0
+        self._session = None
+        self._semaphore = None
+        self._bucket = None
+
+    async def __aenter__(self):
+        # Asyncio primitives bind to the running loop, so build them here
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=auth_headers(self.api_key),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.requests_per_second:
+            self._bucket = TokenBucket(self.requests_per_second)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def chat(self, prompt):
+        """Send one prompt and return the response text."""
+        async with self._semaphore:
+            start = time.perf_counter()
+            for attempt in range(self.max_retries + 1):
+                if self._bucket is not None:
+                    await self._bucket.acquire()
+                retry_after = None
+                try:
+                    async with self._session.post(self.url, json=build_payload(prompt, self.model)) as response:
+                        if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                            retry_after = response.headers.get("Retry-After")
+                        else:
+                            log_llm_call(count_tokens(prompt), start, response.status, attempt + 1)
+                            response.raise_for_status()
+                            return parse_response(await response.json(content_type=None))
+                except RETRY_EXCEPTIONS as e:
+                    if attempt == self.max_retries:
+                        log_llm_call(count_tokens(prompt), start, type(e).__name__, attempt + 1)
+                        raise
+                self.retries += 1
+                await asyncio.sleep(retry_delay(attempt, retry_after, base=self.backoff_base, cap=self.backoff_cap))
+
+    async def score_resume(self, resume_text, job_title="", mode="brief", job_description="", jd_keywords=None):
+        prompt = build_prompt(resume_text, job_title=job_title, mode=mode, job_description=job_description,
+                              jd_keywords=jd_keywords)
+        return await self.chat(prompt)
+
+    async def score_many(self, resume_texts, job_title="", mode="brief", job_description="", jd_keywords=None):
+        """Score every resume concurrently. Failed calls come back as exceptions."""
+        tasks = [
+            self.score_resume(text, job_title=job_title, mode=mode, job_description=job_description,
+                              jd_keywords=jd_keywords)
+            for text in resume_texts
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def score_resumes(resume_texts, api_key, job_title="", mode="brief", job_description="", jd_keywords=None,
+                  **client_options):
+    """Blocking wrapper around `AsyncCohereClient.score_many` for scripts and batch jobs."""
+    async def run():
+        async with AsyncCohereClient(api_key, **client_options) as client:
+            return await client.score_many(resume_texts, job_title=job_title, mode=mode,
+                                           job_description=job_description, jd_keywords=jd_keywords)
+
+    return asyncio.run(run())
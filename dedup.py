@@ -0,0 +1,335 @@
+"""Exact and near-duplicate detection for bulk resume intake.
+
+The same candidate is often submitted several times, sometimes with small
+edits. Each resume is checked before any expensive stage runs:
+
+- an exact hash of its lowercased word sequence catches copies that differ
+  only in layout, case or punctuation;
+- a MinHash signature over word shingles estimates the Jaccard similarity
+  of near-copies, and locality-sensitive hashing (LSH) of the signature's
+  bands finds candidates without comparing every pair.
+
+A resume is a duplicate when its estimated similarity to one kept earlier is
+at least the threshold; the earlier one is its `original`.
+"""
+import re
+import zlib
+from collections import OrderedDict, namedtuple
+
+from result_cache import content_hash
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+# Shingles hashed at once; the scratch buffer is this times `num_perm` uint64s, 32 MB with 128 permutations
+_CHUNK_ROWS = 1 << 15
+_BATCH_SIZE = 1024
+# Screening results `ReusableResults` keeps for copying to later duplicates
+DEFAULT_MAX_RESULTS = 10000
+
+_WORD_RE = re.compile(r"\w+")
+# Mixes a shingle's token hashes into one 64-bit value (an odd constant, so no bits are lost)
+_SHINGLE_MULTIPLIER = 0x9E3779B97F4A7C15
+
+Duplicate = namedtuple("Duplicate", ["original", "similarity", "exact"])
+
+
+def _false_positive_rate(threshold, bands, rows, steps=100):
+    # Area under the LSH S-curve 1 - (1 - s^r)^b below the threshold
+    width = threshold / steps
+    return sum(1 - (1 - ((i + 0.5) * width) ** rows) ** bands for i in range(steps)) * width
+
+
+def _false_negative_rate(threshold, bands, rows, steps=100):
+    width = (1 - threshold) / steps
+    return sum((1 - ((threshold + (i + 0.5) * width) ** rows)) ** bands for i in range(steps)) * width
+
+
+def lsh_params(threshold, num_perm=DEFAULT_NUM_PERM, false_negative_weight=0.9):
+    """The `(bands, rows)` split of a signature that best separates pairs at `threshold`.
+
+    Pairs sharing one whole band become candidates. The split minimizes the
+    weighted chances of missing a pair above the threshold and of proposing
+    one below it; missing weighs more, since a missed duplicate is screened
+    again while a false candidate only costs one signature comparison.
+    """
+    best, best_error = (1, num_perm), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = (false_negative_weight * _false_negative_rate(threshold, bands, rows)
+                 + (1 - false_negative_weight) * _false_positive_rate(threshold, bands, rows))
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def words(text):
+    """The lowercased word sequence that both the exact hash and the shingles are taken from."""
+    return _WORD_RE.findall(text.lower())
+
+
+def exact_key(tokens):
+    """Hash of a word sequence, so copies differing only in layout or punctuation agree."""
+    return content_hash(" ".join(tokens))
+
+
+class MinHasher:
+    """MinHash signatures of word shingles, computed with numpy for many texts at once.
+
+    Each permutation is a multiply-shift hash of the shingle's 64-bit hash;
+    a signature keeps the smallest value per permutation as uint32.
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Odd multipliers keep the multiply-shift family universal
+        self._a = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        # crc32 of each token seen; stable across processes, unlike hash()
+        self._token_hashes = {}
+        self._buffer = None
+
+    def shingles(self, tokens):
+        """The 64-bit hashes of a word sequence's shingles; a short sequence is one shingle."""
+        import numpy as np
+
+        token_hashes = self._token_hashes
+        for token in set(tokens).difference(token_hashes):
+            token_hashes[token] = zlib.crc32(token.encode("utf-8"))
+        hashes = np.fromiter(map(token_hashes.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+
+        k = min(self.shingle_size, len(hashes))
+        if not k:
+            return hashes
+        n = len(hashes) - k + 1
+        combined = hashes[:n].copy()
+        multiplier = np.uint64(_SHINGLE_MULTIPLIER)
+        with np.errstate(over="ignore"):
+            for offset in range(1, k):
+                combined *= multiplier
+                combined += hashes[offset:offset + n]
+        return combined
+
+    def _min_hashes(self, shingles, starts):
+        """Signatures of the texts whose shingles begin at `starts` within `shingles`."""
+        import numpy as np
+
+        # Permutations along rows and shingles along columns, computed in place: reducing
+        # contiguous rows is several times faster than reducing down columns. The shift to
+        # the high 32 bits is monotonic, so it is applied to the minimums only.
+        hashed = self._buffer[:, :len(shingles)]
+        with np.errstate(over="ignore"):
+            np.multiply(self._a[:, None], shingles, out=hashed)
+            hashed += self._b[:, None]
+        minimums = np.minimum.reduceat(hashed, starts, axis=1)
+        return (minimums.T >> np.uint64(32)).astype(np.uint32)
+
+    def signatures(self, token_lists):
+        """One signature row per word sequence, as a `(len(token_lists), num_perm)` uint32 array.
+
+        An empty sequence gets the all-ones signature, which only matches
+        other empty ones.
+        """
+        import numpy as np
+
+        if self._buffer is None:
+            self._buffer = np.empty((self.num_perm, _CHUNK_ROWS), dtype=np.uint64)
+        signatures = np.full((len(token_lists), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        pending, pending_rows = [], []
+        pending_size = 0
+
+        def flush():
+            # One hashing pass for a group of texts, reduced back to per-text minimums
+            starts = np.cumsum([0] + [len(s) for s in pending[:-1]])
+            signatures[pending_rows] = self._min_hashes(np.concatenate(pending), starts)
+            pending.clear()
+            pending_rows.clear()
+
+        for row, tokens in enumerate(token_lists):
+            shingles = self.shingles(tokens)
+            if len(shingles) > _CHUNK_ROWS:
+                # Too long to share a chunk: hashed alone in slices, keeping the running minimum
+                for start in range(0, len(shingles), _CHUNK_ROWS):
+                    hashed = self._min_hashes(shingles[start:start + _CHUNK_ROWS], [0])[0]
+                    signatures[row] = np.minimum(signatures[row], hashed)
+                continue
+            if not len(shingles):
+                continue
+            if pending_size + len(shingles) > _CHUNK_ROWS:
+                flush()
+                pending_size = 0
+            pending.append(shingles)
+            pending_rows.append(row)
+            pending_size += len(shingles)
+        if pending:
+            flush()
+        return signatures
+
+
+class Deduplicator:
+    """Incremental duplicate detector: every resume added is compared with those kept so far.
+
+    `threshold` is the estimated Jaccard similarity of word shingles at or
+    above which a resume counts as a duplicate. Exact copies are found by
+    hash; the rest through LSH buckets over `num_perm` MinHash values,
+    confirmed by the signatures' agreement. With `max_kept`, only that many
+    of the most recently kept resumes are compared against, so memory stays
+    flat however many are added.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1, max_kept=None):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.max_kept = max_kept
+        self.hasher = MinHasher(num_perm, shingle_size, seed)
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._exact = {}         # exact key -> the Duplicate a copy of that text is
+        # position -> (doc_id, signature, band keys, exact keys pointing at it), oldest first
+        self._kept = OrderedDict()
+        self._next_position = 0
+        self._buckets = [{} for _ in range(self.bands)]
+
+    def __len__(self):
+        """Distinct resumes kept."""
+        return len(self._kept)
+
+    def add(self, doc_id, text):
+        """Add one resume; returns its `Duplicate`, or None when it is kept as new."""
+        return self.add_many([(doc_id, text)])[0]
+
+    def add_many(self, docs):
+        """Add `(doc_id, text)` pairs in order, signing them in batches.
+
+        Returns a `Duplicate` or None per pair; a pair may duplicate an earlier
+        one from the same call.
+        """
+        docs = list(docs)
+        results = []
+        # Bounds the token lists held at once, whatever the number of resumes
+        for start in range(0, len(docs), _BATCH_SIZE):
+            results.extend(self._add_batch(docs[start:start + _BATCH_SIZE]))
+        return results
+
+    def _add_batch(self, docs):
+        token_lists = [words(text) for _, text in docs]
+        keys = [exact_key(tokens) for tokens in token_lists]
+        # Only the first occurrence of each text needs a signature
+        first_seen = {}
+        to_sign = []
+        for key, tokens in zip(keys, token_lists):
+            if key not in self._exact and key not in first_seen:
+                first_seen[key] = len(to_sign)
+                to_sign.append(tokens)
+        signatures = self.hasher.signatures(to_sign)
+
+        results = []
+        for (doc_id, _), key in zip(docs, keys):
+            # A copy of a kept resume duplicates it exactly; a copy of a near-duplicate, its original
+            if key in self._exact:
+                results.append(self._exact[key])
+                continue
+            signature = signatures[first_seen[key]]
+            bands = self._band_keys(signature)
+            position, match = self._best_match(signature, bands)
+            if match is None:
+                self._keep(doc_id, key, signature, bands)
+            else:
+                self._exact[key] = match
+                self._kept[position][3].append(key)
+            results.append(match)
+        # Only after the batch, since keys looked up above decided which texts were signed
+        if self.max_kept is not None:
+            while len(self._kept) > self.max_kept:
+                self._forget_oldest()
+        return results
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _best_match(self, signature, bands):
+        candidates = set()
+        for buckets, band in zip(self._buckets, bands):
+            candidates.update(buckets.get(band, ()))
+        best = None
+        for candidate in candidates:
+            similarity = float((self._kept[candidate][1] == signature).mean())
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        if best is None:
+            return None, None
+        return best[0], Duplicate(self._kept[best[0]][0], best[1], False)
+
+    def _keep(self, doc_id, key, signature, bands):
+        position = self._next_position
+        self._next_position += 1
+        self._kept[position] = (doc_id, signature, bands, [key])
+        self._exact[key] = Duplicate(doc_id, 1.0, True)
+        for buckets, band in zip(self._buckets, bands):
+            buckets.setdefault(band, []).append(position)
+
+    def _forget_oldest(self):
+        position, (_, _, bands, keys) = self._kept.popitem(last=False)
+        for key in keys:
+            del self._exact[key]
+        for buckets, band in zip(self._buckets, bands):
+            # The oldest position is first in its buckets
+            positions = buckets[band]
+            positions.remove(position)
+            if not positions:
+                del buckets[band]
+
+
+def find_duplicates(resumes, threshold=DEFAULT_THRESHOLD, deduplicator=None):
+    """Map the id of every `(resume_id, text)` pair that repeats an earlier one to its `Duplicate`.
+
+    Pass a `deduplicator` to also compare against resumes it has already seen.
+    """
+    if deduplicator is None:
+        deduplicator = Deduplicator(threshold)
+    resumes = list(resumes)
+    matches = deduplicator.add_many(resumes)
+    return {resume_id: match for (resume_id, _), match in zip(resumes, matches) if match is not None}
+
+
+class ReusableResults:
+    """Results of resumes screened so far, for duplicates arriving in later batches.
+
+    A streamed run screens one chunk at a time; sharing one of these across
+    the chunks lets a resume repeat one from any earlier chunk. Resumes get
+    serial keys, unique across batches. Memory stays flat: the deduplicator
+    keeps the signatures of the `max_results` most recently kept resumes and
+    only the `max_results` most recently used results are kept. A duplicate
+    of an original that was dropped from either is screened again.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_results=DEFAULT_MAX_RESULTS):
+        self.deduplicator = Deduplicator(threshold, max_kept=max_results)
+        self.max_results = max_results
+        self._results = OrderedDict()
+        self._next_key = 0
+
+    def match_many(self, texts):
+        """Return a key per text and its `Duplicate` (original being a key) or None to screen it."""
+        # Dropped before the batch, so every original within it stays available
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        start = self._next_key
+        texts = list(texts)
+        keys = list(range(start, start + len(texts)))
+        self._next_key += len(texts)
+        matches = self.deduplicator.add_many(zip(keys, texts))
+        return keys, [match if match is None or match.original >= start or match.original in self._results
+                      else None for match in matches]
+
+    def remember(self, key, result):
+        self._results[key] = result
+
+    def result(self, key):
+        self._results.move_to_end(key)
+        return self._results[key]
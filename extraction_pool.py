@@ -0,0 +1,154 @@
+"""Parallel PDF text extraction for bulk resume intake."""
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from multiprocessing.connection import wait
+
+from resume_parser import extract_text_from_pdf
+
+DEFAULT_TIMEOUT = 30          # seconds per file
+DEFAULT_MAX_PAGES = 50        # resumes past this are almost certainly not resumes
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+# Seconds a stopping worker gets to exit before it is killed
+_STOP_GRACE = 1
+
+ExtractionResult = namedtuple("ExtractionResult", ["name", "text", "error", "latency"])
+
+
+class ExtractionTimeout(Exception):
+    """Reported for a PDF whose worker was killed for exceeding its time budget."""
+
+
+def _error(e):
+    return f"{type(e).__name__}: {e}"
+
+
+def _check_size(source, max_bytes):
+    size = os.path.getsize(source) if isinstance(source, (str, os.PathLike)) else len(source)
+    if max_bytes and size > max_bytes:
+        raise ValueError(f"file is {size} bytes, over the {max_bytes} byte limit")
+
+
+def extract_one(name, source, max_pages=DEFAULT_MAX_PAGES, max_bytes=DEFAULT_MAX_BYTES):
+    """Extract one PDF given as a path or bytes in this process, never raising and with no time limit."""
+    start = time.perf_counter()
+    try:
+        _check_size(source, max_bytes)
+        text = extract_text_from_pdf(source, max_pages=max_pages)
+        return ExtractionResult(name, text, None, time.perf_counter() - start)
+    except Exception as e:
+        return ExtractionResult(name, "", _error(e), time.perf_counter() - start)
+
+
+def _serve(conn, options):
+    """Worker process: extract every `(name, source)` received until sent None."""
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        conn.send(extract_one(*task, **options))
+
+
+class _Worker:
+    """One extraction process with at most one file in flight."""
+
+    def __init__(self, options):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(child, options), daemon=True)
+        self.process.start()
+        child.close()
+        self.name = self.started = None
+
+    def submit(self, name, source):
+        self.name, self.started = name, time.perf_counter()
+        self.conn.send((name, source))
+
+    def result(self):
+        """The in-flight file's result; an error result if the process died on it."""
+        try:
+            return self.conn.recv()
+        except EOFError:
+            self.process.join()
+            return ExtractionResult(self.name, "", f"WorkerExited: exit code {self.process.exitcode}",
+                                    time.perf_counter() - self.started)
+
+    def stop(self, kill=False):
+        if not kill and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(_STOP_GRACE)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def extract_pdfs(sources, workers=None, timeout=DEFAULT_TIMEOUT, max_pages=DEFAULT_MAX_PAGES,
+                 max_bytes=DEFAULT_MAX_BYTES):
+    """Extract `(name, path_or_bytes)` PDFs in worker processes, yielding results as they finish.
+
+    Results arrive in completion order. Each worker has one file in flight,
+    so memory stays bounded however many sources are queued. A worker still
+    on its file `timeout` seconds after receiving it is killed and replaced,
+    which also stops extraction stuck inside PyMuPDF's C code. Files over
+    `max_bytes` are rejected here, before they are sent to a worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    options = {"max_pages": max_pages, "max_bytes": max_bytes}
+
+    if workers == 1 and not timeout:
+        for name, source in sources:
+            yield extract_one(name, source, **options)
+        return
+
+    sources = iter(sources)
+    idle = [_Worker(options) for _ in range(workers)]
+    busy = []
+    try:
+        exhausted = False
+        while True:
+            while idle and not exhausted:
+                try:
+                    name, source = next(sources)
+                except StopIteration:
+                    exhausted = True
+                    break
+                try:
+                    _check_size(source, max_bytes)
+                except (OSError, ValueError) as e:
+                    yield ExtractionResult(name, "", _error(e), 0.0)
+                    continue
+                worker = idle.pop()
+                worker.submit(name, source)
+                busy.append(worker)
+            if not busy:
+                break
+
+            wait_for = None
+            if timeout:
+                wait_for = max(0, min(worker.started for worker in busy) + timeout - time.perf_counter())
+            ready = wait([worker.conn for worker in busy], wait_for)
+            for worker in list(busy):
+                elapsed = time.perf_counter() - worker.started
+                if worker.conn in ready:
+                    result = worker.result()
+                elif timeout and elapsed >= timeout:
+                    result = ExtractionResult(worker.name, "",
+                                              _error(ExtractionTimeout(f"extraction exceeded {timeout}s")), elapsed)
+                    worker.stop(kill=True)
+                else:
+                    continue
+                busy.remove(worker)
+                if not worker.process.is_alive():
+                    worker.stop()
+                    worker = _Worker(options)
+                idle.append(worker)
+                yield result
+    finally:
+        for worker in busy:
+            worker.stop(kill=True)
+        for worker in idle:
+            worker.stop()
@@ -0,0 +1,256 @@
+"""Lightweight per-stage spans: duration, input size and outcome.
+
+Wrap a stage in a span; while metrics are enabled each finished span feeds
+per-stage counters and a latency histogram, is kept for the debug panel and
+is logged as one JSON line:
+
+    with span("pdf_parse", size=len(pdf_bytes)):
+        resume = ResumeText(iter_pdf_pages(pdf_bytes))
+
+    print(metrics.prometheus_text())
+
+Metrics are off unless RESUME_SCREENER_METRICS=1 or `metrics.enable()` is
+called; disabled spans are a shared no-op object.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "resume_screener_stage"
+# Upper bounds in seconds, from keyword scans up to LLM calls
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Finished spans kept in memory for the debug panel
+RECENT_SPANS = 500
+
+
+class Span:
+    """One timed run of a stage. Extra labels can be added with `set` while it runs."""
+
+    __slots__ = ("stage", "size", "labels", "started", "duration", "outcome", "error", "_start", "_registry")
+
+    def __init__(self, registry, stage, size=None, labels=None):
+        self._registry = registry
+        self.stage = stage
+        self.size = size
+        self.labels = labels or {}
+        self.duration = None
+        self.outcome = None
+        self.error = None
+
+    def set(self, **labels):
+        self.labels.update(labels)
+
+    def __enter__(self):
+        self.started = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        if exc_type is None:
+            self.outcome = "ok"
+        elif issubclass(exc_type, GeneratorExit):
+            # A streamed stage whose consumer stopped reading
+            self.outcome = "cancelled"
+        else:
+            self.outcome = "error"
+            self.error = exc_type.__name__
+        self._registry.record(self)
+        return False
+
+    def as_dict(self):
+        record = {
+            "stage": self.stage,
+            "started": round(self.started, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "size": self.size,
+            "outcome": self.outcome,
+        }
+        if self.error:
+            record["error"] = self.error
+        record.update(self.labels)
+        return record
+
+
+class _NoopSpan:
+    """Stands in for `Span` while metrics are disabled."""
+
+    __slots__ = ()
+
+    def set(self, **labels):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _StageStats:
+    __slots__ = ("outcomes", "buckets", "duration_sum", "size_sum")
+
+    def __init__(self):
+        self.outcomes = {}
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.duration_sum = 0.0
+        self.size_sum = 0
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Thread-safe per-stage counters, latency histograms and recent spans."""
+
+    def __init__(self, enabled=False, recent=RECENT_SPANS):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._recent = deque(maxlen=recent)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, stage, size=None, **labels):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, stage, size, labels)
+
+    def record(self, span):
+        with self._lock:
+            stats = self._stages.get(span.stage)
+            if stats is None:
+                stats = self._stages[span.stage] = _StageStats()
+            stats.outcomes[span.outcome] = stats.outcomes.get(span.outcome, 0) + 1
+            stats.duration_sum += span.duration
+            stats.size_sum += span.size or 0
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if span.duration <= bound:
+                    stats.buckets[i] += 1
+                    break
+            self._recent.append(span)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(span.as_dict(), default=str))
+
+    def spans(self, **labels):
+        """Recent finished spans as dicts, oldest first, filtered by label values."""
+        with self._lock:
+            recent = list(self._recent)
+        records = [span.as_dict() for span in recent]
+        return [r for r in records if all(r.get(k) == v for k, v in labels.items())]
+
+    def snapshot(self):
+        """Per-stage totals as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": sum(stats.outcomes.values()),
+                    "outcomes": dict(stats.outcomes),
+                    "duration_seconds_sum": stats.duration_sum,
+                    "input_size_sum": stats.size_sum,
+                }
+                for stage, stats in sorted(self._stages.items())
+            }
+
+    def export_stats(self):
+        """Per-stage counters and histogram buckets, picklable, for `merge_stats` in another process."""
+        with self._lock:
+            return {stage: (dict(stats.outcomes), list(stats.buckets), stats.duration_sum, stats.size_sum)
+                    for stage, stats in self._stages.items()}
+
+    def merge_stats(self, exported):
+        """Add counters from `export_stats` of another process, such as a worker, into these."""
+        with self._lock:
+            for stage, (outcomes, buckets, duration_sum, size_sum) in exported.items():
+                stats = self._stages.get(stage)
+                if stats is None:
+                    stats = self._stages[stage] = _StageStats()
+                for outcome, count in outcomes.items():
+                    stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + count
+                stats.buckets = [a + b for a, b in zip(stats.buckets, buckets)]
+                stats.duration_sum += duration_sum
+                stats.size_sum += size_sum
+
+    def prometheus_text(self):
+        """Render every stage's metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_PREFIX}_duration_seconds Time spent in each analysis stage.",
+            f"# TYPE {METRIC_PREFIX}_duration_seconds histogram",
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            for stage, stats in stages:
+                label = f'stage="{_escape(stage)}"'
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'{METRIC_PREFIX}_duration_seconds_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                total = sum(stats.outcomes.values())
+                lines.append(f'{METRIC_PREFIX}_duration_seconds_bucket{{{label},le="+Inf"}} {total}')
+                lines.append(f"{METRIC_PREFIX}_duration_seconds_sum{{{label}}} {stats.duration_sum:.6f}")
+                lines.append(f"{METRIC_PREFIX}_duration_seconds_count{{{label}}} {total}")
+
+            lines += [
+                f"# HELP {METRIC_PREFIX}_runs_total Finished stage runs by outcome.",
+                f"# TYPE {METRIC_PREFIX}_runs_total counter",
+            ]
+            for stage, stats in stages:
+                for outcome, count in sorted(stats.outcomes.items()):
+                    lines.append(f'{METRIC_PREFIX}_runs_total{{stage="{_escape(stage)}",'
+                                 f'outcome="{_escape(outcome)}"}} {count}')
+
+            lines += [
+                f"# HELP {METRIC_PREFIX}_input_size_total Input bytes or characters each stage processed.",
+                f"# TYPE {METRIC_PREFIX}_input_size_total counter",
+            ]
+            for stage, stats in stages:
+                lines.append(f'{METRIC_PREFIX}_input_size_total{{stage="{_escape(stage)}"}} {stats.size_sum}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._recent.clear()
+
+
+metrics = Metrics(enabled=os.environ.get("RESUME_SCREENER_METRICS", "") == "1")
+
+
+def span(stage, size=None, **labels):
+    """Time a stage with the process-wide `metrics`; a no-op while they are disabled."""
+    return metrics.span(stage, size, **labels)
+
+
+def traced(stage, fn, size=None, **labels):
+    """Wrap `fn` so every call runs inside a span."""
+    def run(*args, **kwargs):
+        with span(stage, size, **labels):
+            return fn(*args, **kwargs)
+    return run
+
+
+def traced_stream(stage, chunks_fn, size=None, **labels):
+    """Wrap a chunk generator so its whole run is one span, labelled with time to first chunk."""
+    def run(*args, **kwargs):
+        with span(stage, size, **labels) as s:
+            start = time.perf_counter()
+            first = True
+            for chunk in chunks_fn(*args, **kwargs):
+                if first:
+                    s.set(first_chunk_ms=round((time.perf_counter() - start) * 1000, 3))
+                    first = False
+                yield chunk
+    return run
@@ -0,0 +1,200 @@
+"""JD keyword extraction with an IDF fitted on a corpus of job descriptions.
+
+Document frequencies are updated incrementally as JDs arrive, and any number
+of JDs are scored in one sparse batch. Fit or extend the model with:
+
+    python jd_keywords.py fit jds/ -o models/jd_idf.json
+    python jd_keywords.py update new_jds.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+from collections import Counter
+from functools import lru_cache
+
+from model_registry import MODEL_DIR
+
+DEFAULT_JD_MODEL_PATH = os.environ.get("RESUME_SCREENER_JD_MODEL", os.path.join(MODEL_DIR, "jd_idf.json"))
+
+# Tokenization shared by JD keyword extraction and the resume index
+JD_TOKENIZER_OPTIONS = {
+    "stop_words": "english",
+    "ngram_range": (1, 2),  # Include single words and bigrams
+}
+
+# JDs shorter than this are treated as empty
+MIN_JD_LENGTH = 10
+
+
+@lru_cache(maxsize=1)
+def get_analyzer():
+    """Return sklearn's tokenizer for JD text, importing sklearn on first use."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    return CountVectorizer(**JD_TOKENIZER_OPTIONS).build_analyzer()
+
+
+def _is_keyword(term):
+    # Filter out single-letter words and pure numbers
+    return len(term) > 1 and not term.isdigit()
+
+
+class JDKeywordExtractor:
+    """TF-IDF keyword ranking against document frequencies from past JDs.
+
+    With no corpus every term has the same IDF, so ranking falls back to term
+    frequency, which is what fitting a vectorizer on the one JD amounted to.
+    """
+
+    def __init__(self, doc_freq=None, n_docs=0):
+        self.doc_freq = Counter(doc_freq or {})
+        self.n_docs = n_docs
+        self._fingerprint = None
+
+    @classmethod
+    def load(cls, path=DEFAULT_JD_MODEL_PATH):
+        with open(path, encoding="utf-8") as f:
+            model = json.load(f)
+        return cls(model["doc_freq"], model["n_docs"])
+
+    def save(self, path=DEFAULT_JD_MODEL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"n_docs": self.n_docs, "doc_freq": self.doc_freq}, f)
+        os.replace(tmp_path, path)
+
+    @property
+    def fingerprint(self):
+        """A digest of the fitted frequencies, for keying cached keywords."""
+        # Counts alone collide between corpora of the same size, so the digest covers every term
+        if self._fingerprint is None:
+            content = json.dumps([self.n_docs, sorted(self.doc_freq.items())], separators=(",", ":"))
+            self._fingerprint = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return self._fingerprint
+
+    def partial_fit(self, jd_texts):
+        """Add a batch of JDs to the document frequencies."""
+        analyzer = get_analyzer()
+        for text in jd_texts:
+            if text and len(text.strip()) >= MIN_JD_LENGTH:
+                self.doc_freq.update(set(analyzer(text)))
+                self.n_docs += 1
+        self._fingerprint = None
+        return self
+
+    def transform(self, jd_texts):
+        """Return a sparse JD x term TF-IDF matrix and its column terms.
+
+        Columns cover only the terms in this batch, so terms never seen in
+        the corpus still get scored (with the highest IDF).
+        """
+        import numpy as np
+        from scipy import sparse
+
+        analyzer = get_analyzer()
+        columns, terms = {}, []
+        indptr, indices, counts = [0], [], []
+        for text in jd_texts:
+            if text and len(text.strip()) >= MIN_JD_LENGTH:
+                for term, count in Counter(analyzer(text)).items():
+                    col = columns.get(term)
+                    if col is None:
+                        col = columns[term] = len(terms)
+                        terms.append(term)
+                    indices.append(col)
+                    counts.append(count)
+            indptr.append(len(indices))
+
+        # Smoothed IDF, as TfidfVectorizer computes it
+        doc_freq = np.fromiter((self.doc_freq.get(term, 0) for term in terms), dtype=float, count=len(terms))
+        idf = np.log((1 + self.n_docs) / (1 + doc_freq)) + 1
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(counts, dtype=float) * idf[indices]
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(terms)))
+        return matrix, terms
+
+    def top_keywords(self, jd_texts, top_n=15):
+        """Return the top-N keywords for each JD, best first, ties alphabetical."""
+        import numpy as np
+
+        matrix, terms = self.transform(jd_texts)
+        keyword_columns = np.fromiter((_is_keyword(term) for term in terms), dtype=bool, count=len(terms))
+        scores = np.where(keyword_columns[matrix.indices], matrix.data, 0)
+
+        results = []
+        for start, end in zip(matrix.indptr[:-1], matrix.indptr[1:]):
+            row = scores[start:end]
+            candidates = np.flatnonzero(row > 0)
+            if len(candidates) > top_n:
+                # Keep everything tied with the N-th score so ties break on the term
+                cutoff = -np.partition(-row[candidates], top_n - 1)[top_n - 1]
+                candidates = candidates[row[candidates] >= cutoff]
+            ranked = sorted(candidates, key=lambda i: (-row[i], terms[matrix.indices[start + i]]))
+            results.append([terms[matrix.indices[start + i]] for i in ranked[:top_n]])
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_jd_extractor():
+    """Return the shared extractor, fitted from `DEFAULT_JD_MODEL_PATH` when it exists."""
+    if os.path.exists(DEFAULT_JD_MODEL_PATH):
+        return JDKeywordExtractor.load(DEFAULT_JD_MODEL_PATH)
+    return JDKeywordExtractor()
+
+
+def read_jd_texts(source):
+    """Read JDs from a directory of .txt files or a JSONL file with a `text` field."""
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith(".txt"):
+                    with open(os.path.join(root, name), encoding="utf-8") as f:
+                        yield f.read()
+    else:
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)["text"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the JD keyword model and extract keywords with it.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fit = commands.add_parser("fit", help="Fit document frequencies from scratch")
+    fit.add_argument("source", help="Directory of .txt JDs or a JSONL file with a `text` field")
+    fit.add_argument("-o", "--output", default=DEFAULT_JD_MODEL_PATH)
+
+    update = commands.add_parser("update", help="Add more JDs to an existing model")
+    update.add_argument("source")
+    update.add_argument("-m", "--model", default=DEFAULT_JD_MODEL_PATH)
+
+    extract = commands.add_parser("extract", help="Print the top keywords of JD text files")
+    extract.add_argument("jd_files", nargs="+")
+    extract.add_argument("-m", "--model", default=DEFAULT_JD_MODEL_PATH)
+    extract.add_argument("-n", "--top-n", type=int, default=15)
+
+    args = parser.parse_args(argv)
+    if args.command == "fit":
+        extractor = JDKeywordExtractor().partial_fit(read_jd_texts(args.source))
+        extractor.save(args.output)
+        print(f"Fitted on {extractor.n_docs} JDs, {len(extractor.doc_freq)} terms -> {args.output}")
+    elif args.command == "update":
+        extractor = JDKeywordExtractor.load(args.model) if os.path.exists(args.model) else JDKeywordExtractor()
+        before = extractor.n_docs
+        extractor.partial_fit(read_jd_texts(args.source)).save(args.model)
+        print(f"Added {extractor.n_docs - before} JDs ({extractor.n_docs} total) -> {args.model}")
+    else:
+        extractor = JDKeywordExtractor.load(args.model) if os.path.exists(args.model) else JDKeywordExtractor()
+        texts = []
+        for path in args.jd_files:
+            with open(path, encoding="utf-8") as f:
+                texts.append(f.read())
+        for path, keywords in zip(args.jd_files, extractor.top_keywords(texts, args.top_n)):
+            print(f"{path}: {', '.join(keywords)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""The keyword matching engine shared by ATS, JD and role scoring.
+
+Keywords and resumes are compared as normalized token sequences:
+
+- punctuation separates tokens, so "scikit-learn", "scikit learn" and
+  "scikit_learn" agree, while "c++", "c#" and "r&d" stay single tokens;
+- plurals and British spellings are folded ("networks", "visualisation");
+- aliases from data/keyword_aliases.json are the same keyword ("ml" and
+  "machine learning", "k8s" and "kubernetes").
+
+A keyword is an exact hit when its tokens, or an alias's, appear in a row.
+It is a fuzzy hit when they are run together into one word ("datascience")
+or a one-word keyword carries a version number ("python3"). A keyword never
+matches inside an unrelated word, so "r" needs the token "r".
+"""
+import json
+import os
+import re
+from functools import lru_cache
+
+# Part of every cache key for stored match results; bump it whenever what counts as a hit changes
+MATCHER_VERSION = 3
+DEFAULT_ALIASES_PATH = os.environ.get(
+    "RESUME_SCREENER_KEYWORD_ALIASES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "keyword_aliases.json"),
+)
+
+# Letters and digits with any "&", "+" or "#" they touch ("r&d", "c++", "c#"); underscores
+# are replaced with spaces first. One character class tokenizes faster than exact rules,
+# so stray symbols are trimmed per distinct token instead. Line breaks and dashes are
+# tokens too, for the date extractor; they never take part in keyword matching.
+# A numeric month and year ("03/2021", "3-2021") is one token, so dates can tell it from a number before a year
+_TOKEN_RE = re.compile(r"\d{1,2}[/-]\d{4}(?!\w)|[\w&+#]+|[\n–—-]")
+SEPARATORS = frozenset("\n–—-")
+# Stands in for separators in the joined text, which drops it with the space before it
+_SEPARATOR_LEMMA = "\x01"
+# A word ending in a letter followed by a version number: "python3", "html5"
+_VERSIONED_RE = re.compile(r"([^\W_]*[^\W\d_])\d+")
+_BRITISH_SPELLINGS = (
+    ("isation", "ization"), ("ising", "izing"), ("ised", "ized"), ("yse", "yze"), ("lling", "ling"), ("lled", "led"),
+)
+
+
+@lru_cache(maxsize=65536)
+def lemmatize(token):
+    """Fold plurals and British spellings of a lowercase token."""
+    # A lone "&" becomes an empty token, which still separates the words around it
+    token = token.strip("&").lstrip("+#")
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith(("sses", "xes", "ches", "shes")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    for british, american in _BRITISH_SPELLINGS:
+        if token.endswith(british):
+            return token[:-len(british)] + american
+    return token
+
+
+def _tokenize(text):
+    return _TOKEN_RE.findall(text.replace("_", " "))
+
+
+def normalize(text):
+    """The normalized token sequence of `text`, as a tuple; empty when it has no words."""
+    tokens = tuple(lemmatize(token) for token in _tokenize(text.lower()) if token not in SEPARATORS)
+    return tokens if any(tokens) else ()
+
+
+@lru_cache(maxsize=8)
+def load_aliases(path=DEFAULT_ALIASES_PATH):
+    """Map every normalized form in the alias file to all forms it is interchangeable with."""
+    with open(path, encoding="utf-8") as f:
+        table = json.load(f)
+
+    equivalents = {}
+    for canonical, aliases in table.items():
+        group = {normalize(term) for term in [canonical, *aliases]} - {()}
+        # A form listed in two groups joins them
+        for form in list(group):
+            group |= equivalents.get(form, set())
+        for form in group:
+            equivalents[form] = group
+    return {form: frozenset(group) for form, group in equivalents.items()}
+
+
+class KeywordHits:
+    """Keywords found in a text, with the subset that matched exactly."""
+
+    __slots__ = ("found", "exact")
+
+    def __init__(self, found, exact):
+        self.found = found
+        self.exact = exact
+
+    def __contains__(self, keyword):
+        return keyword in self.found
+
+    def is_exact(self, keyword):
+        return keyword in self.exact
+
+    @property
+    def fuzzy(self):
+        return self.found - self.exact
+
+
+def _joined(tokens):
+    # Spaces on both ends, so a phrase is found as " machine learning " on token boundaries
+    return " " + " ".join(tokens) + " "
+
+
+class TokenIndex:
+    """A text normalized once for every matcher.
+
+    `words` holds the distinct normalized tokens, `text` all of them in order
+    joined by spaces, and `version_stems` the words that carry a version
+    number, without it ("python" for "python3"). `tokens` is the raw token
+    stream, line breaks and dashes included, which `resume_dates` reads
+    dates from.
+    """
+
+    __slots__ = ("tokens", "words", "text", "version_stems")
+
+    def __init__(self, text):
+        raw = _tokenize(text)
+        # Each distinct token is lemmatized once
+        lemmas = _lemmatize_new(raw, {})
+        self._build(raw, lemmas, [_join_lemmas(raw, lemmas)])
+
+    def _build(self, raw, lemmas, chunks):
+        # `chunks` are the lemmas of consecutive runs of `raw`, each joined by spaces
+        self.tokens = raw
+        self.words = set(lemmas.values())
+        self.words.discard(_SEPARATOR_LEMMA)
+        self.text = _joined(chunks).replace(" " + _SEPARATOR_LEMMA, "")
+        versioned = (_VERSIONED_RE.fullmatch(word) for word in self.words if word[-1:].isdigit())
+        self.version_stems = {match.group(1) for match in versioned if match}
+
+
+def _lemmatize_new(raw, lemmas):
+    for token in set(raw).difference(lemmas):
+        lemmas[token] = _SEPARATOR_LEMMA if token in SEPARATORS else lemmatize(token)
+    return lemmas
+
+
+def _join_lemmas(raw, lemmas):
+    return " ".join(map(lemmas.__getitem__, raw))
+
+
+class TokenStream:
+    """Build a `TokenIndex` from text that arrives in pieces, such as PDF pages.
+
+    Each piece is tokenized and lemmatized as it is added. Tokens never span
+    whitespace, so only the text after a piece's last whitespace waits for
+    the next one, in case a word continues there; `index()` equals the
+    `TokenIndex` of all pieces joined.
+    """
+
+    def __init__(self):
+        self._raw = []
+        self._lemmas = {}
+        self._chunks = []
+        self._tail = ""
+
+    def add(self, text):
+        text = self._tail + text
+        end = len(text)
+        while end and not text[end - 1].isspace():
+            end -= 1
+        self._tail = text[end:]
+        self._extend(self._raw, self._lemmas, self._chunks, text[:end])
+
+    @staticmethod
+    def _extend(raw, lemmas, chunks, text):
+        tokens = _tokenize(text)
+        if tokens:
+            _lemmatize_new(tokens, lemmas)
+            raw.extend(tokens)
+            chunks.append(_join_lemmas(tokens, lemmas))
+
+    def index(self):
+        """The TokenIndex of the text added so far; adding more leaves it unchanged."""
+        raw, lemmas, chunks = list(self._raw), self._lemmas, self._chunks
+        if self._tail:
+            # The tail's tokens may still grow, so they stay out of the stream's own state
+            lemmas, chunks = dict(lemmas), list(chunks)
+            self._extend(raw, lemmas, chunks, self._tail)
+        index = TokenIndex.__new__(TokenIndex)
+        index._build(raw, lemmas, chunks)
+        return index
+
+
+def _add(table, key, keyword):
+    table.setdefault(key, set()).add(keyword)
+
+
+class KeywordMatcher:
+    """Match a fixed keyword set against text, tokenized and normalized once.
+
+    Every form a keyword can take (its own tokens and its aliases') is
+    precomputed. One-token forms are a set intersection with the text's
+    distinct tokens; a longer form is searched for in the joined tokens only
+    when all of its tokens occur, which rules out most of them.
+    """
+
+    def __init__(self, keywords, aliases=None):
+        self.keywords = frozenset(kw for kw in keywords if kw)
+        if aliases is None:
+            aliases = load_aliases()
+
+        self._words = {}       # token -> keywords with that one-token form
+        phrases = {}           # longer form -> keywords
+        self._compounds = {}   # a longer form run together into one token -> keywords (fuzzy)
+        for kw in self.keywords:
+            form = normalize(kw)
+            if not form:
+                continue
+            for variant in aliases.get(form, (form,)):
+                if len(variant) == 1:
+                    _add(self._words, variant[0], kw)
+                    continue
+                _add(phrases, variant, kw)
+                _add(self._compounds, "".join(variant), kw)
+        # Version numbers only count on words of two or more letters ("python3", not "r2")
+        self._versioned = {token: kws for token, kws in self._words.items() if len(token) > 1}
+        self._phrases = [(frozenset(form), _joined(form), kws) for form, kws in phrases.items()]
+
+    def scan(self, text):
+        """Return the KeywordHits for `text`, already-lowercased text or its `TokenIndex`."""
+        found = set()
+        exact = set()
+        if not self.keywords or not text:
+            return KeywordHits(found, exact)
+
+        index = text if isinstance(text, TokenIndex) else TokenIndex(text)
+        words = index.words
+
+        for token in words & self._words.keys():
+            exact |= self._words[token]
+
+        for tokens, phrase, keywords in self._phrases:
+            if tokens <= words and phrase in index.text:
+                exact |= keywords
+
+        for token in words & self._compounds.keys():
+            found |= self._compounds[token]
+        for stem in index.version_stems & self._versioned.keys():
+            found |= self._versioned[stem]
+
+        found |= exact
+        return KeywordHits(found, exact)
+
+
+@lru_cache(maxsize=256)
+def _cached_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+
+def get_matcher(keywords):
+    """Return a matcher for `keywords`, compiled once per distinct keyword set."""
+    return _cached_matcher(frozenset(keywords))
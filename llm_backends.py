@@ -0,0 +1,192 @@
+"""Pluggable LLM backends for resume feedback.
+
+`CohereBackend` calls the hosted Cohere chat API. `StubBackend` answers
+locally and deterministically in the same response format, with configurable
+latency, so the whole screening pipeline can be load tested offline and in CI.
+
+Pick one with `get_backend("stub")` or the RESUME_SCREENER_LLM_BACKEND
+environment variable.
+"""
+import asyncio
+import hashlib
+import inspect
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from prompt_budget import count_tokens
+from scorer import COHERE_CHAT_URL, COHERE_MODEL, cohere_chat, cohere_chat_stream, log_llm_call
+
+DEFAULT_BACKEND = os.environ.get("RESUME_SCREENER_LLM_BACKEND", "cohere")
+
+# Stub timing in seconds: before the first chunk, and between chunks
+STUB_LATENCY = float(os.environ.get("RESUME_SCREENER_STUB_LATENCY", 0.0))
+STUB_CHUNK_DELAY = float(os.environ.get("RESUME_SCREENER_STUB_CHUNK_DELAY", 0.0))
+
+STUB_STRENGTHS = [
+    "Relevant technical skills are listed clearly.",
+    "Experience shows measurable impact.",
+    "Projects align with the target role.",
+    "Education matches the job requirements.",
+    "Career progression is easy to follow.",
+]
+STUB_IMPROVEMENTS = [
+    "Quantify more achievements with metrics.",
+    "Tailor the summary to the job description.",
+    "Add the missing keywords from the job description.",
+    "Shorten long bullet points.",
+    "List tools and frameworks per role.",
+]
+
+
+class LLMBackend:
+    """Turns a prompt into feedback text.
+
+    Subclasses implement `complete`; `stream` and `complete_many` have
+    working defaults built on it.
+    """
+
+    name = "base"
+
+    def complete(self, prompt):
+        raise NotImplementedError
+
+    def stream(self, prompt):
+        """Yield the response in chunks. The default yields it whole."""
+        yield self.complete(prompt)
+
+    def complete_many(self, prompts, max_concurrency=8, **options):
+        """Complete every prompt concurrently. Failed calls come back as exceptions."""
+        def safe_complete(prompt):
+            try:
+                return self.complete(prompt)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            return list(pool.map(safe_complete, prompts))
+
+
+class CohereBackend(LLMBackend):
+    """The hosted Cohere chat API."""
+
+    name = "cohere"
+
+    def __init__(self, api_key="", url=COHERE_CHAT_URL, model=COHERE_MODEL, timeout=60, max_retries=3):
+        self.api_key = api_key
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+    def complete(self, prompt):
+        return cohere_chat(prompt, self.api_key, url=self.url, model=self.model,
+                           timeout=self.timeout, max_retries=self.max_retries)
+
+    def stream(self, prompt):
+        return cohere_chat_stream(prompt, self.api_key, url=self.url, model=self.model,
+                                  timeout=self.timeout, max_retries=self.max_retries)
+
+    def complete_many(self, prompts, max_concurrency=8, **client_options):
+        """Complete every prompt through one pooled, rate-limited `AsyncCohereClient`."""
+        from cohere_client import AsyncCohereClient
+
+        async def run():
+            async with AsyncCohereClient(self.api_key, url=self.url, model=self.model,
+                                         max_concurrency=max_concurrency, **client_options) as client:
+                return await asyncio.gather(*(client.chat(p) for p in prompts), return_exceptions=True)
+
+        return asyncio.run(run())
+
+
+class StubBackend(LLMBackend):
+    """A local stand-in for Cohere that needs no network or API key.
+
+    The same prompt always gets the same answer, in the format the real
+    prompt asks for. `latency` is waited before the first chunk and
+    `chunk_delay` between chunks; `jitter` scales latency by a random
+    factor up to 1 + jitter, seeded by the prompt, to model a tail.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency=STUB_LATENCY, chunk_delay=STUB_CHUNK_DELAY, jitter=0.0, chunk_words=4):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.jitter = jitter
+        self.chunk_words = chunk_words
+
+    def respond(self, prompt):
+        """Return the response text for `prompt` without waiting."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        score = 40 + digest[0] % 56
+        strengths = [STUB_STRENGTHS[(digest[1] + i) % len(STUB_STRENGTHS)] for i in range(2)]
+        improvements = [STUB_IMPROVEMENTS[(digest[2] + i) % len(STUB_IMPROVEMENTS)] for i in range(2)]
+        lines = [f"**Score: {score}/100**", "", "**Strengths:**"]
+        lines += [f"- {s}" for s in strengths]
+        lines += ["", "**Areas to improve:**"]
+        lines += [f"- {s}" for s in improvements]
+        if "detailed explanation" in prompt:
+            lines += ["", "Overall, the resume " + ("is a strong match" if score >= 70 else "needs work")
+                      + " for this role. " + " ".join(strengths + improvements)]
+        return "\n".join(lines)
+
+    def _delay(self, prompt):
+        if not self.jitter:
+            return self.latency
+        rng = random.Random(prompt)
+        return self.latency * (1 + self.jitter * rng.random())
+
+    def _chunks(self, text):
+        words = text.split(" ")
+        for i in range(0, len(words), self.chunk_words):
+            yield " ".join(words[i:i + self.chunk_words]) + (" " if i + self.chunk_words < len(words) else "")
+
+    def complete(self, prompt):
+        start = time.perf_counter()
+        text = self.respond(prompt)
+        chunks = sum(1 for _ in self._chunks(text))
+        time.sleep(self._delay(prompt) + self.chunk_delay * (chunks - 1))
+        log_llm_call(count_tokens(prompt), start, 200, 1, backend=self.name)
+        return text
+
+    def stream(self, prompt):
+        start = time.perf_counter()
+        first_chunk = None
+        time.sleep(self._delay(prompt))
+        try:
+            for i, chunk in enumerate(self._chunks(self.respond(prompt))):
+                if i:
+                    time.sleep(self.chunk_delay)
+                first_chunk = first_chunk or time.perf_counter()
+                yield chunk
+        finally:
+            log_llm_call(count_tokens(prompt), start, 200, 1, first_chunk=first_chunk, backend=self.name)
+
+
+BACKENDS = {
+    "cohere": CohereBackend,
+    "stub": StubBackend,
+}
+
+
+def register_backend(name, factory):
+    """Make `factory` available to `get_backend` under `name`."""
+    BACKENDS[name] = factory
+
+
+def get_backend(name=None, **options):
+    """Build the backend called `name` (default: $RESUME_SCREENER_LLM_BACKEND or "cohere").
+
+    Options the backend does not take, such as `api_key` for the stub, are ignored.
+    """
+    name = name or DEFAULT_BACKEND
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend {name!r}; choose from {', '.join(sorted(BACKENDS))}")
+    accepted = inspect.signature(factory).parameters
+    if not any(p.kind is p.VAR_KEYWORD for p in accepted.values()):
+        options = {k: v for k, v in options.items() if k in accepted}
+    return factory(**options)
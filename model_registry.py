@@ -0,0 +1,126 @@
+"""Load model artifacts once per process, with optional integrity checks.
+
+Artifacts are memory-mapped where joblib allows it and verified against
+`models/manifest.json` when one exists. Refresh the manifest after retraining:
+
+    python model_registry.py --write-manifest
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import warnings
+
+MODEL_DIR = os.environ.get(
+    "RESUME_SCREENER_MODEL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+)
+MANIFEST_NAME = "manifest.json"
+
+ARTIFACTS = {
+    "svm_pipeline": "svm_pipeline.pkl",
+    "label_encoder": "label_encoder.pkl",
+    # Optional numpy export of the SVM, written by `python category_model.py export`
+    "svm_weights": "svm_weights.npz",
+}
+
+_models = {}
+_lock = threading.Lock()
+
+
+class ModelIntegrityError(Exception):
+    """Raised when an artifact on disk does not match its manifest hash."""
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _sklearn_version():
+    try:
+        from importlib.metadata import version
+        return version("scikit-learn")
+    except Exception:
+        return None
+
+
+def read_manifest(model_dir=MODEL_DIR):
+    path = os.path.join(model_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(model_dir=MODEL_DIR):
+    """Record the hash of every artifact present and the scikit-learn version in use."""
+    manifest = {"sklearn_version": _sklearn_version(), "artifacts": {}}
+    for name, filename in ARTIFACTS.items():
+        path = os.path.join(model_dir, filename)
+        if os.path.exists(path):
+            manifest["artifacts"][name] = {"file": filename, "sha256": file_sha256(path)}
+
+    with open(os.path.join(model_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _verify(name, path, manifest):
+    entry = manifest.get("artifacts", {}).get(name)
+    if entry and file_sha256(path) != entry["sha256"]:
+        raise ModelIntegrityError(f"{path} does not match the hash recorded in {MANIFEST_NAME}")
+
+    trained_with = manifest.get("sklearn_version")
+    installed = _sklearn_version()
+    if trained_with and installed and trained_with != installed:
+        warnings.warn(f"{name} was saved with scikit-learn {trained_with} but {installed} is installed")
+
+
+def get_model(name, model_dir=MODEL_DIR, mmap_mode="r", loader=None):
+    """Return the loaded artifact `name`, loading and verifying it on first use only.
+
+    Artifacts are joblib files unless a `loader` taking the path is given.
+    """
+    key = (name, model_dir)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        if key not in _models:
+            path = os.path.join(model_dir, ARTIFACTS[name])
+            _verify(name, path, read_manifest(model_dir))
+            if loader is not None:
+                _models[key] = loader(path)
+            else:
+                # joblib pulls in numpy and scikit-learn, so import it on first load
+                import joblib
+
+                _models[key] = joblib.load(path, mmap_mode=mmap_mode)
+        return _models[key]
+
+
+def load_models(model_dir=MODEL_DIR):
+    """Return the SVM pipeline and label encoder, each loaded once per process."""
+    return get_model("svm_pipeline", model_dir), get_model("label_encoder", model_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the screener's model artifacts.")
+    parser.add_argument("--write-manifest", action="store_true", help="Hash the artifacts into manifest.json")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    args = parser.parse_args()
+
+    if args.write_manifest:
+        manifest = write_manifest(args.model_dir)
+        print(json.dumps(manifest, indent=2))
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,154 @@
-from xhtml2pdf import pisa
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 
-def convert_html_to_pdf(feedback_text, job_title, category, ats_score, freshness, jd_keywords=None):
-    """Generate a styled PDF with structured AI feedback and metadata."""
+REPORT_CSS = """
+    body {
+        font-family: Arial, sans-serif;
+        font-size: 16px;
+        padding: 30px;
+        color: #333;
+    }
+    h1 {
+        color: #003366;
+        font-size: 22px;
+        border-bottom: 2px solid #003366;
+        padding-bottom: 6px;
+    }
+    h2 {
+        color: #004488;
+        font-size: 18px;
+        margin-top: 1em;
+    }
+    .section {
+        margin-top: 20px;
+    }
+    .score {
+        font-weight: bold;
+        font-size: 18px;
+        color: #0066cc;
+        margin-top: 1em;
+    }
+    .metadata {
+        background-color: #f1f5f9;
+        padding: 10px;
+        border-radius: 8px;
+        margin-bottom: 20px;
+    }
+    .metadata p {
+        margin: 4px 0;
+    }
+"""
+
+REPORT_BODY = """
+    <h1>Resume Evaluation Report</h1>
+
+    <div class="metadata">
+        <p><strong>🎯 Target Role:</strong> {job_title}</p>
+        <p><strong>🧠 Predicted Category:</strong> {category}</p>
+        <p><strong>📊 ATS Match Score:</strong> {ats_score}/100</p>
+        <p><strong>📅 Resume Freshness:</strong> {freshness}</p>
+        <p><strong>📌 Extracted JD Keywords:</strong> {jd_keywords}</p>
+    </div>
+
+    <div class="section">
+        {feedback}
+    </div>
+"""
+
+
+# Parsed stylesheets by source text, shared by every report the process renders
+_parsed_css = {}
+_MAX_PARSED_CSS = 16
 
-    jd_keywords_str = ", ".join(jd_keywords) if jd_keywords else "N/A"
-
-    html_template = f"""
-    <html>
-    <head>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                font-size: 16px;
-                padding: 30px;
-                color: #333;
-            }}
-            h1 {{
-                color: #003366;
-                font-size: 22px;
-                border-bottom: 2px solid #003366;
-                padding-bottom: 6px;
-            }}
-            h2 {{
-                color: #004488;
-                font-size: 18px;
-                margin-top: 1em;
-            }}
-            .section {{
-                margin-top: 20px;
-            }}
-            .score {{
-                font-weight: bold;
-                font-size: 18px;
-                color: #0066cc;
-                margin-top: 1em;
-            }}
-            .metadata {{
-                background-color: #f1f5f9;
-                padding: 10px;
-                border-radius: 8px;
-                margin-bottom: 20px;
-            }}
-            .metadata p {{
-                margin: 4px 0;
-            }}
-        </style>
-    </head>
-    <body>
-        <h1>Resume Evaluation Report</h1>
-
-        <div class="metadata">
-            <p><strong>🎯 Target Role:</strong> {job_title}</p>
-            <p><strong>🧠 Predicted Category:</strong> {category}</p>
-            <p><strong>📊 ATS Match Score:</strong> {ats_score}/100</p>
-            <p><strong>📅 Resume Freshness:</strong> {freshness}</p>
-            <p><strong>📌 Extracted JD Keywords:</strong> {jd_keywords_str}</p>
-        </div>
-
-        <div class="section">
-            {format_feedback_as_html(feedback_text)}
-        </div>
-    </body>
-    </html>
+
+def _cache_parsed_css():
+    """Have xhtml2pdf parse each stylesheet once per process instead of once per report.
+
+    pisaDocument builds a fresh context for every document and offers no way
+    to pass in a parsed stylesheet, so the parser itself is wrapped. Only
+    sources without @-rules or url() are cached: those are the ones whose
+    parse touches the document (fonts, page templates, file lookups).
+    Merging into a document's stylesheet copies a ruleset before updating
+    it, so the cached ones are never modified.
     """
+    from xhtml2pdf.context import pisaCSSParser
+
+    parse = pisaCSSParser.parse
+    if getattr(parse, "caches_parsed_css", False):
+        return
+
+    def cached_parse(self, src):
+        if "@" in src or "url(" in src:
+            return parse(self, src)
+        stylesheet = _parsed_css.get(src)
+        if stylesheet is None:
+            if len(_parsed_css) >= _MAX_PARSED_CSS:
+                _parsed_css.clear()
+            stylesheet = _parsed_css[src] = parse(self, src)
+        return stylesheet
+
+    cached_parse.caches_parsed_css = True
+    pisaCSSParser.parse = cached_parse
+
+
+def build_report_body(feedback_text, job_title, category, ats_score, freshness, jd_keywords=None):
+    """Fill the report template; the result identifies the report's content."""
+    return REPORT_BODY.format(
+        job_title=job_title,
+        category=category,
+        ats_score=ats_score,
+        freshness=freshness,
+        jd_keywords=", ".join(jd_keywords) if jd_keywords else "N/A",
+        feedback=format_feedback_as_html(feedback_text),
+    )
 
+
+def render_pdf(body):
+    """Render a report body built by `build_report_body` to PDF bytes."""
+    from xhtml2pdf import pisa  # heavy import, deferred until a report is built
+
+    _cache_parsed_css()
+    html = f"<html><head><style>{REPORT_CSS}</style></head><body>{body}</body></html>"
     pdf_output = BytesIO()
-    pisa.CreatePDF(src=html_template, dest=pdf_output)
+    pisa.CreatePDF(src=html, dest=pdf_output)
     return pdf_output.getvalue()
 
 
+def convert_html_to_pdf(feedback_text, job_title, category, ats_score, freshness, jd_keywords=None):
+    """Generate a styled PDF with structured AI feedback and metadata."""
+    body = build_report_body(feedback_text, job_title, category, ats_score, freshness, jd_keywords)
+    return render_pdf(body)
+
+
+def _render_named(item):
+    name, report = item
+    return name, convert_html_to_pdf(**report)
+
+
+def export_reports_zip(reports, dest, workers=None):
+    """Render `(name, report_kwargs)` pairs on a process pool into one zip of PDFs.
+
+    `dest` is a path or writable file object; each report is stored as
+    `<name>.pdf` in input order. Returns the number of reports written.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = list(reports)
+    with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        if workers == 1 or len(items) <= 1:
+            for name, pdf in map(_render_named, items):
+                archive.writestr(f"{name}.pdf", pdf)
+            return len(items)
+
+        workers = min(workers, len(items))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(items) // (workers * 4))
+            for name, pdf in executor.map(_render_named, items, chunksize=chunksize):
+                archive.writestr(f"{name}.pdf", pdf)
+    return len(items)
+
+
 def format_feedback_as_html(text):
     """Convert feedback string to structured HTML with headings."""
     lines = text.strip().split("\n")
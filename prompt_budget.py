@@ -0,0 +1,125 @@
+"""Fit resume and JD text into a token budget before it goes into the LLM prompt.
+
+Tokens are estimated locally, PyMuPDF boilerplate is stripped, and when a
+resume is still over budget its sections are kept in order of how many JD
+keywords they contain, so the evidence the score depends on survives.
+"""
+import math
+import os
+import re
+from collections import Counter
+
+from keyword_matcher import get_matcher
+from resume_parser import split_sections
+
+# Token budgets for the resume and JD parts of the prompt
+RESUME_TOKEN_BUDGET = int(os.environ.get("RESUME_SCREENER_RESUME_TOKENS", 900))
+JD_TOKEN_BUDGET = int(os.environ.get("RESUME_SCREENER_JD_TOKENS", 400))
+
+# Sections that would be cut to fewer tokens than this are dropped instead
+MIN_SECTION_TOKENS = 40
+
+OMITTED_NOTE = "[Less relevant sections omitted for length.]"
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SPACES_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+# Glyphs PyMuPDF could not map come out as "(cid:123)"
+_CID_RE = re.compile(r"\(cid:\d+\)")
+# Page numbers ("Page 2 of 3", "- 2 -") and lines of nothing but bullets or rules
+_BOILERPLATE_LINE_RE = re.compile(
+    r"(?i)page\s*\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?"
+    r"|[-–—\s]*\d{1,3}[-–—\s]*"
+    r"|[\W_]+"
+)
+
+# Running headers and footers repeat verbatim on every page
+REPEATED_LINE_COUNT = 3
+REPEATED_LINE_LENGTH = 80
+
+
+def count_tokens(text):
+    """Estimate the token count of `text` without calling a tokenizer.
+
+    Words count one token per six characters and every symbol counts one,
+    which errs on the high side of subword tokenizers for English text.
+    """
+    return sum(math.ceil(len(piece) / 6) for piece in _TOKEN_RE.findall(text))
+
+
+def clean_text(text):
+    """Normalize whitespace and drop PyMuPDF boilerplate lines."""
+    lines = [_SPACES_RE.sub(" ", _CID_RE.sub("", line)).strip() for line in text.splitlines()]
+    counts = Counter(lines)
+    seen = set()
+    kept = []
+    for line in lines:
+        if not line:
+            # Keep single blank lines, which separate resume blocks
+            if kept and kept[-1]:
+                kept.append(line)
+            continue
+        if _BOILERPLATE_LINE_RE.fullmatch(line):
+            continue
+        if counts[line] >= REPEATED_LINE_COUNT and len(line) <= REPEATED_LINE_LENGTH and line in seen:
+            continue
+        seen.add(line)
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def truncate_to_budget(text, budget):
+    """Keep whole lines from the start of `text` while they fit in `budget` tokens."""
+    kept, used = [], 0
+    for line in text.splitlines():
+        tokens = count_tokens(line)
+        if used + tokens > budget:
+            break
+        kept.append(line)
+        used += tokens
+    return "\n".join(kept)
+
+
+def fit_text(text, budget=JD_TOKEN_BUDGET):
+    """Clean `text` and cut it to `budget` tokens; `None` means no limit."""
+    text = clean_text(text or "")
+    if budget is None or count_tokens(text) <= budget:
+        return text
+    return truncate_to_budget(text, budget)
+
+
+def rank_sections(text, keywords=None):
+    """Return `(index, chunk, tokens, relevance)` per section, most relevant first.
+
+    Relevance counts the keywords a section contains, whole words counting
+    double; ties keep document order, so the contact block leads.
+    """
+    matcher = get_matcher({kw.lower() for kw in keywords}) if keywords else None
+    sections = []
+    for index, (_, chunk) in enumerate(split_sections(text)):
+        relevance = 0
+        if matcher is not None:
+            hits = matcher.scan(chunk.lower())
+            relevance = len(hits.exact) + 0.5 * len(hits.fuzzy)
+        sections.append((index, chunk, count_tokens(chunk), relevance))
+    return sorted(sections, key=lambda section: (-section[3], section[0]))
+
+
+def fit_resume(resume_text, keywords=None, budget=RESUME_TOKEN_BUDGET):
+    """Clean the resume and keep its most keyword-relevant sections within `budget` tokens.
+
+    Kept sections stay in their original order. `None` means no limit.
+    """
+    text = clean_text(str(resume_text or ""))
+    if budget is None or count_tokens(text) <= budget:
+        return text
+
+    remaining = budget - count_tokens(OMITTED_NOTE)
+    kept = {}
+    for index, chunk, tokens, _ in rank_sections(text, keywords):
+        if tokens <= remaining:
+            kept[index] = chunk.strip()
+            remaining -= tokens
+        elif remaining >= MIN_SECTION_TOKENS:
+            kept[index] = truncate_to_budget(chunk, remaining).strip()
+            remaining -= count_tokens(kept[index])
+    return "\n\n".join([kept[index] for index in sorted(kept)] + [OMITTED_NOTE])
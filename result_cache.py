@@ -0,0 +1,159 @@
+"""Content-addressed cache for extracted text and analysis results.
+
+Entries live in an in-memory LRU tier backed by an on-disk SQLite tier, and
+are keyed by a namespace plus hashes of the inputs that produced them.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results.sqlite3")
+
+
+def content_hash(data):
+    """Return the SHA-256 hex digest of bytes or text."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_key(*parts):
+    """Combine key parts (hashes, titles, modes) into one cache key."""
+    return content_hash("\x1f".join(str(part) for part in parts))
+
+
+class ResultCache:
+    """Two-tier cache with LRU, TTL and size-based eviction.
+
+    Values must be JSON-serializable, or raw bytes which are stored as BLOBs.
+    Hit and miss counts are kept per namespace so savings on expensive
+    stages, like the LLM call, are visible.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_memory_items=256, max_disk_bytes=256 * 1024 * 1024,
+                 ttl=30 * 24 * 3600):
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.hits = Counter()
+        self.misses = Counter()
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT, key TEXT, value TEXT, size INTEGER,"
+                " created REAL, accessed REAL, PRIMARY KEY (namespace, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+            self._db.commit()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, namespace, key, default=None):
+        """Return the cached value, or `default` on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get((namespace, key))
+            if entry is not None and not self._expired(entry[1], now):
+                self._memory.move_to_end((namespace, key))
+                self.hits[namespace] += 1
+                return entry[0]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._db.execute(
+                        "UPDATE cache SET accessed = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+                    )
+                    self._db.commit()
+                    value = row[0] if isinstance(row[0], bytes) else json.loads(row[0])
+                    self._remember(namespace, key, value, row[1])
+                    self.hits[namespace] += 1
+                    return value
+                if row is not None:
+                    self._db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+                    self._db.commit()
+
+            self._memory.pop((namespace, key), None)
+            self.misses[namespace] += 1
+            return default
+
+    def put(self, namespace, key, value):
+        """Store `value` in both tiers, evicting old entries if over budget."""
+        now = time.time()
+        with self._lock:
+            self._remember(namespace, key, value, now)
+            if self._db is None:
+                return
+
+            payload = value if isinstance(value, bytes) else json.dumps(value)
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, payload, len(payload), now, now),
+            )
+            if self.ttl is not None:
+                self._db.execute("DELETE FROM cache WHERE created < ?", (now - self.ttl,))
+            self._evict_disk()
+            self._db.commit()
+
+    def get_or_compute(self, namespace, key, compute):
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(namespace, key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(namespace, key, value)
+        return value
+
+    def stats(self):
+        """Return hit and miss counts per namespace."""
+        with self._lock:
+            namespaces = sorted(set(self.hits) | set(self.misses))
+            return {ns: {"hits": self.hits[ns], "misses": self.misses[ns]} for ns in namespaces}
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, namespace, key, value, created):
+        self._memory[(namespace, key)] = (value, created)
+        self._memory.move_to_end((namespace, key))
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        if not self.max_disk_bytes:
+            return
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        # Drop least recently used rows until the tier fits its budget again
+        rows = self._db.execute("SELECT namespace, key, size FROM cache ORDER BY accessed").fetchall()
+        for namespace, key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            self._db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+            total -= size
@@ -0,0 +1,385 @@
+"""Streaming export of screening results to JSONL, CSV and Parquet.
+
+Sinks write each result as it arrives, so exporting a batch of any size
+holds no more than one chunk of results in memory. A sink opened with
+`append=True` continues a previous run: `recover()` reads back the rows
+already on disk, cutting off a row torn by a crash, and `write` skips the
+resumes those rows cover.
+
+Parquet output is a directory, which pandas and pyarrow read as one table.
+Each flushed chunk becomes a part file, renamed into place once complete so
+a crash never leaves half a part behind, and closing the sink merges the
+parts into one file.
+"""
+import csv
+import glob
+import heapq
+import json
+import os
+from collections import Counter
+
+RESULT_FIELDS = [
+    "rank", "resume_id", "final_score", "ats_score", "jd_score", "category", "freshness", "latest_role_end",
+    "years_experience", "employment_gaps", "suggested_roles", "missing_keywords", "feedback", "duplicate_of",
+    "duplicate_similarity",
+]
+# Streamed rows are written before the batch is ranked
+STREAM_FIELDS = [field for field in RESULT_FIELDS if field != "rank"]
+SCORE_FIELDS = ("final_score", "ats_score", "jd_score")
+LIST_FIELDS = ("employment_gaps", "suggested_roles", "missing_keywords")
+# Parquet buffers at most this many rows between flushes
+PARQUET_ROWS_PER_PART = 1000
+
+
+class ResultSink:
+    """One output file; subclasses read and write a format."""
+
+    def __init__(self, path, fields=STREAM_FIELDS, append=False):
+        self.path = path
+        self.fields = list(fields)
+        self.append = append
+        # Resumes already in the output, from `recover()` and `write`
+        self.resume_ids = set()
+
+    def recover(self):
+        """Yield the rows a previous run wrote, dropping a torn last row. Call once, before writing."""
+        if not self.append or not os.path.exists(self.path):
+            return
+        for row in self._read():
+            if row["resume_id"] not in self.resume_ids:
+                self.resume_ids.add(row["resume_id"])
+                yield row
+
+    def write(self, result):
+        """Write `result` unless its resume is already in the output; returns whether it was written."""
+        if result["resume_id"] in self.resume_ids:
+            return False
+        self.resume_ids.add(result["resume_id"])
+        self._write({field: result.get(field) for field in self.fields})
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _write(self, row):
+        raise NotImplementedError
+
+
+def _complete_lines(path):
+    """Yield each newline-terminated line with the byte offset where it ends."""
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            yield offset, line
+
+
+class JsonlSink(ResultSink):
+    """One JSON object per line."""
+
+    def __init__(self, path, fields=STREAM_FIELDS, append=False):
+        super().__init__(path, fields, append)
+        self._file = None
+
+    def _read(self):
+        good = 0
+        for offset, line in _complete_lines(self.path):
+            try:
+                row = json.loads(line)
+            except ValueError:
+                break
+            good = offset
+            yield row
+        # A line cut short by a crash mid-write
+        if os.path.getsize(self.path) > good:
+            os.truncate(self.path, good)
+
+    def _write(self, row):
+        if self._file is None:
+            self._file = open(self.path, "a" if self.append else "w", encoding="utf-8")
+        self._file.write(json.dumps(row) + "\n")
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CsvSink(ResultSink):
+    """CSV with a header row; list fields are joined with "; "."""
+
+    def __init__(self, path, fields=STREAM_FIELDS, append=False):
+        super().__init__(path, fields, append)
+        self._file = self._writer = None
+
+    def _read(self):
+        good = 0
+        lines = _complete_lines(self.path)
+        position = {"offset": 0}
+
+        def decoded():
+            # The csv module pulls as many lines as a quoted multi-line field needs
+            for offset, line in lines:
+                position["offset"] = offset
+                yield line.decode("utf-8")
+
+        reader = csv.reader(decoded())
+        try:
+            header = next(reader, None)
+            if header is not None and header != self.fields:
+                raise ValueError(f"{self.path} has other columns ({', '.join(header)}); write to a new file")
+            good = position["offset"]
+            for values in reader:
+                if len(values) != len(self.fields):
+                    break
+                good = position["offset"]
+                yield self._parse(dict(zip(self.fields, values)))
+        except csv.Error:
+            pass
+        finally:
+            lines.close()
+        if os.path.getsize(self.path) > good:
+            os.truncate(self.path, good)
+
+    @staticmethod
+    def _parse(row):
+        # Back to the types the screener produced
+        for field in SCORE_FIELDS:
+            if row.get(field):
+                row[field] = int(row[field])
+        for field in LIST_FIELDS:
+            if field in row:
+                row[field] = row[field].split("; ") if row[field] else []
+        for field in ("latest_role_end", "duplicate_of"):
+            if field in row:
+                row[field] = row[field] or None
+        for field in ("years_experience", "duplicate_similarity"):
+            if field in row:
+                row[field] = float(row[field]) if row[field] else None
+        return row
+
+    def _write(self, row):
+        if self._file is None:
+            writing_header = not (self.append and os.path.exists(self.path) and os.path.getsize(self.path))
+            self._file = open(self.path, "a" if self.append else "w", encoding="utf-8", newline="")
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fields)
+            if writing_header:
+                self._writer.writeheader()
+        for field in LIST_FIELDS:
+            if field in row:
+                row[field] = "; ".join(row[field] or [])
+        self._writer.writerow(row)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+
+def _parquet_schema(fields):
+    import pyarrow as pa
+
+    types = {
+        "rank": pa.int32(), "final_score": pa.int32(), "ats_score": pa.int32(), "jd_score": pa.int32(),
+        "years_experience": pa.float64(), "employment_gaps": pa.list_(pa.string()),
+        "suggested_roles": pa.list_(pa.string()), "missing_keywords": pa.list_(pa.string()),
+        "duplicate_similarity": pa.float64(),
+    }
+    return pa.schema([(field, types.get(field, pa.string())) for field in fields])
+
+
+class ParquetSink(ResultSink):
+    """A directory of Parquet files: one part per flush, merged into one file on close."""
+
+    def __init__(self, path, fields=STREAM_FIELDS, append=False):
+        super().__init__(path, fields, append)
+        self._rows = []
+        os.makedirs(path, exist_ok=True)
+        for leftover in glob.glob(os.path.join(path, "*.tmp")):
+            os.remove(leftover)
+        if not append:
+            for part in self._parts():
+                os.remove(part)
+        parts = self._parts()
+        self._next_part = int(parts[-1][-13:-8]) + 1 if parts else 0
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def _new_part(self):
+        part = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+        self._next_part += 1
+        return part
+
+    def _read(self):
+        import pyarrow.parquet as pq
+
+        for part in self._parts():
+            # A row group at a time, however large the part
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=PARQUET_ROWS_PER_PART):
+                yield from batch.to_pylist()
+
+    def _write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= PARQUET_ROWS_PER_PART:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(self._rows, schema=_parquet_schema(self.fields))
+        part = self._new_part()
+        pq.write_table(table, part + ".tmp")
+        os.replace(part + ".tmp", part)
+        self._rows = []
+
+    def close(self):
+        self.flush()
+        self._merge_parts()
+
+    def _merge_parts(self):
+        """Rewrite the per-flush parts as one file with full-size row groups."""
+        parts = self._parts()
+        if len(parts) <= 1:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _parquet_schema(self.fields)
+        merged = self._new_part()
+        seen = set()
+        rows = []
+        with pq.ParquetWriter(merged + ".tmp", schema) as writer:
+            for part in parts:
+                for batch in pq.ParquetFile(part).iter_batches(batch_size=PARQUET_ROWS_PER_PART):
+                    for row in batch.to_pylist():
+                        if row["resume_id"] not in seen:
+                            seen.add(row["resume_id"])
+                            rows.append(row)
+                    if len(rows) >= PARQUET_ROWS_PER_PART:
+                        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                        rows = []
+            if rows:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        # Until the old parts are gone their rows are there twice; `recover` reads each resume once
+        os.replace(merged + ".tmp", merged)
+        for part in parts:
+            os.remove(part)
+
+
+SINKS = {".jsonl": JsonlSink, ".csv": CsvSink, ".parquet": ParquetSink}
+
+
+def open_sink(path, fields=STREAM_FIELDS, append=False):
+    """Return the sink for `path`, chosen by its extension: .jsonl, .csv or .parquet."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"{path}: output must end in {', '.join(SINKS)}")
+    return SINKS[extension](path, fields, append)
+
+
+class ResultSummary:
+    """Score distributions and category counts, updated one result at a time.
+
+    Scores are integers from 0 to 100, so a count per value gives exact
+    medians and percentiles in constant memory.
+    """
+
+    def __init__(self, top_n=10):
+        self.count = 0
+        self.duplicates = 0
+        self.feedback_errors = 0
+        self.score_counts = {field: [0] * 101 for field in SCORE_FIELDS}
+        self.categories = Counter()
+        self.freshness = Counter()
+        self.suggested_roles = Counter()
+        self.top_n = top_n
+        self._top = []
+
+    def add(self, result):
+        self.count += 1
+        if result.get("duplicate_of"):
+            self.duplicates += 1
+        if (result.get("feedback") or "").startswith("❌"):
+            self.feedback_errors += 1
+        for field in SCORE_FIELDS:
+            if result.get(field) is not None:
+                self.score_counts[field][min(100, max(0, int(result[field])))] += 1
+        self.categories[result.get("category")] += 1
+        self.freshness[result.get("freshness")] += 1
+        self.suggested_roles.update(result.get("suggested_roles") or [])
+
+        entry = (result["final_score"], result["resume_id"])
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, entry)
+        elif entry > self._top[0]:
+            heapq.heapreplace(self._top, entry)
+
+    @staticmethod
+    def _distribution(counts):
+        total = sum(counts)
+        if not total:
+            return None
+
+        def percentile(p):
+            rank = p * (total - 1)
+            seen = 0
+            for score, count in enumerate(counts):
+                seen += count
+                if seen > rank:
+                    return score
+
+        return {
+            "mean": round(sum(score * count for score, count in enumerate(counts)) / total, 2),
+            "min": next(score for score, count in enumerate(counts) if count),
+            "p25": percentile(0.25),
+            "median": percentile(0.5),
+            "p75": percentile(0.75),
+            "p90": percentile(0.9),
+            "max": max(score for score, count in enumerate(counts) if count),
+            # Ten-point bins; the last one includes 100
+            "histogram": {f"{low}-{low + 9 if low < 90 else 100}": sum(counts[low:low + 10 if low < 90 else 101])
+                          for low in range(0, 100, 10)},
+        }
+
+    def as_dict(self):
+        return {
+            "resumes": self.count,
+            "duplicates": self.duplicates,
+            "feedback_errors": self.feedback_errors,
+            "scores": {field: self._distribution(counts) for field, counts in self.score_counts.items()},
+            "categories": dict(self.categories.most_common()),
+            "freshness": dict(self.freshness.most_common()),
+            "suggested_roles": dict(self.suggested_roles.most_common()),
+            "top_candidates": [{"resume_id": resume_id, "final_score": score}
+                               for score, resume_id in sorted(self._top, reverse=True)],
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
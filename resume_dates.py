@@ -0,0 +1,203 @@
+"""Employment dates read from the token stream keyword matching already built.
+
+`TokenIndex.tokens` keeps line breaks and dashes, which is enough to find,
+without another pass over the text:
+
+- dates: "2021", "mar 2021", "march 2021", "03/2021", "03-2021"; a number
+  counts as a month only joined to its year, so "python 3 2021" is 2021;
+- ranges: a date, then "-", "–", "to", "until" or "through", then a date or
+  "present" ("current", "now", "to date"), and "since <date>";
+- section headings, so ranges under education, projects or certifications
+  are not taken for roles.
+
+A date outside a range counts only when it has a month or stands at the
+start or end of a line, as a heading's date does; a year inside a sentence,
+such as one in a publication title, does not. A year without a month has an
+unknown month: it is reported as "YYYY", counts as its January when a range
+starts and its December when one ends, and a gap next to it counts only when
+a whole calendar year passes without a role, so "2018 - 2021" then
+"May 2022 - present" leaves no gap.
+"""
+from collections import namedtuple
+from datetime import date
+
+from resume_parser import SECTION_HEADINGS, as_resume_text
+
+# Months between two roles that count as a gap in employment
+GAP_MONTHS = 3
+
+ResumeDates = namedtuple("ResumeDates", [
+    "roles",             # (start, end) pairs as "YYYY-MM" ("YYYY" without a month), end "present" for a current role
+    "latest_role_end",   # "YYYY-MM", "YYYY" or "present"; None without roles
+    "current_role",      # whether a role runs to the present
+    "years_experience",  # years covered by roles, overlaps counted once
+    "gaps",              # "start/end" intervals of GAP_MONTHS or more between roles, dates formatted as in roles
+    "latest_date",       # the latest date outside education, a present role's being today; None without dates
+])
+
+_MONTHS = {}
+for _number, _names in enumerate((
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",), ("jun", "june"),
+        ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"),
+        ("nov", "november"), ("dec", "december")), start=1):
+    _MONTHS.update(dict.fromkeys(_names, _number))
+# Years from 1950 to ten years ahead, for expected graduation dates
+_YEARS = {str(year): year for year in range(1950, date.today().year + 11)}
+# "03/2021", "3/2021", "03-2021" and "3-2021" tokens, as month indexes
+_NUMERIC_DATES = {f"{month}{separator}{year}": _YEARS[year] * 12 + number - 1
+                  for number in range(1, 13) for month in {str(number), f"{number:02d}"}
+                  for separator in "/-" for year in _YEARS}
+_CONNECTORS = frozenset(("-", "–", "—", "to", "till", "until", "through", "thru"))
+_PRESENT = frozenset(("present", "current", "now", "today", "ongoing"))
+_NOT_ROLES = frozenset(("education", "projects", "certifications"))
+# Heading token sequences, looked up only for lines that start with a heading's first word
+_HEADINGS = {tuple(heading.split()): name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_STARTS = frozenset(heading[0] for heading in _HEADINGS)
+_HEADING_LENGTH = max(map(len, _HEADINGS))
+# The tokens the date pass stops at
+_MARKS = frozenset(_YEARS).union(_NUMERIC_DATES, _HEADING_STARTS)
+
+
+def _month_index(today):
+    return today.year * 12 + today.month - 1
+
+
+def _format(month_index, month_known=True):
+    if not month_known:
+        return f"{month_index // 12:04d}"
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+
+def _heading(tokens, start):
+    """The section a line starting with a heading's first word at `start` opens, or None."""
+    if start and tokens[start - 1] != "\n":
+        return None
+    line = tokens[start:start + _HEADING_LENGTH + 1]
+    if "\n" in line:
+        line = line[:line.index("\n")]
+    return _HEADINGS.get(tuple(line))
+
+
+def _start_date_at(tokens, i):
+    """`(month_index, month_known, first_token)` for the date whose year (or numeric date) is token `i`."""
+    if tokens[i] in _NUMERIC_DATES:
+        return _NUMERIC_DATES[tokens[i]], True, i
+    month = _MONTHS.get(tokens[i - 1]) if i else None
+    if month is None:
+        return _YEARS[tokens[i]] * 12, False, i
+    return _YEARS[tokens[i]] * 12 + month - 1, True, i - 1
+
+
+def _end_date_at(tokens, i):
+    """`(month_index, month_known, end)` for a date ending a range at token `i`, or None."""
+    if tokens[i] in _NUMERIC_DATES:
+        return _NUMERIC_DATES[tokens[i]], True, i + 1
+    if tokens[i] in _YEARS:
+        return _YEARS[tokens[i]] * 12 + 11, False, i + 1
+    month = _MONTHS.get(tokens[i])
+    if month is not None and i + 1 < len(tokens) and tokens[i + 1] in _YEARS:
+        return _YEARS[tokens[i + 1]] * 12 + month - 1, True, i + 2
+    return None
+
+
+def _range_end(tokens, i, now):
+    """`(month_index, month_known, is_present, end)` for what follows a range connector at token `i`, or None."""
+    if i >= len(tokens):
+        return None
+    # "present", or "to date" after "-" or "to"
+    if tokens[i] in _PRESENT or tokens[i] == "date" and tokens[i - 1] == "to":
+        return now, True, True, i + 1
+    if tokens[i] == "to" and tokens[i + 1:i + 2] == ["date"]:
+        return now, True, True, i + 2
+    found = _end_date_at(tokens, i)
+    return found and (found[0], found[1], False, found[2])
+
+
+def dates_from_tokens(tokens, today=None):
+    """Return the ResumeDates of a `TokenIndex.tokens` stream, as of `today` (a date; default today)."""
+    now = _month_index(today or date.today())
+    n = len(tokens)
+    section = None
+    roles = []
+    latest = None
+    # Past the end of the last range read, whose dates were already counted
+    resume_at = 0
+    for i in [i for i, token in enumerate(tokens) if token in _MARKS]:
+        if tokens[i] not in _YEARS and tokens[i] not in _NUMERIC_DATES:
+            section = _heading(tokens, i) or section
+            continue
+        if i < resume_at:
+            continue
+        begins, begins_known, start = _start_date_at(tokens, i)
+        end = None
+        if i + 1 < n and tokens[i + 1] in _CONNECTORS:
+            end = _range_end(tokens, i + 2, now)
+        elif start and tokens[start - 1] == "since":
+            end = now, True, True, i + 1
+
+        if end is not None:
+            finishes, finishes_known, present, resume_at = end
+            finishes = min(finishes, now)
+            if finishes < begins:
+                continue
+            role = (begins, begins_known, finishes, finishes_known, present)
+            # The same role is often given again in the summary ("since 2021")
+            if section not in _NOT_ROLES and role not in roles:
+                roles.append(role)
+            dated = finishes
+        elif begins_known or not start or tokens[start - 1] == "\n" or i + 1 == n or tokens[i + 1] == "\n":
+            dated = min(begins, now)
+        else:
+            continue
+        # Expected graduation dates say nothing about how recent the resume is
+        if section != "education":
+            latest = max(latest or dated, dated)
+    return _summarize(roles, latest)
+
+
+def _summarize(roles, latest):
+    # [begins, begins_known, finishes, finishes_known] per stretch of overlapping roles
+    merged = []
+    for begins, begins_known, finishes, finishes_known, _ in sorted(roles):
+        if merged and begins <= merged[-1][2]:
+            if finishes > merged[-1][2]:
+                merged[-1][2:] = [finishes, finishes_known]
+        else:
+            merged.append([begins, begins_known, finishes, finishes_known])
+    gaps = []
+    for previous, following in zip(merged, merged[1:]):
+        if previous[3] and following[1]:
+            found = following[0] - previous[2] >= GAP_MONTHS
+        else:
+            # A month is unknown: only a calendar year without a role is certainly a gap
+            found = following[0] // 12 - previous[2] // 12 >= 2
+        if found:
+            gaps.append(f"{_format(previous[2], previous[3])}/{_format(following[0], following[1])}")
+
+    current_role = any(role[4] for role in roles)
+    latest_role_end = None
+    if roles:
+        latest_role_end = "present" if current_role else _format(*max(role[2:4] for role in roles))
+    return ResumeDates(
+        roles=[(_format(begins, begins_known), "present" if present else _format(finishes, finishes_known))
+               for begins, begins_known, finishes, finishes_known, present in roles],
+        latest_role_end=latest_role_end,
+        current_role=current_role,
+        years_experience=round(sum(finishes - begins for begins, _, finishes, _ in merged) / 12, 1),
+        gaps=gaps,
+        latest_date=None if latest is None else _format(latest),
+    )
+
+
+def extract_dates(resume, today=None):
+    """Return the ResumeDates of a resume, a `ResumeText` or string, reusing its keyword tokens."""
+    resume = as_resume_text(resume)
+    if today is None:
+        return resume.dates
+    return dates_from_tokens(resume.keyword_index.tokens, today)
+
+
+def extract_dates_batch(resumes, today=None):
+    """The ResumeDates of every resume, all as of the same `today`."""
+    today = today or date.today()
+    return [extract_dates(resume, today) for resume in resumes]
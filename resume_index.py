@@ -0,0 +1,378 @@
+"""Persistent resume store with an inverted index for BM25 retrieval against new JDs.
+
+Resumes are tokenized exactly like `extract_keywords_from_jd` (English stop
+words, unigrams and bigrams) and hashed into a fixed term space, so adding
+resumes never reshapes existing data. Each `add` writes an immutable segment
+of term-frequency postings (a CSC matrix stored as memory-mappable `.npy`
+files); deletes are tombstones until segments are merged. The newest
+MERGE_FACTOR segments are merged once together they hold as many resumes as
+the one before them, like carries in a base-MERGE_FACTOR counter, so many
+small adds leave a logarithmic number of segments and rewrite each resume a
+logarithmic number of times. `compact` merges everything. SQLite lists the
+live segments, committed with the rows that point at them, so a crash
+mid-add or mid-merge leaves no segment counted twice on reopening.
+
+Usage:
+    python resume_index.py index/ add resumes/
+    python resume_index.py index/ search --jd job.txt -k 20
+    python resume_index.py index/ delete cv_0042.pdf
+    python resume_index.py index/ compact
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+
+from jd_keywords import JD_TOKENIZER_OPTIONS
+
+N_FEATURES = 2 ** 20
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Segments merged at once; more means fewer rewrites but more segments to search
+MERGE_FACTOR = 4
+AUTO_COMPACT_SEGMENTS = 16
+
+_SEGMENT_ARRAYS = ("rows", "lengths", "data", "indices", "indptr")
+
+
+def build_hasher():
+    """Return the vectorizer that maps text to hashed unigram and bigram counts."""
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(
+        **JD_TOKENIZER_OPTIONS, n_features=N_FEATURES, alternate_sign=False, norm=None, dtype=np.float32
+    )
+
+
+class _Segment:
+    """One immutable batch of postings, memory-mapped from disk."""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        for array in _SEGMENT_ARRAYS:
+            setattr(self, array, np.load(os.path.join(path, f"{array}.npy"), mmap_mode="r"))
+        self.alive = np.ones(len(self.rows), dtype=bool)
+
+    @staticmethod
+    def write(path, rows, counts):
+        """Persist `counts` (docs x terms, CSR) for global `rows` as a new segment."""
+        postings = counts.tocsc()
+        arrays = {
+            "rows": np.asarray(rows, dtype=np.int64),
+            "lengths": np.asarray(counts.sum(axis=1), dtype=np.float32).ravel(),
+            "data": postings.data.astype(np.float32),
+            "indices": postings.indices.astype(np.int32),
+            "indptr": postings.indptr.astype(np.int64),
+        }
+        # Build in a scratch directory and rename, so readers never see half a segment
+        scratch = path + ".tmp"
+        os.makedirs(scratch)
+        for name, array in arrays.items():
+            np.save(os.path.join(scratch, f"{name}.npy"), array)
+        os.rename(scratch, path)
+        return _Segment(path)
+
+    def columns_of(self, local_rows):
+        """Return the term column of every posting belonging to `local_rows`."""
+        positions = np.flatnonzero(np.isin(self.indices, local_rows))
+        return np.searchsorted(self.indptr, positions, side="right") - 1
+
+    def to_csr(self):
+        postings = sparse.csc_matrix(
+            (np.asarray(self.data), np.asarray(self.indices), np.asarray(self.indptr)),
+            shape=(len(self.rows), N_FEATURES),
+        )
+        return postings.tocsr()
+
+
+class ResumeIndex:
+    """Incrementally updated BM25 index over screened resumes, stored in `path`."""
+
+    def __init__(self, path):
+        self.path = path
+        self._segment_dir = os.path.join(path, "segments")
+        os.makedirs(self._segment_dir, exist_ok=True)
+
+        self._db = sqlite3.connect(os.path.join(path, "store.sqlite3"))
+        listed = self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'segments'").fetchone()
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " row INTEGER PRIMARY KEY AUTOINCREMENT, resume_id TEXT NOT NULL, segment TEXT,"
+            " length REAL NOT NULL, deleted INTEGER NOT NULL DEFAULT 0, added REAL, text TEXT);"
+            "CREATE UNIQUE INDEX IF NOT EXISTS docs_live_id ON docs (resume_id) WHERE deleted = 0;"
+            # The live segments, changed in the same transaction as the docs that point at them
+            "CREATE TABLE IF NOT EXISTS segments (name TEXT PRIMARY KEY);"
+        )
+        self._hasher = build_hasher()
+
+        names = sorted(os.listdir(self._segment_dir))
+        if not listed:
+            # An index from before the list was kept: every finished segment directory is live
+            with self._db:
+                self._db.executemany("INSERT INTO segments (name) VALUES (?)",
+                                     [(name,) for name in names if not name.endswith(".tmp")])
+        live = {name for name, in self._db.execute("SELECT name FROM segments")}
+        self._segments = []
+        for name in names:
+            segment_path = os.path.join(self._segment_dir, name)
+            if name in live:
+                self._segments.append(_Segment(segment_path))
+            else:
+                # Left over from an add or merge that never committed, or replaced by a merge that did
+                shutil.rmtree(segment_path)
+        self._load_stats()
+
+    def __len__(self):
+        return self._n_docs
+
+    def close(self):
+        self._db.close()
+
+    def _load_stats(self):
+        """Rebuild document frequencies and tombstone masks from the segments."""
+        self._df = np.zeros(N_FEATURES, dtype=np.int64)
+        for segment in self._segments:
+            self._df += np.diff(segment.indptr)
+
+        deleted = {}
+        for row, segment in self._db.execute("SELECT row, segment FROM docs WHERE deleted = 1"):
+            deleted.setdefault(segment, []).append(row)
+        for segment in self._segments:
+            if segment.name in deleted:
+                self._tombstone(segment, deleted[segment.name])
+
+        self._n_docs, self._total_length = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs WHERE deleted = 0"
+        ).fetchone()
+
+    def _tombstone(self, segment, rows):
+        local = np.flatnonzero(np.isin(segment.rows, rows) & segment.alive)
+        if len(local):
+            segment.alive[local] = False
+            np.subtract.at(self._df, segment.columns_of(local), 1)
+
+    def _vectorize(self, texts):
+        return self._hasher.transform(texts)
+
+    def add(self, resumes, store_text=True):
+        """Index `(resume_id, text)` pairs as one new segment, replacing existing ids."""
+        resumes = list(resumes)
+        if not resumes:
+            return
+        self.delete([resume_id for resume_id, _ in resumes])
+
+        counts = self._vectorize([text for _, text in resumes])
+        lengths = np.asarray(counts.sum(axis=1)).ravel()
+        segment_name = f"seg-{time.time_ns():020d}"
+
+        now = time.time()
+        rows = []
+        with self._db:
+            for (resume_id, text), length in zip(resumes, lengths):
+                cursor = self._db.execute(
+                    "INSERT INTO docs (resume_id, segment, length, added, text) VALUES (?, ?, ?, ?, ?)",
+                    (resume_id, segment_name, float(length), now, text if store_text else None),
+                )
+                rows.append(cursor.lastrowid)
+            segment = _Segment.write(os.path.join(self._segment_dir, segment_name), rows, counts)
+            self._db.execute("INSERT INTO segments (name) VALUES (?)", (segment_name,))
+
+        self._segments.append(segment)
+        self._df += np.diff(segment.indptr)
+        self._n_docs += len(rows)
+        self._total_length += float(lengths.sum())
+
+        while len(self._segments) >= MERGE_FACTOR:
+            newest = self._segments[-MERGE_FACTOR:]
+            if newest[0].alive.sum() > sum(segment.alive.sum() for segment in newest[1:]):
+                break
+            self._merge(newest)
+        if len(self._segments) > AUTO_COMPACT_SEGMENTS:
+            self.compact()
+
+    def delete(self, resume_ids):
+        """Tombstone resumes by id. Space is reclaimed by `compact`."""
+        resume_ids = list(resume_ids)
+        if not resume_ids:
+            return 0
+
+        found = []
+        for start in range(0, len(resume_ids), 500):
+            chunk = resume_ids[start:start + 500]
+            found += self._db.execute(
+                f"SELECT row, segment, length FROM docs WHERE deleted = 0 AND resume_id IN "
+                f"({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+        if not found:
+            return 0
+
+        with self._db:
+            self._db.executemany("UPDATE docs SET deleted = 1 WHERE row = ?", [(row,) for row, _, _ in found])
+
+        by_segment = {}
+        for row, segment_name, length in found:
+            by_segment.setdefault(segment_name, []).append(row)
+            self._n_docs -= 1
+            self._total_length -= length
+        for segment in self._segments:
+            if segment.name in by_segment:
+                self._tombstone(segment, by_segment[segment.name])
+        return len(found)
+
+    def compact(self):
+        """Merge every segment into one, dropping deleted resumes."""
+        if self._segments:
+            self._merge(self._segments)
+
+    def _merge(self, segments):
+        """Replace the newest `segments` with one, dropping their deleted resumes.
+
+        Only live postings are copied, so document frequencies and totals are unchanged.
+        """
+        rows, blocks = [], []
+        for segment in segments:
+            if segment.alive.any():
+                rows.append(np.asarray(segment.rows)[segment.alive])
+                blocks.append(segment.to_csr()[segment.alive])
+
+        # Named after every existing segment, so it still sorts last when the index is reopened
+        segment_name = f"seg-{time.time_ns():020d}"
+        self._segments = self._segments[:len(self._segments) - len(segments)]
+        if blocks:
+            merged = _Segment.write(os.path.join(self._segment_dir, segment_name),
+                                    np.concatenate(rows), sparse.vstack(blocks, format="csr"))
+            self._segments.append(merged)
+
+        names = [segment.name for segment in segments]
+        placeholders = ",".join("?" * len(names))
+        # Until this commits the old segments stay live; once it has, reopening removes them if we stop here
+        with self._db:
+            self._db.execute(f"DELETE FROM docs WHERE deleted = 1 AND segment IN ({placeholders})", names)
+            self._db.execute(f"UPDATE docs SET segment = ? WHERE segment IN ({placeholders})", [segment_name, *names])
+            self._db.execute(f"DELETE FROM segments WHERE name IN ({placeholders})", names)
+            if blocks:
+                self._db.execute("INSERT INTO segments (name) VALUES (?)", (segment_name,))
+        for segment in segments:
+            shutil.rmtree(segment.path)
+
+    def search(self, query_text, top_k=10):
+        """Return up to `top_k` `(resume_id, score)` pairs ranked by BM25 against `query_text`."""
+        if not self._n_docs or not query_text:
+            return []
+
+        terms = self._vectorize([query_text]).indices
+        df = self._df[terms]
+        terms, df = terms[df > 0], df[df > 0]
+        if not len(terms):
+            return []
+
+        idf = np.log(1 + (self._n_docs - df + 0.5) / (df + 0.5))
+        avg_length = self._total_length / self._n_docs
+
+        best_scores, best_rows = [], []
+        for segment in self._segments:
+            starts, ends = segment.indptr[terms], segment.indptr[terms + 1]
+            if not (ends - starts).any():
+                continue
+
+            # Gather the postings of every query term into flat arrays
+            local = np.concatenate([segment.indices[s:e] for s, e in zip(starts, ends)])
+            tf = np.concatenate([segment.data[s:e] for s, e in zip(starts, ends)])
+            weight = np.repeat(idf, ends - starts)
+
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * segment.lengths[local] / avg_length)
+            contribution = weight * tf * (BM25_K1 + 1) / (tf + norm)
+            scores = np.bincount(local, weights=contribution, minlength=len(segment.rows))
+            scores[~segment.alive] = 0
+
+            k = min(top_k, len(scores))
+            top = np.argpartition(scores, -k)[-k:]
+            top = top[scores[top] > 0]
+            best_scores.append(scores[top])
+            best_rows.append(np.asarray(segment.rows)[top])
+
+        if not best_scores:
+            return []
+        scores = np.concatenate(best_scores)
+        rows = np.concatenate(best_rows)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+
+        ids = dict(self._db.execute(
+            f"SELECT row, resume_id FROM docs WHERE row IN ({','.join('?' * len(order))})",
+            [int(rows[i]) for i in order],
+        ).fetchall())
+        return [(ids[int(rows[i])], float(scores[i])) for i in order]
+
+    def get_text(self, resume_id):
+        """Return the stored text of a resume, or None."""
+        row = self._db.execute(
+            "SELECT text FROM docs WHERE resume_id = ? AND deleted = 0", (resume_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def stats(self):
+        return {
+            "resumes": self._n_docs,
+            "segments": len(self._segments),
+            "avg_length": self._total_length / self._n_docs if self._n_docs else 0.0,
+            "postings": int(sum(len(segment.data) for segment in self._segments)),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain and query the persistent resume index.")
+    parser.add_argument("index", help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Index every PDF in a directory or zip")
+    add.add_argument("source")
+    add.add_argument("--workers", type=int, default=None)
+
+    search = commands.add_parser("search", help="Rank indexed resumes against a JD")
+    search.add_argument("--jd", required=True, help="Path to a text file holding the job description")
+    search.add_argument("-k", "--top-k", type=int, default=10)
+
+    delete = commands.add_parser("delete", help="Remove resumes by id")
+    delete.add_argument("resume_ids", nargs="+")
+
+    commands.add_parser("compact", help="Merge segments and drop deleted resumes")
+    commands.add_parser("stats", help="Show index size")
+
+    args = parser.parse_args(argv)
+    index = ResumeIndex(args.index)
+
+    if args.command == "add":
+        from batch_screener import load_resumes
+
+        resumes, _ = load_resumes(args.source, workers=args.workers)
+        index.add(resumes)
+        print(f"Indexed {len(resumes)} resumes ({len(index)} total)")
+    elif args.command == "search":
+        with open(args.jd, encoding="utf-8") as f:
+            jd_text = f.read()
+        start = time.perf_counter()
+        hits = index.search(jd_text, top_k=args.top_k)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for rank, (resume_id, score) in enumerate(hits, start=1):
+            print(f"{rank:>3}. {score:7.3f}  {resume_id}")
+        print(f"{len(hits)} results from {len(index)} resumes in {elapsed_ms:.1f}ms", file=sys.stderr)
+    elif args.command == "delete":
+        print(f"Deleted {index.delete(args.resume_ids)} resumes")
+    elif args.command == "compact":
+        index.compact()
+        print(f"Compacted to {index.stats()['segments']} segment(s)")
+    else:
+        for key, value in index.stats().items():
+            print(f"{key}: {round(value, 1) if isinstance(value, float) else value}")
+
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
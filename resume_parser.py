@@ -1,25 +1,207 @@
 # resume_parser.py
 
-import fitz  # PyMuPDF
+import os
 import re
+from collections import Counter
 from datetime import datetime
 
-def extract_text_from_pdf(file):
+_WORD_RE = re.compile(r"\w+")
+_LINE_RE = re.compile(r"[^\n]+")
+
+# Heading lines that open a resume section, by section name
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment history",
+                   "work history"),
+    "education": ("education", "academic background", "qualifications"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies"),
+    "projects": ("projects", "personal projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications"),
+}
+_HEADING_SECTIONS = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+
+def _heading_section(line):
+    """Return the section a heading line opens, or None for any other line."""
+    return _HEADING_SECTIONS.get(line.strip().rstrip(":").lower())
+
+def open_pdf(source):
+    """Open a PDF from a path, raw bytes or a file-like object."""
+    import fitz  # PyMuPDF, imported on first use to keep app startup fast
+
+    if isinstance(source, (str, os.PathLike)):
+        # PyMuPDF reads pages from disk on demand instead of loading the whole file
+        return fitz.open(source, filetype="pdf")
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(stream=source.read(), filetype="pdf")
+
+def iter_pdf_pages(file, max_pages=None):
+    """Yield the text of each page as it is extracted."""
+    with open_pdf(file) as doc:
+        pages = doc if max_pages is None else doc.pages(0, min(max_pages, doc.page_count))
+        for page in pages:
+            yield page.get_text()
+
+def extract_text_from_pdf(file, max_pages=None):
     """Extract raw text from a PDF file using PyMuPDF (fitz)."""
-    text = ""
-    with fitz.open(stream=file.read(), filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+    return "".join(iter_pdf_pages(file, max_pages))
+
+class ResumeText:
+    """Resume text plus the normalized view every scorer shares.
+
+    Pages are lowercased, split into sections and tokenized for the keyword
+    matcher and the category model once, as they arrive, so normalizing a
+    long PDF overlaps its extraction and only joining the tokens waits for
+    the last page. `keyword_index` feeds the keyword matcher, `word_counts`
+    the category model's term frequencies, `dates` (read from the keyword
+    tokens) the freshness estimate, and `sections` maps each detected
+    section heading to its offset in `text`.
+    """
+
+    def __init__(self, pages=()):
+        self._pages = []
+        self._lower_pages = []
+        self._counts = Counter()
+        # A token touching the end of the last page may continue on the next one
+        self._pending = ""
+        self._keyword_tokens = None
+        self._length = 0
+        self._text = self._lower = self._keyword_index = self._dates = None
+        # Lowercasing Σ depends on its neighbours, which may sit on another page
+        self._context_lower = False
+        self.sections = {}
+        for page in pages:
+            self.add_page(page)
+
+    @classmethod
+    def from_text(cls, text):
+        return cls([text] if text else [])
+
+    def add_page(self, page):
+        """Append one page of text, updating the normalized view."""
+        self._text = self._lower = self._keyword_index = self._dates = None
+        for match in _LINE_RE.finditer(page):
+            section = _heading_section(match.group())
+            if section:
+                self.sections.setdefault(section, self._length + match.start())
+        self._pages.append(page)
+        self._length += len(page)
+
+        self._context_lower = self._context_lower or "Σ" in page
+        lower = page.lower()
+        self._lower_pages.append(lower)
+        if not lower:
+            return
+        if not self._context_lower:
+            if self._keyword_tokens is None:
+                from keyword_matcher import TokenStream
+
+                self._keyword_tokens = TokenStream()
+            self._keyword_tokens.add(lower)
+        tokens = _WORD_RE.findall(lower)
+        if self._pending:
+            if tokens and _WORD_RE.match(lower):
+                tokens[0] = self._pending + tokens[0]
+            else:
+                self._counts[self._pending] += 1
+            self._pending = ""
+        if tokens and _WORD_RE.match(lower[-1]):
+            self._pending = tokens.pop()
+        self._counts.update(tokens)
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self._pages)
+        return self._text
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower() if self._context_lower else "".join(self._lower_pages)
+        return self._lower
+
+    @property
+    def keyword_index(self):
+        """The keyword matcher's normalized tokens, built on first use and shared by every scan."""
+        if self._keyword_index is None:
+            from keyword_matcher import TokenIndex
+
+            if self._keyword_tokens is not None and not self._context_lower:
+                self._keyword_index = self._keyword_tokens.index()
+            else:
+                self._keyword_index = TokenIndex(self.lower)
+        return self._keyword_index
+
+    @property
+    def dates(self):
+        """Role dates, experience and gaps (`resume_dates.ResumeDates`), from the keyword tokens."""
+        if self._dates is None:
+            from resume_dates import dates_from_tokens
+
+            self._dates = dates_from_tokens(self.keyword_index.tokens)
+        return self._dates
+
+    @property
+    def word_counts(self):
+        """Occurrences of each `\\w+` token of the lowercased text."""
+        if self._context_lower:
+            return Counter(_WORD_RE.findall(self.lower))
+        if self._pending:
+            counts = self._counts.copy()
+            counts[self._pending] += 1
+            return counts
+        return self._counts
+
+    @property
+    def words(self):
+        """Distinct `\\w+` tokens of the lowercased text."""
+        return self.word_counts.keys()
+
+    def __len__(self):
+        return self._length
+
+    def __str__(self):
+        return self.text
+
+def split_sections(text):
+    """Split text at section headings into `(section_name, chunk)` pairs.
+
+    Text before the first heading (name, contact details) comes first with
+    no section name; each chunk starts with its heading line.
+    """
+    chunks = []
+    name, start = None, 0
+    for match in _LINE_RE.finditer(text):
+        section = _heading_section(match.group())
+        if section:
+            if text[start:match.start()].strip():
+                chunks.append((name, text[start:match.start()]))
+            name, start = section, match.start()
+    if text[start:].strip():
+        chunks.append((name, text[start:]))
+    return chunks
+
+def as_resume_text(resume_text):
+    """Return `resume_text` as a ResumeText, wrapping a plain string."""
+    if isinstance(resume_text, ResumeText):
+        return resume_text
+    return ResumeText.from_text(resume_text or "")
 
 def estimate_resume_freshness(resume_text):
-    """Rudimentary logic to guess how recently the resume was updated."""
-    # Extract years or years with months
-    years = re.findall(r'\b(20\d{2}|19\d{2})\b', resume_text)
+    """Guess how recently the resume was updated from when its latest role ended; a current role counts as now.
+
+    Without roles, the latest date outside the education section is used.
+    """
+    dates = as_resume_text(resume_text).dates
     current_year = datetime.now().year
+    if dates.current_role:
+        latest_year = current_year
+    else:
+        latest = dates.latest_role_end or dates.latest_date
+        latest_year = int(latest[:4]) if latest else None
 
-    if years:
-        latest_year = max(map(int, years))
+    if latest_year is not None:
         diff = current_year - latest_year
         if diff <= 1:
             return "Updated Recently"
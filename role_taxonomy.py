@@ -0,0 +1,86 @@
+"""Role/keyword taxonomy, loaded from JSON and scored as a sparse keyword x role matrix."""
+import json
+import os
+
+DEFAULT_TAXONOMY_PATH = os.environ.get(
+    "RESUME_SCREENER_TAXONOMY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "role_taxonomy.json"),
+)
+
+# A role is suggested once this share of its keywords appears in the resume
+MIN_ROLE_PERCENTAGE = 20
+
+
+def load_taxonomy_file(path=DEFAULT_TAXONOMY_PATH):
+    """Return the `job_keywords` and `roles` tables from a taxonomy JSON file."""
+    with open(path, encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    return taxonomy["job_keywords"], taxonomy["roles"]
+
+
+class RoleTaxonomy:
+    """Score every role for a batch of resumes with one sparse matrix product.
+
+    The incidence matrix holds how often each keyword is listed under each
+    role, so a document x keyword hit matrix times it gives per-role match
+    counts, exactly as counting keyword by keyword would.
+    """
+
+    def __init__(self, roles):
+        import numpy as np
+        from scipy import sparse
+
+        self.roles = list(roles)
+        self.keywords = sorted({kw for keywords in roles.values() for kw in keywords})
+        self.keyword_index = {kw: i for i, kw in enumerate(self.keywords)}
+
+        rows, cols = [], []
+        for col, keywords in enumerate(roles.values()):
+            for kw in keywords:
+                rows.append(self.keyword_index[kw])
+                cols.append(col)
+        # Duplicate entries are summed, matching a keyword listed twice for one role
+        self.incidence = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(self.keywords), len(self.roles))
+        )
+        self.role_sizes = np.array([len(keywords) for keywords in roles.values()], dtype=float)
+        # Summing dense rows is cheaper than a sparse product for a single resume
+        self._dense_incidence = self.incidence.toarray()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH):
+        return cls(load_taxonomy_file(path)[1])
+
+    def hit_matrix(self, hits_list):
+        """Build the document x keyword matrix of substring hits from `KeywordHits`."""
+        import numpy as np
+        from scipy import sparse
+
+        indptr, indices = [0], []
+        for hits in hits_list:
+            indices.extend(self.keyword_index[kw] for kw in hits.found if kw in self.keyword_index)
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr), shape=(len(indptr) - 1, len(self.keywords))
+        )
+
+    def percentages(self, hit_matrix):
+        """Return a dense document x role array of keyword match percentages."""
+        counts = (hit_matrix @ self.incidence).toarray()
+        return counts / self.role_sizes * 100
+
+    def suggest(self, hits_list, top_n=3, min_percentage=MIN_ROLE_PERCENTAGE):
+        """Return the top roles per document, best match first, ties in taxonomy order."""
+        import numpy as np
+
+        if len(hits_list) == 1:
+            columns = [self.keyword_index[kw] for kw in hits_list[0].found if kw in self.keyword_index]
+            rows = [self._dense_incidence[columns].sum(axis=0) / self.role_sizes * 100]
+        else:
+            rows = self.percentages(self.hit_matrix(hits_list))
+
+        suggestions = []
+        for row in rows:
+            order = np.argsort(-row, kind="stable")
+            suggestions.append([self.roles[i] for i in order[:top_n] if row[i] >= min_percentage])
+        return suggestions
@@ -1,6 +1,36 @@
+import json
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+
 import requests
 
-def score_resume(resume_text, job_title="", api_key="", mode="brief", job_description=""):
+from prompt_budget import JD_TOKEN_BUDGET, RESUME_TOKEN_BUDGET, count_tokens, fit_resume, fit_text
+
+logger = logging.getLogger(__name__)
+
+COHERE_CHAT_URL = "https://api.cohere.ai/v1/chat"
+COHERE_MODEL = "command-r-plus"
+
+# Rate limiting and transient server failures are worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# As are dropped connections and timeouts
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+_session = None
+
+
+def build_prompt(resume_text, job_title="", mode="brief", job_description="", jd_keywords=None,
+                 resume_token_budget=RESUME_TOKEN_BUDGET, jd_token_budget=JD_TOKEN_BUDGET):
+    """Build the resume evaluation prompt sent to the LLM.
+
+    The resume keeps its sections most relevant to `jd_keywords` within
+    `resume_token_budget`, and the JD is cut to `jd_token_budget`.
+    """
+    resume_text = fit_resume(resume_text, jd_keywords, resume_token_budget)
+    job_description = fit_text(job_description, jd_token_budget)
+
     # Use job description if available, else use title
     if job_description.strip():
         context = f"for the job described below:\n\"\"\"\n{job_description.strip()}\n\"\"\""
@@ -9,7 +39,7 @@ def score_resume(resume_text, job_title="", api_key="", mode="brief", job_descri
     else:
         context = "for a general corporate role"
 
-    prompt = f"""
+    return f"""
 You are a helpful AI assistant skilled at evaluating resumes for job applications.
 
 Evaluate the following resume {context}.
@@ -27,23 +57,24 @@ Start your response with: **Score: <number>/100**
 Then list the strengths and areas to improve clearly.
     """
 
-    response = requests.post(
-        "https://api.cohere.ai/v1/chat",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": "command-r-plus",
-            "message": prompt,
-            "temperature": 0.3
-        }
-    )
 
-    response.raise_for_status()
-    result = response.json()
+def build_payload(prompt, model=COHERE_MODEL):
+    return {
+        "model": model,
+        "message": prompt,
+        "temperature": 0.3
+    }
 
-    # Return response text cleanly
+
+def auth_headers(api_key):
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+
+def parse_response(result):
+    """Return the response text cleanly from a Cohere chat response body."""
     try:
         return result["text"].strip()
     except KeyError:
@@ -51,3 +82,138 @@ Then list the strengths and areas to improve clearly.
             return result["generations"][0]["text"].strip()
         except (KeyError, IndexError):
             return "❌ Error: Unexpected response format from Cohere API."
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(attempt, retry_after=None, base=1.0, cap=30.0):
+    """Exponential backoff with full jitter, deferring to the server's Retry-After."""
+    server_delay = parse_retry_after(retry_after)
+    if server_delay is not None:
+        return min(server_delay, cap)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def log_llm_call(prompt_tokens, start, status, attempts, first_chunk=None, backend="cohere"):
+    """Log the prompt size and latency of one LLM call."""
+    latency = time.perf_counter() - start
+    if first_chunk is None:
+        logger.info("%s chat: %d prompt tokens, %.2fs, status %s, %d attempt(s)",
+                    backend, prompt_tokens, latency, status, attempts)
+    else:
+        logger.info("%s chat stream: %d prompt tokens, first chunk %.2fs, %.2fs total, status %s, "
+                    "%d attempt(s)", backend, prompt_tokens, first_chunk - start, latency, status, attempts)
+
+
+def _get_session():
+    # One pooled session per process keeps the TLS connection to Cohere alive
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def cohere_chat(prompt, api_key, url=None, model=COHERE_MODEL, timeout=60, max_retries=3):
+    """Send one prompt to Cohere chat and return the response text, retrying transient failures."""
+    start = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        try:
+            response = _get_session().post(
+                url or COHERE_CHAT_URL,
+                headers=auth_headers(api_key),
+                json=build_payload(prompt, model),
+                timeout=timeout
+            )
+        except RETRY_EXCEPTIONS as e:
+            if attempt < max_retries:
+                time.sleep(retry_delay(attempt))
+                continue
+            log_llm_call(count_tokens(prompt), start, type(e).__name__, attempt + 1)
+            raise
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            time.sleep(retry_delay(attempt, response.headers.get("Retry-After")))
+            continue
+        break
+
+    log_llm_call(count_tokens(prompt), start, response.status_code, attempt + 1)
+    response.raise_for_status()
+    return parse_response(response.json())
+
+
+def cohere_chat_stream(prompt, api_key, url=None, model=COHERE_MODEL, timeout=60, max_retries=3):
+    """Yield Cohere's response to one prompt in chunks as it is generated.
+
+    Retries only happen before the first chunk, so output is never repeated.
+    """
+    payload = dict(build_payload(prompt, model), stream=True)
+    start = time.perf_counter()
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = _get_session().post(
+                url or COHERE_CHAT_URL,
+                headers=auth_headers(api_key),
+                json=payload,
+                timeout=timeout,
+                stream=True
+            )
+        except RETRY_EXCEPTIONS as e:
+            if attempt < max_retries:
+                time.sleep(retry_delay(attempt))
+                continue
+            log_llm_call(count_tokens(prompt), start, type(e).__name__, attempt + 1)
+            raise
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            response.close()
+            time.sleep(retry_delay(attempt, response.headers.get("Retry-After")))
+            continue
+        break
+
+    first_chunk = None
+    try:
+        with response:
+            response.raise_for_status()
+            # Cohere streams one JSON event per line
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event.get("event_type") == "text-generation":
+                    first_chunk = first_chunk or time.perf_counter()
+                    yield event.get("text", "")
+                elif event.get("event_type") == "stream-end":
+                    break
+    finally:
+        log_llm_call(count_tokens(prompt), start, response.status_code, attempt + 1, first_chunk=first_chunk)
+
+
+def score_resume(resume_text, job_title="", api_key="", mode="brief", job_description="",
+                 timeout=60, max_retries=3, jd_keywords=None, backend=None):
+    """Return LLM feedback for one resume from `backend`, or from Cohere when none is given."""
+    prompt = build_prompt(resume_text, job_title=job_title, mode=mode, job_description=job_description,
+                          jd_keywords=jd_keywords)
+    if backend is not None:
+        return backend.complete(prompt)
+    return cohere_chat(prompt, api_key, timeout=timeout, max_retries=max_retries)
+
+
+def score_resume_stream(resume_text, job_title="", api_key="", mode="brief", job_description="",
+                        timeout=60, max_retries=3, jd_keywords=None, backend=None):
+    """Yield the LLM feedback in chunks as `backend` (default: Cohere) generates it."""
+    prompt = build_prompt(resume_text, job_title=job_title, mode=mode, job_description=job_description,
+                          jd_keywords=jd_keywords)
+    if backend is not None:
+        return backend.stream(prompt)
+    return cohere_chat_stream(prompt, api_key, timeout=timeout, max_retries=max_retries)
@@ -0,0 +1,139 @@
+"""The screening analysis shared by the Streamlit app, the batch CLI and the HTTP service.
+
+Every front end produces the same fields for a resume: keyword scores,
+predicted category, freshness and employment dates, suggested roles and
+optional LLM feedback.
+"""
+from resume_parser import ResumeText, as_resume_text, estimate_resume_freshness
+from category_model import DEFAULT_TOP_K, get_category_model
+from dedup import ReusableResults
+from llm_backends import get_backend
+from scorer import build_prompt
+from ats_matcher import (
+    calculate_ats_match, calculate_jd_match, suggest_roles_batch, extract_keywords_from_jd, scan_resume
+)
+
+
+def get_jd_keywords(jd_text, job_title):
+    """Keywords from the JD, falling back to the job title as the app does."""
+    return extract_keywords_from_jd(jd_text) if jd_text else extract_keywords_from_jd(job_title)
+
+
+def keyword_scores(resume, job_title, jd_keywords, hits=None):
+    """Return `(final_score, ats_score, jd_score, missing_keywords)` for one resume.
+
+    The final score is the better of the role and JD keyword matches; missing
+    keywords from both are merged and sorted.
+    """
+    resume = as_resume_text(resume)
+    if hits is None:
+        hits = scan_resume(resume, jd_keywords)
+    ats_score, missing = calculate_ats_match(resume, job_title, hits=hits)
+    jd_score, jd_missing = calculate_jd_match(jd_keywords, hits)
+    return max(ats_score, jd_score), ats_score, jd_score, sorted(set(missing + jd_missing))
+
+
+def predict_categories(resumes, category_model=None, k=DEFAULT_TOP_K):
+    """The `k` most likely `(category, score)` pairs of every resume, with one model call.
+
+    Resumes are `ResumeText` views or strings; views reuse the token counts
+    taken for keyword matching.
+    """
+    if category_model is None:
+        category_model = get_category_model()
+    return category_model.predict_top_k(list(resumes), k)
+
+
+def screen_batch(resumes, jd_text="", job_title="", category_model=None,
+                 api_key=None, feedback_mode="brief", llm_options=None, backend=None, dedup_threshold=None,
+                 reusable=None):
+    """Score `(resume_id, resume_text)` pairs against one JD and return them ranked.
+
+    JD keywords are extracted once and the category model runs once over the
+    whole batch; each result carries the same fields the Streamlit page shows,
+    plus `top_categories`, the best category scores, and `latest_role_end`,
+    `years_experience` and `employment_gaps` (see `resume_dates`).
+    With a `backend` (or an `api_key`, meaning Cohere), LLM feedback for every
+    resume is fetched concurrently, configured by `llm_options`.
+    With a `dedup_threshold`, resumes that repeat an earlier one of the batch
+    (see `dedup`) are not screened again: they get a copy of its result, with
+    `duplicate_of` set to its id and `duplicate_similarity` to the estimate.
+    A `dedup.ReusableResults` shared across calls, instead of the threshold,
+    also catches repeats of resumes from earlier calls.
+    """
+    submitted = list(resumes)
+    if not submitted:
+        return []
+
+    # Matched by serial key rather than id, since uploads may share a file name
+    keys, matches = [None] * len(submitted), [None] * len(submitted)
+    if reusable is None and dedup_threshold:
+        reusable = ReusableResults(dedup_threshold)
+    if reusable is not None:
+        keys, matches = reusable.match_many(text for _, text in submitted)
+    resumes = [resume for resume, match in zip(submitted, matches) if match is None]
+
+    jd_keywords = get_jd_keywords(jd_text, job_title)
+    texts = [text for _, text in resumes]
+
+    feedbacks = [""] * len(resumes)
+    if backend is None and api_key:
+        backend = get_backend("cohere", api_key=api_key)
+    if backend is not None:
+        prompts = [build_prompt(text, job_title=job_title, mode=feedback_mode, job_description=jd_text,
+                                jd_keywords=jd_keywords) for text in texts]
+        responses = backend.complete_many(prompts, **(llm_options or {}))
+        feedbacks = [f"❌ Error: {r}" if isinstance(r, Exception) else r for r in responses]
+
+    # One normalized view and keyword scan per resume, then every role scored for the batch at once;
+    # the category model reads the same views' token counts
+    views = [ResumeText.from_text(text) for text in texts]
+    hits_list = [scan_resume(view, jd_keywords) for view in views]
+    role_suggestions = suggest_roles_batch(views, hits_list)
+    top_categories = predict_categories(views, category_model)
+
+    results = []
+    rows = zip(resumes, views, top_categories, feedbacks, hits_list, role_suggestions)
+    for (resume_id, _), resume, categories, feedback, keyword_hits, suggested_roles in rows:
+        final_score, ats_score, jd_score, missing = keyword_scores(resume, job_title, jd_keywords, keyword_hits)
+        dates = resume.dates
+
+        results.append({
+            "resume_id": resume_id,
+            "final_score": final_score,
+            "ats_score": ats_score,
+            "jd_score": jd_score,
+            "category": categories[0][0],
+            "top_categories": categories,
+            "freshness": estimate_resume_freshness(resume),
+            "latest_role_end": dates.latest_role_end,
+            "years_experience": dates.years_experience,
+            "employment_gaps": dates.gaps,
+            "suggested_roles": suggested_roles,
+            "missing_keywords": missing,
+            "feedback": feedback,
+            "duplicate_of": None,
+            "duplicate_similarity": None,
+        })
+
+    if reusable is not None:
+        for key, result in zip((key for key, match in zip(keys, matches) if match is None), results):
+            reusable.remember(key, result)
+    if len(resumes) < len(submitted):
+        screened = iter(results)
+        results = []
+        for (resume_id, _), match in zip(submitted, matches):
+            if match is None:
+                result = next(screened)
+            else:
+                original = reusable.result(match.original)
+                result = dict(original, resume_id=resume_id, duplicate_of=original["resume_id"],
+                              duplicate_similarity=round(match.similarity, 3))
+            results.append(result)
+
+    # Highest score first; ties keep their input order
+    results.sort(key=lambda r: r["final_score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+
+    return results
@@ -0,0 +1,498 @@
+"""Headless HTTP screening service for ATS integrations.
+
+Run:
+    python service.py --port 8080 --workers 4
+
+Endpoints:
+    POST /v1/screen         one resume: multipart "resume" PDF, or JSON {"resume_text": ...}
+    POST /v1/batch          many resumes: multipart "resume" PDFs, or JSON {"resumes": [{"id": ..., "text": ...}]}
+    GET  /v1/jobs/{job_id}  job status, with the result once it is done
+    GET  /healthz           queue depth and worker count
+    GET  /metrics           Prometheus metrics
+
+Both POST endpoints take the options jd_text, job_title, feedback_mode
+("brief" or "detailed"), llm ("true" for LLM feedback), dedup_threshold
+(similarity at which a batch's repeat submissions reuse the first one's
+result, 0 to screen every copy) and callback_url, as form fields or JSON
+keys, and answer 202 with a job id. Poll the job or
+let the service POST the finished job as JSON to callback_url.
+
+Jobs wait in a bounded queue for a pool of worker processes, each holding
+the models loaded once. The queue is bounded by jobs and by the bytes of
+resumes its jobs hold until they finish; beyond either limit a submission
+gets 429 with Retry-After. On
+SIGTERM or Ctrl-C new jobs get 503 while queued ones get a grace period
+to finish; the service keeps answering polls until they do.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from concurrent.futures.process import BrokenProcessPool
+
+import aiohttp
+from aiohttp import web
+
+from extraction_pool import DEFAULT_MAX_BYTES, DEFAULT_MAX_PAGES, DEFAULT_TIMEOUT, extract_pdfs
+from instrumentation import metrics, span
+from llm_backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from category_model import get_category_model
+from dedup import DEFAULT_THRESHOLD
+from model_registry import MODEL_DIR
+from screening import screen_batch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_QUEUE_SIZE = 64
+# Resume bytes queued and running jobs may hold in memory together
+DEFAULT_QUEUE_BYTES = 1024 * 1024 * 1024
+MAX_BATCH_SIZE = 500
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+DEFAULT_JOB_TITLE = "Data Scientist"
+# Finished jobs stay pollable this long, in seconds
+JOB_TTL = 3600
+SHUTDOWN_GRACE = 30
+CALLBACK_ATTEMPTS = 3
+CALLBACK_TIMEOUT = 10
+
+
+def _init_worker(model_dir, metrics_enabled=False):
+    # Ctrl-C and a SIGTERM to the process group are for the service, which
+    # drains the queue and then stops the workers; they just finish their job
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    if metrics_enabled:
+        metrics.enable()
+    get_category_model(model_dir)
+
+
+def run_job(job_request):
+    """Extract, score and optionally review one job's resumes. Runs in a worker process.
+
+    With metrics enabled, the job's stage counters come back as `stage_stats`
+    for the service to merge into its own.
+    """
+    # Only this job's spans go back to the service
+    metrics.reset()
+    pdfs = [(resume_id, source) for resume_id, source in job_request["resumes"] if isinstance(source, bytes)]
+    texts = {}
+    if pdfs:
+        # In a child process that is killed past the deadline, so a PDF hung in PyMuPDF cannot block this worker
+        with closing(extract_pdfs(pdfs, workers=1, timeout=DEFAULT_TIMEOUT, max_pages=DEFAULT_MAX_PAGES)) as extracted:
+            # One file in flight at a time, so each span covers that file's extraction
+            for _, source in pdfs:
+                with span("pdf_parse", size=len(source)):
+                    result = next(extracted)
+                texts[result.name] = result
+
+    resumes, errors = [], []
+    for resume_id, source in job_request["resumes"]:
+        if isinstance(source, bytes):
+            result = texts[resume_id]
+            if result.error:
+                errors.append({"resume_id": resume_id, "error": result.error})
+                continue
+            source = result.text
+        resumes.append((resume_id, source))
+
+    backend = None
+    if job_request["llm"]:
+        backend = get_backend(job_request["llm_backend"], api_key=os.environ.get("COHERE_API_KEY", ""))
+    with span("screening", size=len(resumes), llm=job_request["llm"]):
+        results = screen_batch(resumes, jd_text=job_request["jd_text"], job_title=job_request["job_title"],
+                               category_model=get_category_model(job_request["model_dir"]),
+                               feedback_mode=job_request["feedback_mode"], backend=backend,
+                               dedup_threshold=job_request["dedup_threshold"])
+    return {"results": results, "errors": errors, "stage_stats": metrics.export_stats()}
+
+
+class Job:
+    """One queued screening request and, once finished, its outcome."""
+
+    def __init__(self, kind, job_request, callback_url=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.request = job_request
+        # Uploaded bytes or characters of text, counted against the queue's byte limit
+        self.size = sum(len(source) for _, source in job_request["resumes"])
+        self.callback_url = callback_url
+        self.callback_status = None
+        self.status = "queued"
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+
+    def finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished = time.time()
+        # The uploads are no longer needed once the job has run
+        self.request = None
+
+    def as_dict(self):
+        job = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.error:
+            job["error"] = self.error
+        if self.result is not None:
+            if self.kind == "screen":
+                results = self.result["results"]
+                job["result"] = results[0] if results else None
+                job["errors"] = self.result["errors"]
+            else:
+                job.update(self.result)
+        if self.callback_url:
+            job["callback_status"] = self.callback_status
+        return job
+
+
+def _json_error(error_cls, message, headers=None, **kwargs):
+    return error_cls(text=json.dumps({"error": message}), content_type="application/json", headers=headers, **kwargs)
+
+
+def _string_option(options, name, default=""):
+    """A text option, `default` when missing or empty; anything but a string is a 400."""
+    value = options.get(name)
+    if value is None or value == "":
+        return default
+    if not isinstance(value, str):
+        raise _json_error(web.HTTPBadRequest, f"{name} must be a string")
+    return value
+
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ScreeningService:
+    """A bounded job queue drained by one dispatcher per worker process."""
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, model_dir=MODEL_DIR,
+                 llm_backend=DEFAULT_BACKEND, shutdown_grace=SHUTDOWN_GRACE, job_ttl=JOB_TTL,
+                 queue_bytes=DEFAULT_QUEUE_BYTES):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue_bytes = queue_bytes
+        # Held by queued and running jobs, released as each one finishes
+        self.held_bytes = 0
+        self.model_dir = model_dir
+        self.llm_backend = llm_backend
+        self.shutdown_grace = shutdown_grace
+        self.job_ttl = job_ttl
+        self.jobs = {}
+        self.running = 0
+        self.draining = False
+        self._queue = None
+        self._executor = None
+        self._dispatchers = []
+        self._deliveries = set()
+        self._session = None
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.model_dir, metrics.enabled))
+
+    async def start(self, app=None):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = self._new_executor()
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=CALLBACK_TIMEOUT))
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def drain(self):
+        """Refuse new jobs and give queued and running ones the grace period to finish."""
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._queue.join(), self.shutdown_grace)
+        except asyncio.TimeoutError:
+            logger.warning("Shutdown grace period over with %d job(s) queued", self._queue.qsize())
+
+    async def stop(self, app=None):
+        """Drain the queue unless that already happened, then stop the workers."""
+        if not self.draining:
+            await self.drain()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        for job in self.jobs.values():
+            if job.status in ("queued", "running"):
+                job.finish("cancelled", error="service shut down")
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._deliveries:
+            await asyncio.wait(self._deliveries, timeout=CALLBACK_ATTEMPTS * CALLBACK_TIMEOUT)
+        await self._session.close()
+
+    def submit(self, kind, job_request, callback_url=None):
+        """Queue a job, raising `asyncio.QueueFull` when the queue is at its job or byte limit."""
+        self._evict_finished()
+        job = Job(kind, job_request, callback_url)
+        # A job larger than the whole limit still runs once nothing else is held
+        if self.held_bytes and self.held_bytes + job.size > self.queue_bytes:
+            raise asyncio.QueueFull
+        self._queue.put_nowait(job)
+        self.held_bytes += job.size
+        self.jobs[job.id] = job
+        return job
+
+    def _evict_finished(self):
+        cutoff = time.time() - self.job_ttl
+        for job_id in [j.id for j in self.jobs.values() if j.finished and j.finished < cutoff]:
+            del self.jobs[job_id]
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(loop, job)
+            finally:
+                self.held_bytes -= job.size
+                self._queue.task_done()
+            if job.callback_url:
+                # Retrying a slow callback must not hold up the next job
+                delivery = asyncio.create_task(self._deliver(job))
+                self._deliveries.add(delivery)
+                delivery.add_done_callback(self._deliveries.discard)
+
+    async def _run(self, loop, job):
+        job.status = "running"
+        job.started = time.time()
+        self.running += 1
+        executor = self._executor
+        try:
+            with span("service_job", size=len(job.request["resumes"]), kind=job.kind,
+                      queued_ms=round((job.started - job.submitted) * 1000, 3)):
+                result = await loop.run_in_executor(executor, run_job, job.request)
+        except BrokenProcessPool:
+            # A worker died (out of memory, segfault in a PDF library); replace the pool
+            job.finish("failed", error="worker process crashed")
+            if self._executor is executor:
+                self._executor = self._new_executor()
+                executor.shutdown(wait=False, cancel_futures=True)
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            job.finish("failed", error=f"{type(e).__name__}: {e}")
+        else:
+            metrics.merge_stats(result.pop("stage_stats"))
+            if job.kind == "screen" and not result["results"]:
+                job.finish("failed", result=result, error=result["errors"][0]["error"])
+            else:
+                job.finish("done", result=result)
+        finally:
+            self.running -= 1
+
+    async def _deliver(self, job):
+        """POST the finished job to its callback URL, retrying with backoff."""
+        for attempt in range(CALLBACK_ATTEMPTS):
+            try:
+                async with self._session.post(job.callback_url, json=job.as_dict()) as response:
+                    if response.status < 400:
+                        job.callback_status = "delivered"
+                        return
+                    logger.warning("Callback for job %s got HTTP %d", job.id, response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning("Callback for job %s failed: %s", job.id, e)
+            if attempt + 1 < CALLBACK_ATTEMPTS:
+                await asyncio.sleep(2 ** attempt)
+        job.callback_status = "failed"
+
+    async def _read_submission(self, request, kind):
+        """Parse a multipart or JSON submission into the job request and callback URL."""
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            resumes = []
+            for i, upload in enumerate(form.getall("resume", [])):
+                if not isinstance(upload, web.FileField):
+                    raise _json_error(web.HTTPBadRequest, "'resume' must be a PDF file upload")
+                data = upload.file.read()
+                if len(data) > DEFAULT_MAX_BYTES:
+                    raise _json_error(web.HTTPRequestEntityTooLarge,
+                                      f"{upload.filename} is over the {DEFAULT_MAX_BYTES} byte limit",
+                                      max_size=DEFAULT_MAX_BYTES, actual_size=len(data))
+                resumes.append((upload.filename or f"resume_{i}.pdf", data))
+            if form.get("resume_text"):
+                resumes.append(("resume_text", form["resume_text"]))
+            options = form
+        elif request.content_type == "application/json":
+            try:
+                options = await request.json()
+            except json.JSONDecodeError:
+                raise _json_error(web.HTTPBadRequest, "Request body is not valid JSON")
+            if not isinstance(options, dict):
+                raise _json_error(web.HTTPBadRequest, "Request body must be a JSON object")
+            resumes = []
+            for i, item in enumerate(options.get("resumes") or []):
+                if not isinstance(item, dict) or not isinstance(item.get("text"), str):
+                    raise _json_error(web.HTTPBadRequest, "Each entry of 'resumes' needs a 'text' string")
+                resumes.append((str(item.get("id", f"resume_{i}")), item["text"]))
+            if isinstance(options.get("resume_text"), str):
+                resumes.append(("resume_text", options["resume_text"]))
+        else:
+            raise _json_error(web.HTTPUnsupportedMediaType, "Send multipart/form-data or application/json")
+
+        if kind == "screen" and len(resumes) != 1:
+            raise _json_error(web.HTTPBadRequest, "Send exactly one resume; use /v1/batch for more")
+        if not resumes:
+            raise _json_error(web.HTTPBadRequest, "No resumes in the request")
+        if len(resumes) > MAX_BATCH_SIZE:
+            raise _json_error(web.HTTPRequestEntityTooLarge, f"Batches are limited to {MAX_BATCH_SIZE} resumes",
+                              max_size=MAX_BATCH_SIZE, actual_size=len(resumes))
+
+        jd_text = _string_option(options, "jd_text")
+        job_title = _string_option(options, "job_title", DEFAULT_JOB_TITLE)
+        feedback_mode = _string_option(options, "feedback_mode", "brief")
+        if feedback_mode not in ("brief", "detailed"):
+            raise _json_error(web.HTTPBadRequest, "feedback_mode must be 'brief' or 'detailed'")
+        llm = _parse_bool(options.get("llm"))
+        dedup_threshold = options.get("dedup_threshold")
+        try:
+            dedup_threshold = DEFAULT_THRESHOLD if dedup_threshold in (None, "") else float(dedup_threshold)
+        except (TypeError, ValueError):
+            dedup_threshold = -1
+        if not 0 <= dedup_threshold <= 1:
+            raise _json_error(web.HTTPBadRequest, "dedup_threshold must be a number between 0 and 1")
+        if llm and self.llm_backend == "cohere" and not os.environ.get("COHERE_API_KEY"):
+            raise _json_error(web.HTTPBadRequest, "LLM feedback is not configured on this service")
+        callback_url = _string_option(options, "callback_url", None)
+        if callback_url and not callback_url.startswith(("http://", "https://")):
+            raise _json_error(web.HTTPBadRequest, "callback_url must be an http(s) URL")
+
+        job_request = {
+            "resumes": resumes,
+            "jd_text": jd_text,
+            "job_title": job_title,
+            "feedback_mode": feedback_mode,
+            "llm": llm,
+            "dedup_threshold": dedup_threshold,
+            "llm_backend": self.llm_backend,
+            "model_dir": self.model_dir,
+        }
+        return job_request, callback_url
+
+    async def handle_submit(self, request, kind):
+        if self.draining:
+            raise _json_error(web.HTTPServiceUnavailable, "Service is shutting down", headers={"Retry-After": "30"})
+        job_request, callback_url = await self._read_submission(request, kind)
+        try:
+            job = self.submit(kind, job_request, callback_url)
+        except asyncio.QueueFull:
+            # Roughly the time for the workers to get through a full queue of jobs
+            raise _json_error(web.HTTPTooManyRequests, "Job queue is full, retry later",
+                              headers={"Retry-After": str(max(1, self.queue_size // self.workers))})
+        status_url = f"/v1/jobs/{job.id}"
+        return web.json_response({"job_id": job.id, "status": job.status, "status_url": status_url},
+                                 status=202, headers={"Location": status_url})
+
+    async def handle_screen(self, request):
+        return await self.handle_submit(request, "screen")
+
+    async def handle_batch(self, request):
+        return await self.handle_submit(request, "batch")
+
+    async def handle_job(self, request):
+        job = self.jobs.get(request.match_info["job_id"])
+        if job is None:
+            raise _json_error(web.HTTPNotFound, "Unknown or expired job id")
+        return web.json_response(job.as_dict())
+
+    async def handle_health(self, request):
+        return web.json_response({
+            "status": "draining" if self.draining else "ok",
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "held_bytes": self.held_bytes,
+            "queue_bytes": self.queue_bytes,
+            "running": self.running,
+        }, status=503 if self.draining else 200)
+
+    async def handle_metrics(self, request):
+        gauges = [
+            "# TYPE resume_screener_service_queued_jobs gauge",
+            f"resume_screener_service_queued_jobs {self._queue.qsize()}",
+            "# TYPE resume_screener_service_running_jobs gauge",
+            f"resume_screener_service_running_jobs {self.running}",
+            "# TYPE resume_screener_service_held_bytes gauge",
+            f"resume_screener_service_held_bytes {self.held_bytes}",
+        ]
+        return web.Response(text=metrics.prometheus_text() + "\n".join(gauges) + "\n", content_type="text/plain")
+
+    def create_app(self):
+        app = web.Application(client_max_size=MAX_UPLOAD_BYTES)
+        app.add_routes([
+            web.post("/v1/screen", self.handle_screen),
+            web.post("/v1/batch", self.handle_batch),
+            web.get("/v1/jobs/{job_id}", self.handle_job),
+            web.get("/healthz", self.handle_health),
+            web.get("/metrics", self.handle_metrics),
+        ])
+        app.on_startup.append(self.start)
+        app.on_shutdown.append(self.stop)
+        return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve resume screening over HTTP.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes running jobs")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Jobs waiting beyond this are refused with 429")
+    parser.add_argument("--queue-bytes", type=int, default=DEFAULT_QUEUE_BYTES,
+                        help="Resume bytes queued and running jobs may hold; submissions beyond it get 429")
+    parser.add_argument("--model-dir", default=MODEL_DIR, help="Directory holding the SVM pipeline and label encoder")
+    parser.add_argument("--llm-backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument("--shutdown-grace", type=float, default=SHUTDOWN_GRACE,
+                        help="Seconds queued jobs get to finish on shutdown")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+    # Stage spans, the workers' included, feed /metrics
+    metrics.enable()
+
+    service = ScreeningService(workers=args.workers, queue_size=args.queue_size, model_dir=args.model_dir,
+                               llm_backend=args.llm_backend, shutdown_grace=args.shutdown_grace,
+                               queue_bytes=args.queue_bytes)
+    asyncio.run(serve(service, args.host, args.port))
+
+
+async def serve(service, host, port):
+    """Run the service until SIGTERM or Ctrl-C, draining its queue before the listener closes.
+
+    `web.run_app` closes the listener before any shutdown hook runs, so
+    draining there would leave clients unable to poll the jobs being waited on.
+    """
+    runner = web.AppRunner(service.create_app(), shutdown_timeout=CALLBACK_ATTEMPTS * CALLBACK_TIMEOUT)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        logger.info("Serving on http://%s:%d", host, port)
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stopping.set)
+        await stopping.wait()
+        await service.drain()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""The JD extractor fingerprint that keys cached keywords."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jd_keywords import JDKeywordExtractor  # noqa: E402
+
+JD = "Data engineer building Spark and Airflow pipelines on AWS with Python and SQL."
+
+
+def test_same_size_corpora_differ():
+    first = JDKeywordExtractor({"python": 2, "sql": 1}, n_docs=2)
+    second = JDKeywordExtractor({"java": 2, "kotlin": 1}, n_docs=2)
+    assert first.fingerprint != second.fingerprint
+
+
+def test_same_frequencies_agree():
+    first = JDKeywordExtractor({"python": 2, "sql": 1}, n_docs=2)
+    second = JDKeywordExtractor({"sql": 1, "python": 2}, n_docs=2)
+    assert first.fingerprint == second.fingerprint
+
+
+def test_partial_fit_changes_it():
+    extractor = JDKeywordExtractor({"python": 2, "sql": 1}, n_docs=2)
+    before = extractor.fingerprint
+    extractor.partial_fit([JD])
+    assert extractor.fingerprint != before
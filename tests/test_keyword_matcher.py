@@ -0,0 +1,37 @@
+"""Token indexes built from a whole text and from its pages as they arrive."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import TokenIndex, TokenStream  # noqa: E402
+from resume_parser import ResumeText  # noqa: E402
+
+TEXT = "Senior Data Scientist\n03/2021 – present: Python3, scikit_learn, R&D and machine learning pipelines."
+
+
+def as_tuple(index):
+    return index.tokens, index.words, index.text, index.version_stems
+
+
+def test_stream_matches_whole_text_at_every_split():
+    text = TEXT.lower()
+    for cut in range(len(text) + 1):
+        stream = TokenStream()
+        stream.add(text[:cut])
+        stream.add(text[cut:])
+        assert as_tuple(stream.index()) == as_tuple(TokenIndex(text)), cut
+
+
+def test_index_is_a_snapshot():
+    stream = TokenStream()
+    stream.add("pyth")
+    before = stream.index()
+    stream.add("on developer")
+    assert before.tokens == ["pyth"]
+    assert stream.index().words == {"python", "developer"}
+
+
+def test_resume_pages_match_whole_text():
+    pages = [TEXT[:30], TEXT[30:61], TEXT[61:]]
+    assert as_tuple(ResumeText(pages).keyword_index) == as_tuple(TokenIndex(TEXT.lower()))
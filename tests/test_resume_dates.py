@@ -0,0 +1,79 @@
+"""Dates read from resume tokens: numeric months, year-only ranges, gaps and freshness."""
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_dates import extract_dates  # noqa: E402
+from resume_parser import estimate_resume_freshness  # noqa: E402
+
+TODAY = date(2025, 6, 15)
+
+
+def dates(text):
+    return extract_dates(text, TODAY)
+
+
+def test_number_before_a_year_is_not_a_month():
+    found = dates("Experience\nBuilt services in python 3 2025 style\nAnalyst, Acme  Jan 2019 - Mar 2021")
+    assert found.roles == [("2019-01", "2021-03")]
+    assert found.latest_date == "2021-03"
+
+
+def test_numeric_month_year_forms():
+    found = dates("Experience\nAnalyst, Acme  03/2019 - 11/2021\nEngineer, Beta  1-2022 - present")
+    assert found.roles == [("2019-03", "2021-11"), ("2022-01", "present")]
+    assert found.gaps == []
+
+
+def test_month_name_forms():
+    found = dates("Experience\nAnalyst  Sept 2018 to March 2020\nEngineer  since Apr 2020")
+    assert found.roles == [("2018-09", "2020-03"), ("2020-04", "present")]
+
+
+def test_year_only_end_does_not_invent_a_gap():
+    found = dates("Experience\nAnalyst, Acme  2019 - 2021\nEngineer, Beta  May 2022 - Present")
+    assert found.roles == [("2019", "2021"), ("2022-05", "present")]
+    assert found.gaps == []
+
+
+def test_year_only_end_with_a_whole_year_between_is_a_gap():
+    found = dates("Experience\nAnalyst, Acme  2016 - 2018\nEngineer, Beta  May 2020 - Present")
+    assert found.gaps == ["2018/2020-05"]
+
+
+def test_gap_between_known_months():
+    found = dates("Experience\nAnalyst  Jan 2019 - Mar 2021\nEngineer  Sep 2021 - Present\n")
+    assert found.gaps == ["2021-03/2021-09"]
+    assert found.years_experience == 5.9
+
+
+def test_overlapping_roles_counted_once():
+    found = dates("Experience\nLead  Jan 2020 - Dec 2021\nAdvisor  Jun 2021 - Dec 2022")
+    assert found.years_experience == 2.9
+    assert found.latest_role_end == "2022-12"
+
+
+def test_education_ranges_are_not_roles_or_latest_dates():
+    found = dates("Experience\nAnalyst, Acme  Jan 2015 - Mar 2019\nEducation\nMSc Data Science  2022 - 2024")
+    assert found.roles == [("2015-01", "2019-03")]
+    assert found.latest_date == "2019-03"
+
+
+def test_year_inside_a_sentence_is_not_a_date():
+    found = dates('Publications\n"Trends for 2030 and beyond", journal of things\nSummary\nAnalyst since 2018')
+    assert found.latest_date == "2025-06"
+    assert found.roles == [("2018", "present")]
+
+
+def test_freshness_follows_the_latest_role_not_graduation():
+    year = date.today().year
+    resume = f"Experience\nAnalyst, Acme  Jan {year - 6} - Mar {year - 5}\nEducation\nMSc  {year - 2} - {year}"
+    assert estimate_resume_freshness(resume) == "Outdated"
+
+
+def test_freshness_of_a_current_role_and_without_dates():
+    year = date.today().year
+    assert estimate_resume_freshness(f"Experience\nEngineer  Jan {year - 9} - Present") == "Updated Recently"
+    assert estimate_resume_freshness("Experience\nEngineer at Acme") == "Unknown"
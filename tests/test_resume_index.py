@@ -0,0 +1,117 @@
+"""Crash recovery of the resume index: an interrupted merge must not count postings twice."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_index  # noqa: E402
+from resume_index import ResumeIndex  # noqa: E402
+
+SKILLS = ["python", "sql", "spark", "tableau", "excel", "aws", "docker", "kubernetes", "react", "java"]
+JD = "Data engineer with python, sql, spark and aws experience"
+
+
+def make_resumes(n):
+    return [(f"r{i:03d}", " ".join(SKILLS[(i + k) % len(SKILLS)] for k in range(i % 7 + 3)) + " team projects")
+            for i in range(n)]
+
+
+class Crash(Exception):
+    pass
+
+
+class _CrashingDb:
+    """Forwards to a sqlite connection but fails the first statement containing `sql`."""
+
+    def __init__(self, db, sql):
+        self._db = db
+        self._sql = sql
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def __enter__(self):
+        return self._db.__enter__()
+
+    def __exit__(self, *exc):
+        return self._db.__exit__(*exc)
+
+    def execute(self, sql, *args):
+        if self._sql in sql:
+            raise Crash(sql)
+        return self._db.execute(sql, *args)
+
+
+def build(path, resumes, deleted=()):
+    index = ResumeIndex(path)
+    for start in range(0, len(resumes), 5):
+        index.add(resumes[start:start + 5])
+    index.delete(deleted)
+    return index
+
+
+def snapshot(index):
+    return len(index), index.stats()["postings"], index.search(JD, top_k=10)
+
+
+@pytest.fixture
+def expected(tmp_path):
+    index = build(tmp_path / "reference", make_resumes(40), deleted=["r003"])
+    index.compact()
+    result = snapshot(index)
+    index.close()
+    return result
+
+
+def test_crash_after_merge_commit_drops_replaced_segments(tmp_path, monkeypatch, expected):
+    index = build(tmp_path / "index", make_resumes(40), deleted=["r003"])
+    old = sorted(os.listdir(tmp_path / "index" / "segments"))
+
+    def crash(path, *args, **kwargs):
+        raise Crash(path)
+
+    monkeypatch.setattr(resume_index.shutil, "rmtree", crash)
+    with pytest.raises(Crash):
+        index.compact()
+    index.close()
+    monkeypatch.undo()
+    # The committed merge and every segment it replaced are still on disk
+    assert set(old) < set(os.listdir(tmp_path / "index" / "segments"))
+
+    reopened = ResumeIndex(tmp_path / "index")
+    assert reopened.stats()["segments"] == 1
+    assert snapshot(reopened) == expected
+    assert sorted(os.listdir(tmp_path / "index" / "segments")) == [reopened._segments[0].name]
+    reopened.close()
+
+
+@pytest.mark.parametrize("statement", ["UPDATE docs SET segment", "INSERT INTO segments"])
+def test_crash_before_commit_keeps_old_segments(tmp_path, expected, statement):
+    index = build(tmp_path / "index", make_resumes(40), deleted=["r003"])
+    before = snapshot(index)
+    index._db = _CrashingDb(index._db, statement)
+    with pytest.raises(Crash):
+        index.compact() if statement.startswith("UPDATE") else index.add(make_resumes(41)[40:])
+    index._db._db.close()
+
+    reopened = ResumeIndex(tmp_path / "index")
+    assert snapshot(reopened) == before
+    reopened.compact()
+    assert snapshot(reopened) == expected
+    reopened.close()
+
+
+def test_index_without_segment_list_keeps_its_segments(tmp_path, expected):
+    index = build(tmp_path / "index", make_resumes(40), deleted=["r003"])
+    index._db.execute("DROP TABLE segments")
+    index._db.commit()
+    before = snapshot(index)
+    index.close()
+
+    reopened = ResumeIndex(tmp_path / "index")
+    assert snapshot(reopened) == before
+    reopened.compact()
+    assert snapshot(reopened) == expected
+    reopened.close()